@@ -0,0 +1,537 @@
+"""
+Dry-run benchmark of the tracking orchestration in main.py.
+
+Runs the real load -> lease -> scrape -> resolve -> write pipeline with a
+fake WebDriver that serves synthetic following lists and a fake Airtable
+transport, so only our own orchestration is measured: dict builds, lease
+queue round trips, task and thread hand-offs, the scroll loop's Python
+work, account resolution and garbage collection. Sleeps in the scroll loop
+and between Airtable batches are skipped.
+
+    python benchmark.py --sizes 1000,10000,100000
+
+With --drivers N it instead starts N real Chrome drivers through
+main.start_driver(), first with cookies loaded into fresh profiles and then
+from clones of the logged-in profile template, and reports the driver-ready
+time of each. That needs Chrome, ChromeDriver and COOKIE_PATH.
+
+    python benchmark.py --drivers 3
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+# The fake transport never talks to Airtable, but main.py needs its config
+for _key, _value in {
+    "AIRTABLE_TOKEN": "benchmark",
+    "AIRTABLE_BASE_ID": "appBenchmark",
+    "AIRTABLE_FOLLOWERS_TABLE": "tblFollowers",
+    "AIRTABLE_ACCOUNTS_TABLE": "tblAccounts",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+import psutil
+
+import main
+from scraping import collector, pacing, resource_blocking, scraping
+from utils import run_report
+from utils.follow_log import FollowLog
+from utils.lease_queue import LeaseQueue
+from utils.memory import MB, MemoryGovernor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = "1000,10000,100000"
+SCROLL_STEP = 12  # Following links revealed per scroll
+IDLE_MS = 10_000  # How long the fake page reports having been idle
+USERNAME_FORMULA = re.compile(r"LOWER\(\{Username\}\) = '([^']*)'")
+
+
+class FakeAirtable:
+    """
+    In-memory Followers and Accounts tables.
+
+    Follower i follows `follows` accounts from a shared pool, of which the
+    last `new_follows` are not linked yet: half of those already exist in
+    Accounts and half are brand-new handles the resolver has to create.
+    Another `unfollows` linked accounts are no longer followed.
+    """
+
+    def __init__(
+        self, followers: int, follows: int, new_follows: int, unfollows: int = 0
+    ):
+        self.follows = follows
+        self.new_follows = new_follows
+        self.pool_size = max(2 * followers, follows)
+        self.accounts: Dict[str, Dict[str, Any]] = {}
+        self.account_ids: Dict[str, str] = {}
+        self.followers: Dict[str, Dict[str, Any]] = {}
+        self._created = 0
+
+        pool_ids = []
+        for j in range(self.pool_size):
+            record_id = f"recA{j:08d}"
+            username = f"account{j}"
+            self.accounts[record_id] = {"Username": username, "Followers": []}
+            self.account_ids[username] = record_id
+            pool_ids.append(record_id)
+
+        linked = follows - new_follows
+        for i in range(followers):
+            start = (i * 13) % self.pool_size
+            self.followers[f"recF{i:08d}"] = {
+                "Username": f"follower{i}",
+                "Account": [
+                    pool_ids[(start + k) % self.pool_size] for k in range(linked)
+                ]
+                + [
+                    pool_ids[(start + follows + k) % self.pool_size]
+                    for k in range(unfollows)
+                ],
+            }
+
+    def following_for(self, handle: str) -> List[str]:
+        """The synthetic following list of a follower handle."""
+        i = int(handle[len("follower") :])
+        start = (i * 13) % self.pool_size
+        linked = self.follows - self.new_follows
+        existing = (self.new_follows + 1) // 2
+        handles = [
+            f"account{(start + k) % self.pool_size}" for k in range(linked + existing)
+        ]
+        handles += [f"new{i}x{k}" for k in range(self.new_follows - existing)]
+        return handles
+
+    def table(self, table_id: str) -> Dict[str, Dict[str, Any]]:
+        followers_table = main.get_settings().airtable_followers_table
+        return self.followers if table_id == followers_table else self.accounts
+
+    def fetch_records(
+        self, table_id: str, headers: Dict[str, str], formula: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Stand-in for fetch_records_from_airtable."""
+        if formula is None:
+            return [
+                {"id": record_id, "fields": dict(fields)}
+                for record_id, fields in self.table(table_id).items()
+            ]
+        records = []
+        for username in USERNAME_FORMULA.findall(formula):
+            record_id = self.account_ids.get(username)
+            if record_id:
+                records.append(
+                    {"id": record_id, "fields": dict(self.accounts[record_id])}
+                )
+        return records
+
+    def create(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        created = []
+        for record in records:
+            self._created += 1
+            record_id = f"recN{self._created:08d}"
+            fields = dict(record["fields"], Followers=[])
+            self.accounts[record_id] = fields
+            self.account_ids[fields["Username"]] = record_id
+            created.append({"id": record_id, "fields": fields})
+        return created
+
+
+class FakeResponse:
+    def __init__(self, status: int, payload: Dict[str, Any]):
+        self.status = status
+        self._payload = payload
+
+    async def json(self) -> Dict[str, Any]:
+        return self._payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc) -> bool:
+        return False
+
+
+class FakeSession:
+    """Just enough of aiohttp.ClientSession for the tracking pipeline."""
+
+    def __init__(self, store: FakeAirtable):
+        self.store = store
+        self.requests = 0
+
+    def get(self, url: str, headers=None) -> FakeResponse:
+        self.requests += 1
+        table_id, record_id = url.rsplit("/", 2)[-2:]
+        fields = self.store.table(table_id).get(record_id)
+        if fields is None:
+            return FakeResponse(404, {})
+        return FakeResponse(200, {"id": record_id, "fields": fields})
+
+    def post(self, url: str, headers=None, json=None) -> FakeResponse:
+        self.requests += 1
+        return FakeResponse(200, {"records": self.store.create(json["records"])})
+
+    def patch(self, url: str, headers=None, json=None) -> FakeResponse:
+        self.requests += 1
+        table = self.store.table(url.rsplit("/", 1)[-1])
+        for record in json["records"]:
+            table[record["id"]].update(record["fields"])
+        return FakeResponse(200, {"records": json["records"]})
+
+
+class FakeDriver:
+    """
+    A WebDriver whose Following timeline reveals SCROLL_STEP links per scroll.
+
+    The in-page collector script is answered with the accounts of the links
+    rendered since it was last drained, each with the name and bio its cell
+    shows.
+    """
+
+    def __init__(self, store: FakeAirtable):
+        self.store = store
+        self.current_url = "about:blank"
+        self._links: List[str] = []
+        self._loaded = 0
+        self._drained = 0
+
+    def get(self, url: str) -> None:
+        self.current_url = url
+        handle = url.rstrip("/").split("/")[-2]
+        # Every timeline also carries links the scraper has to filter out
+        self._links = [
+            f"https://x.com/{handle}/following",
+            "https://x.com/search?q=benchmark",
+        ] + [
+            f"https://x.com/{following}"
+            for following in self.store.following_for(handle)
+        ]
+        self._loaded = SCROLL_STEP
+        self._drained = 0
+
+    def execute_script(self, script: str, *args) -> Optional[List[Dict[str, Any]]]:
+        if script == collector.IDLE_SCRIPT:
+            # Everything has loaded by the time the scraper checks
+            return IDLE_MS
+        if script == resource_blocking.PAGE_WEIGHT_SCRIPT:
+            return {"bytes": 0, "heap": None}
+        if script == collector.LOADING_SCRIPT:
+            return False
+        if "__followingCollector" not in script:
+            self._loaded += SCROLL_STEP
+            return None
+        # Profile links only, as the collector keeps them
+        rendered = self._links[self._drained : self._loaded]
+        self._drained = min(self._loaded, len(self._links))
+        accounts = []
+        for link in rendered:
+            path = link[len("https://x.com/") :]
+            if "/" not in path and "?" not in path:
+                handle = path.lower()
+                accounts.append(
+                    {
+                        "username": handle,
+                        "name": handle.title(),
+                        "description": "",
+                        "verified": False,
+                    }
+                )
+        return accounts
+
+    def execute_cdp_cmd(self, cmd: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {}
+
+    def save_screenshot(self, path: str) -> bool:
+        return True
+
+    def quit(self) -> None:
+        pass
+
+
+class NoSleepTime:
+    """
+    The time module with sleep() turned into a no-op that moves monotonic()
+    forward instead, so dwell limits are met without waiting.
+    """
+
+    def __init__(self):
+        self.slept = 0.0
+
+    def __getattr__(self, name: str):
+        return getattr(time, name)
+
+    def sleep(self, seconds: float) -> None:
+        self.slept += seconds
+
+    def monotonic(self) -> float:
+        return time.monotonic() + self.slept
+
+
+class PeakRss:
+    """Sample this process's RSS in a background thread and keep the peak."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak = 0
+        self._process = psutil.Process(os.getpid())
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self._process.memory_info().rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self._process.memory_info().rss)
+
+
+async def run_size(
+    size: int,
+    follows: int,
+    new_follows: int,
+    workers: int,
+    trace: bool,
+    unfollows: int = 0,
+) -> Dict[str, Any]:
+    """
+    Track `size` synthetic followers and measure the orchestration, as a
+    full reconcile when unfollows is set.
+    """
+    store = FakeAirtable(size, follows, new_follows, unfollows)
+    main.fetch_records_from_airtable = store.fetch_records
+    headers = {"Authorization": "Bearer benchmark"}
+    drivers = [FakeDriver(store) for _ in range(workers)]
+    session = FakeSession(store)
+    report = run_report.start_run_report(f"benchmark-{size}")
+
+    gc.collect()
+    rss_before = psutil.Process(os.getpid()).memory_info().rss
+    if trace:
+        tracemalloc.start()
+    with tempfile.TemporaryDirectory() as tmp, PeakRss() as peak:
+        started = time.perf_counter()
+        slept_before = getattr(scraping.time, "slept", 0.0)
+        followers, accounts = main.load_tracking_state(headers)
+        loaded = time.perf_counter()
+
+        lease_queue = LeaseQueue(
+            os.path.join(tmp, "leases.sqlite"),
+            lease_seconds=main.LEASE_SECONDS,
+            revisit_seconds=main.revisit_seconds(),
+        )
+        main.seed_follower_leases(lease_queue, followers)
+        follow_log = FollowLog(os.path.join(tmp, "follow_log.sqlite"))
+        seeded = time.perf_counter()
+
+        new_handles = await main.run_tracking_pipeline(
+            lease_queue,
+            drivers,
+            headers,
+            accounts,
+            session,
+            reconcile=unfollows > 0,
+            follow_log=follow_log,
+        )
+        finished = time.perf_counter()
+        follow_events = follow_log.last_seq()
+        slept = getattr(scraping.time, "slept", 0.0) - slept_before
+    traced_peak = 0
+    if trace:
+        traced_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    counts = report.summary()["counts"]
+    pipeline_seconds = finished - seeded
+    return {
+        "followers": size,
+        "scraped": counts.get("followers_scraped", 0),
+        "failed": counts.get("followers_failed", 0),
+        "new_handles": new_handles,
+        "accounts_created": counts.get("accounts_created", 0),
+        "accounts_harvested": counts.get("accounts_harvested", 0),
+        "follows_removed": counts.get("follows_removed", 0),
+        "follow_events": follow_events,
+        "airtable_requests": session.requests,
+        "load_seconds": round(loaded - started, 3),
+        "seed_seconds": round(seeded - loaded, 3),
+        "pipeline_seconds": round(pipeline_seconds, 3),
+        "ms_per_follower": round(1000 * (finished - started) / size, 3),
+        # Time the scraper would have spent waiting on the browser
+        "wait_seconds_per_follower": round(slept / size, 2),
+        "peak_rss_growth_mb": round((peak.peak - rss_before) / MB, 1),
+        "kb_per_follower": round((peak.peak - rss_before) / 1024 / size, 2),
+        "traced_peak_kb_per_follower": round(traced_peak / 1024 / size, 2),
+    }
+
+
+async def run_benchmark(
+    sizes: List[int],
+    follows: int,
+    new_follows: int,
+    workers: int,
+    trace: bool,
+    unfollows: int = 0,
+) -> List[Dict[str, Any]]:
+    # Skip every wait that stands in for the browser or Airtable rate limits
+    scraping.time = pacing.time = NoSleepTime()
+    main.AIRTABLE_REQUEST_DELAY = 0
+    # Host memory pressure would pause workers and skew the timings
+    main._memory_governor = MemoryGovernor(host_limit_percent=101)
+
+    results = []
+    for size in sizes:
+        result = await run_size(
+            size, follows, new_follows, workers, trace, unfollows
+        )
+        print(
+            f"{size:>7} followers: {result['ms_per_follower']:.3f} ms/follower "
+            f"(load {result['load_seconds']:.2f}s, seed {result['seed_seconds']:.2f}s, "
+            f"pipeline {result['pipeline_seconds']:.2f}s), "
+            f"peak RSS +{result['peak_rss_growth_mb']:.1f} MB "
+            f"({result['kb_per_follower']:.2f} KB/follower), "
+            f"{result['wait_seconds_per_follower']:.1f}s simulated waits/follower, "
+            f"{result['scraped']} scraped, {result['failed']} failed, "
+            f"{result['follows_removed']} unfollows",
+            flush=True,
+        )
+        results.append(result)
+        gc.collect()
+    return results
+
+
+def benchmark_driver_ready(count: int, template_dir: str) -> Dict[str, Any]:
+    """Seconds to a logged-in driver, without and with the profile template."""
+    from dataclasses import replace
+
+    from scraping import profile_snapshot
+
+    def start(label: str) -> List[float]:
+        timings = []
+        for _ in range(count):
+            started = time.perf_counter()
+            driver = main.start_driver()
+            timings.append(time.perf_counter() - started)
+            driver.quit()
+        print(f"{label}: " + ", ".join(f"{t:.2f}s" for t in timings), flush=True)
+        return timings
+
+    get_settings = main.get_settings
+    settings = get_settings()
+    try:
+        main.get_settings = lambda: replace(settings, profile_template_dir=None)
+        cookies = start("cookies loaded per driver")
+        main.get_settings = lambda: replace(settings, profile_template_dir=template_dir)
+        # The first start builds the template; time it on its own
+        started = time.perf_counter()
+        main.start_driver().quit()
+        build = time.perf_counter() - started
+        print(f"template built in {build:.2f}s", flush=True)
+        cloned = start("cloned from the template")
+        started = time.perf_counter()
+        clone = profile_snapshot.clone_profile(
+            template_dir, os.path.dirname(os.path.abspath(template_dir))
+        )
+        clone_seconds = time.perf_counter() - started
+        shutil.rmtree(clone, ignore_errors=True)
+    finally:
+        main.get_settings = get_settings
+    return {
+        "drivers": count,
+        "cookie_load_seconds": round(sum(cookies) / count, 3),
+        "template_build_seconds": round(build, 3),
+        "template_clone_seconds": round(sum(cloned) / count, 3),
+        "profile_copy_seconds": round(clone_seconds, 3),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark main.py's orchestration with a fake browser and Airtable."
+    )
+    parser.add_argument(
+        "--sizes",
+        default=DEFAULT_SIZES,
+        help=f"comma-separated follower counts to run (default {DEFAULT_SIZES})",
+    )
+    parser.add_argument(
+        "--follows", type=int, default=40, help="accounts each follower follows"
+    )
+    parser.add_argument(
+        "--new-follows",
+        type=int,
+        default=4,
+        help="follows per follower that are not linked in Airtable yet",
+    )
+    parser.add_argument(
+        "--unfollows",
+        type=int,
+        default=0,
+        help="linked accounts per follower that are no longer followed; "
+        "runs a full reconcile when set",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=main.MAX_CONCURRENT_PROCESSES,
+        help="number of fake browser workers",
+    )
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="also report peak Python allocations (slows the run down)",
+    )
+    parser.add_argument(
+        "--drivers",
+        type=int,
+        default=0,
+        help="time this many real Chrome driver starts instead (needs COOKIE_PATH)",
+    )
+    parser.add_argument("--output", help="write the results as JSON to this path")
+    parser.add_argument(
+        "--log-level",
+        default="WARNING",
+        help="log level while benchmarking (default WARNING)",
+    )
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(args.log_level.upper())
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    if args.drivers:
+        with tempfile.TemporaryDirectory() as tmp:
+            results = [
+                benchmark_driver_ready(
+                    args.drivers, os.path.join(tmp, "profile-template")
+                )
+            ]
+        print(json.dumps(results[0], indent=2))
+    else:
+        results = asyncio.run(
+            run_benchmark(
+                sizes,
+                args.follows,
+                args.new_follows,
+                args.workers,
+                args.tracemalloc,
+                args.unfollows,
+            )
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import signal
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import main as tracker
+from utils.account_index import AccountIndex
+from utils.config import get_settings
+from utils.lazy import lazy_import
+from utils.logging_setup import setup_logging
+from utils import run_report
+from utils.scheduler import Scheduler
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+    from twitter.nitter_scraper import NitterScraper
+
+aiohttp = lazy_import("aiohttp")
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Default job intervals in minutes
+TRACKING_MINUTES = 360
+API_ENRICHMENT_MINUTES = 360
+NITTER_ENRICHMENT_MINUTES = 120
+ANALYSIS_MINUTES = 30
+JOB_JITTER = 0.1  # Runs move by up to 10% of their interval
+WARM_STATE_HOURS = 24  # Restart browsers and reload the tables this often
+RECONCILE_EVERY = 4  # Every Nth tracking run also removes unfollows
+
+
+class WarmState:
+    """Browsers, HTTP session and table indexes kept between job runs."""
+
+    def __init__(self, max_age_seconds: float):
+        self.max_age_seconds = max_age_seconds
+        self.headers = tracker.airtable_headers()
+        self.drivers: List[webdriver.Chrome] = []
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.followers: Dict[str, str] = {}
+        self.accounts = AccountIndex()
+        self.loaded_at: Optional[float] = None
+        self.tracking_runs = 0
+        self._nitter_scraper: Optional[NitterScraper] = None
+
+    def is_fresh(self) -> bool:
+        return (
+            self.loaded_at is not None
+            and time.monotonic() - self.loaded_at < self.max_age_seconds
+            and len(self.drivers) == tracker.selenium_driver_count()
+        )
+
+    async def ensure_ready(self) -> None:
+        """Start the browsers and load both tables unless they are still fresh."""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession()
+        if self.is_fresh():
+            return
+        await tracker.quit_drivers(self.drivers)
+        logger.info("Starting browsers and loading the Airtable tables")
+        with run_report.phase("warm_start"):
+            await tracker.start_drivers(self.drivers, tracker.selenium_driver_count())
+            self.followers, self.accounts = await asyncio.to_thread(
+                tracker.load_tracking_state, self.headers
+            )
+        self.loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Start over with new browsers and fresh tables on the next run."""
+        self.loaded_at = None
+
+    def forget_account(self, record_id: str, username: str) -> None:
+        """Drop a deleted Account, so tracking creates it again if it shows up."""
+        username = tracker.normalize_username(username)
+        if self.accounts.get(username) == record_id:
+            del self.accounts[username]
+
+    def nitter_scraper(self) -> NitterScraper:
+        if self._nitter_scraper is None:
+            from twitter.nitter_scraper import NitterScraper
+
+            self._nitter_scraper = NitterScraper()
+        return self._nitter_scraper
+
+    async def close(self) -> None:
+        await tracker.quit_drivers(self.drivers)
+        if self.session is not None:
+            await self.session.close()
+
+
+async def run_tracking(state: WarmState, reconcile_every: int) -> None:
+    await state.ensure_ready()
+    state.tracking_runs += 1
+    reconcile = reconcile_every > 0 and state.tracking_runs % reconcile_every == 0
+    try:
+        await tracker.track_followers(
+            state.drivers,
+            state.headers,
+            state.followers,
+            state.accounts,
+            state.session,
+            reconcile,
+            state.nitter_scraper(),
+        )
+    except Exception:
+        state.invalidate()
+        raise
+
+
+async def run_api_enrichment() -> None:
+    import fetch_profile
+
+    try:
+        await asyncio.to_thread(fetch_profile.main)
+    except SystemExit as e:
+        # fetch_profile exits the process when it hits the rate limit
+        raise RuntimeError(f"API enrichment stopped with exit code {e.code}")
+
+
+async def run_nitter_enrichment(state: WarmState) -> None:
+    import scrape_empty_accounts
+
+    await asyncio.to_thread(
+        scrape_empty_accounts.main, state.nitter_scraper(), state.forget_account
+    )
+
+
+async def run_analysis() -> None:
+    from twitter_profile_analyzer import process_recent_accounts
+
+    await process_recent_accounts(
+        settings.airtable_rate_limit, settings.airtable_batch_size
+    )
+
+
+def build_scheduler(state: WarmState, args: argparse.Namespace) -> Scheduler:
+    """
+    Schedule the jobs that are configured.
+
+    Enrichment runs after tracking, so new accounts are filled in as soon as
+    a tracking run has created them, and analysis runs after enrichment.
+    """
+    scheduler = Scheduler(profile=args.profile)
+    scheduler.add(
+        "tracking",
+        lambda: run_tracking(state, args.reconcile_every),
+        args.tracking_minutes * 60,
+        JOB_JITTER,
+    )
+    enrichment = []
+    if settings.twitter_bearer_token:
+        scheduler.add(
+            "api_enrichment",
+            run_api_enrichment,
+            args.api_enrichment_minutes * 60,
+            JOB_JITTER,
+            after=["tracking"],
+        )
+        enrichment.append("api_enrichment")
+    scheduler.add(
+        "nitter_enrichment",
+        lambda: run_nitter_enrichment(state),
+        args.nitter_enrichment_minutes * 60,
+        JOB_JITTER,
+        after=["tracking"],
+    )
+    enrichment.append("nitter_enrichment")
+    if settings.openai_api_key:
+        scheduler.add(
+            "analysis",
+            run_analysis,
+            args.analysis_minutes * 60,
+            JOB_JITTER,
+            after=enrichment,
+        )
+    logger.info(f"Scheduled jobs: {', '.join(scheduler.jobs)}")
+    return scheduler
+
+
+async def run_daemon(args: argparse.Namespace) -> None:
+    state = WarmState(WARM_STATE_HOURS * 3600)
+    scheduler = build_scheduler(state, args)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    logger.info(f"Daemon worker {tracker.WORKER_ID} started")
+    try:
+        await scheduler.run_forever(stop)
+    finally:
+        await state.close()
+        logger.info("Daemon stopped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run tracking, enrichment and analysis on a schedule in one "
+        "long-lived process, keeping browsers and tables warm between runs."
+    )
+    parser.add_argument("--tracking-minutes", type=float, default=TRACKING_MINUTES)
+    parser.add_argument(
+        "--api-enrichment-minutes", type=float, default=API_ENRICHMENT_MINUTES
+    )
+    parser.add_argument(
+        "--nitter-enrichment-minutes", type=float, default=NITTER_ENRICHMENT_MINUTES
+    )
+    parser.add_argument("--analysis-minutes", type=float, default=ANALYSIS_MINUTES)
+    parser.add_argument(
+        "--reconcile-every",
+        type=int,
+        default=RECONCILE_EVERY,
+        help="also remove unfollows on every Nth tracking run (0 to never)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="add cProfile output for the hottest functions to each job's run report",
+    )
+    args = parser.parse_args()
+    setup_logging()
+    asyncio.run(run_daemon(args))
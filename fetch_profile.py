@@ -3,27 +3,25 @@ import json
 import logging
 import time
 from datetime import datetime
-from dotenv import load_dotenv
 from utils.airtable import update_airtable_records, fetch_records_from_airtable
 from twitter.twitter import fetch_twitter_data_api
-import requests
 from utils.user_data import update_user_details
-from utils.config import load_env_variables
+from utils.config import get_settings
+from utils.lazy import lazy_import
 import sys
+import argparse
 
 from utils.logging_setup import setup_logging
+from utils import run_report
 
-load_dotenv()
+requests = lazy_import("requests")
 
-# Initialize logging
-setup_logging()
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-env_vars = load_env_variables()
-BEARER_TOKEN = env_vars.get("twitter_bearer_token")
-AIRTABLE_TOKEN = env_vars.get("airtable_token")
-TABLE_ID = env_vars.get("airtable_accounts_table")
+settings = get_settings()
+BEARER_TOKEN = settings.twitter_bearer_token
+AIRTABLE_TOKEN = settings.airtable_token
+TABLE_ID = settings.airtable_accounts_table
 
 
 # Add this function to check if the tokens are loaded properly
@@ -58,7 +56,9 @@ def fetch_profile(username, retries=0):
 
     try:
         API_CALLS_MADE += 1
-        user_data = fetch_twitter_data_api(username, bearer_token=BEARER_TOKEN)
+        run_report.count("twitter_api_calls")
+        with run_report.phase("twitter_api_fetch", username):
+            user_data = fetch_twitter_data_api(username, bearer_token=BEARER_TOKEN)
         if not user_data:
             logger.error(f"No data returned for {username}")
             return None
@@ -176,9 +176,12 @@ def process_batch(updated_records):
         return []
 
     try:
-        success = update_airtable_records(
-            updated_records, TABLE_ID, {"Authorization": f"Bearer {AIRTABLE_TOKEN}"}
-        )
+        with run_report.phase("airtable_update"):
+            success = update_airtable_records(
+                updated_records,
+                TABLE_ID,
+                {"Authorization": f"Bearer {AIRTABLE_TOKEN}"},
+            )
         if success:
             logger.info(
                 f"Successfully updated batch of {len(updated_records)} records in Airtable"
@@ -197,6 +200,8 @@ def process_batch(updated_records):
 
 
 def main():
+    global API_CALLS_MADE
+    API_CALLS_MADE = 0  # The call budget is per run
     try:
         if not check_tokens():
             logger.error("Required tokens are missing. Exiting the script.")
@@ -276,4 +281,14 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(
+        description="Enrich Accounts missing profile data through the Twitter API."
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="add cProfile output for the hottest functions to the run report",
+    )
+    args = parser.parse_args()
+    setup_logging()
+    run_report.run_with_report("fetch_profile", main, profile=args.profile)
@@ -1,62 +1,134 @@
-import logging
-from utils.logging_setup import setup_logging  # Import early for logging configuration
-
-setup_logging()  # Initialize logging before other imports
+from __future__ import annotations
 
-import requests
+import logging
 import sys
-import gc
-import psutil
 import os
+import argparse
 import asyncio
-import aiohttp
+import shutil
+import socket
 import time
-from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, List, Set, Tuple, Optional
-from selenium import webdriver
-from filelock import FileLock, Timeout
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Set, Tuple, Optional
+from utils.logging_setup import setup_logging
 from utils.airtable import (
+    airtable_headers,
+    airtable_url,
     fetch_records_from_airtable,
-    post_airtable_records,
-    update_airtable_records,
-    update_followers_field,
 )
-from utils.config import load_env_variables
-from twitter.twitter import fetch_list_members
-from scraping.scraping import (
-    init_driver,
-    load_cookies,
-    get_following,
-)
-from scrape_empty_accounts import main as scrape_empty_accounts_main
-from fetch_profile import main as fetch_profile_main
+from utils.config import get_settings
+from utils.lazy import lazy_import
+from twitter.list_sync import parse_list_ids, sync_list_followers
+from utils.memory import MemoryGovernor
+from utils.account_index import AccountIndex, difference
+from utils.concurrency import LIMITER_DEFAULTS, get_limiter
+from utils import run_report
+from utils.event_stream import EventStream, follow_event, open_event_stream
+from utils.follow_log import FOLLOW, UNFOLLOW, FollowLog
+from utils.lease_queue import LeaseQueue
+from utils.pipeline import STOP, StageStats, PipelineMonitor, run_stage
 from pathlib import Path
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+    from scraping.following_source import FollowingRouter
+    from twitter.nitter_scraper import NitterScraper
+
+# Heavy dependencies are loaded on first use so that importing this module
+# and `--help` stay fast; Selenium comes in with scraping.scraping.
+aiohttp = lazy_import("aiohttp")
+requests = lazy_import("requests")
+
 # Global constants
-env_vars = load_env_variables()
-BASE_ID = env_vars["airtable_base_id"]
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-LOCK_FILE = "/tmp/followfeed_script.lock"
-
-# Constants from environment variables
-FOLLOWERS_TABLE_ID = env_vars["airtable_followers_table"]
-ACCOUNTS_TABLE_ID = env_vars["airtable_accounts_table"]
 
 # Performance optimization constants
-MAX_CONCURRENT_PROCESSES = 2  # Conservative setting for 4 vCPUs
+MAX_CONCURRENT_PROCESSES = 2  # Browsers started; the browser limiter's ceiling
 BATCH_SIZE = 10  # Reduced from 10 to be more memory-efficient
+PIPELINE_QUEUE_SIZE = 20  # Items buffered between pipeline stages
+AIRTABLE_REQUEST_DELAY = 0.2  # Seconds between Airtable batch requests
+# Nitter workers enriching newly created accounts; the nitter limiter
+# decides how many of them fetch at once
+ENRICHMENT_WORKERS = LIMITER_DEFAULTS["nitter"]["max_limit"]
+
+LEASE_SECONDS = 900  # Lease length, renewed by heartbeat while we work
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+# A full reconcile removing more than this share of a follower's stored
+# links looks like a list that did not load, not a wave of unfollows
+MAX_UNFOLLOW_FRACTION = 0.25
+MIN_UNFOLLOWS_CAPPED = 10  # Fewer removals than this are always applied
+# Following-list record keys and the Accounts fields new accounts get from them
+HARVESTED_FIELDS = {
+    "name": "Full Name",
+    "description": "Description",
+    "id": "Account ID",
+    "followers_count": "Followers Count",
+    "following_count": "Following Count",
+}
 
 # Add absolute path handling
 BASE_DIR = Path(__file__).resolve().parent
 sys.path.append(str(BASE_DIR))
 
+GOVERNOR_POLL_SECONDS = 15  # How often a paused browser worker rechecks memory
+# How long a driverless worker waits after passing a follower on to the browsers
+HANDOFF_POLL_SECONDS = 1
+
+
+# Settings are read on first use, so importing this module has no side effects
+def followers_url(record_id: Optional[str] = None) -> str:
+    return airtable_url(get_settings().airtable_followers_table, record_id)
 
-def log_memory_usage():
-    """Log current memory usage of the process"""
-    process = psutil.Process(os.getpid())
-    memory_info = process.memory_info()
-    logging.info(f"Memory usage: {memory_info.rss / 1024 / 1024:.2f} MB")
+
+def accounts_url(record_id: Optional[str] = None) -> str:
+    return airtable_url(get_settings().airtable_accounts_table, record_id)
+
+
+def lease_db_path() -> str:
+    """Work leases let several tracker processes share the follower set."""
+    return get_settings().tracking_lease_db or os.path.join(
+        SCRIPT_DIR, ".cache", "tracking_leases.sqlite"
+    )
+
+
+def revisit_seconds() -> float:
+    """How long a tracked follower rests before it is due again."""
+    return get_settings().tracking_revisit_minutes * 60
+
+
+def follow_log_path() -> str:
+    """Local append-only history of every follow and unfollow found."""
+    return get_settings().follow_log_db or os.path.join(
+        SCRIPT_DIR, ".cache", "follow_log.sqlite"
+    )
+
+
+def list_membership_cache() -> str:
+    """Kept next to the lease database, which every tracker host shares."""
+    return os.path.join(os.path.dirname(lease_db_path()), "list_members.json")
+
+
+_memory_governor: Optional[MemoryGovernor] = None
+
+
+def get_memory_governor() -> MemoryGovernor:
+    """The process-wide memory governor, created on first use."""
+    global _memory_governor
+    if _memory_governor is None:
+        settings = get_settings()
+        _memory_governor = MemoryGovernor(
+            driver_budget_mb=settings.driver_memory_budget_mb,
+            host_limit_percent=settings.host_memory_limit_percent,
+        )
+    return _memory_governor
+
+
+def log_memory_usage(drivers: Optional[List[webdriver.Chrome]] = None):
+    """Log memory usage of the process and the browsers it started"""
+    get_memory_governor().log_usage(drivers or [])
 
 
 def normalize_username(username: str) -> str:
@@ -64,26 +136,49 @@ def normalize_username(username: str) -> str:
     return username.strip().lower()
 
 
+def harvested_fields(profile: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """The Accounts fields a following-list record already fills."""
+    if not profile:
+        return {}
+    return {
+        field: profile[key]
+        for key, field in HARVESTED_FIELDS.items()
+        if profile.get(key) is not None
+    }
+
+
 async def fetch_and_update_accounts(
     usernames: Set[str],
     headers: Dict[str, str],
-    accounts: Dict[str, str],
+    accounts: AccountIndex,
     session: Optional[aiohttp.ClientSession] = None,
-) -> Dict[str, str]:
-    """Fetch or create accounts for all usernames, including existing ones not in accounts dict."""
+    on_created: Optional[Callable[[str, str, Dict[str, Any]], None]] = None,
+    profiles: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> AccountIndex:
+    """
+    Fetch or create accounts for all usernames, including existing ones not in accounts dict.
+    Usernames already in accounts are not looked up again.
+    New accounts are created with whatever profiles (handle -> following-list
+    record) knows about them.
+    on_created gets (record_id, username, fields) for every account created here.
+    """
     normalized_usernames = {normalize_username(username) for username in usernames}
 
-    # First, fetch ALL existing accounts from Airtable that match our usernames
-    formula = (
-        "OR("
-        + ",".join(
-            [f"LOWER({{Username}}) = '{username}'" for username in normalized_usernames]
+    # Look up usernames we have no record id for; they may have been created
+    # by another worker since our accounts table was loaded
+    unknown_usernames = {u for u in normalized_usernames if u not in accounts}
+    existing_records = []
+    if unknown_usernames:
+        formula = (
+            "OR("
+            + ",".join(
+                [f"LOWER({{Username}}) = '{username}'" for username in unknown_usernames]
+            )
+            + ")"
+        )
+        existing_records = fetch_records_from_airtable(
+            get_settings().airtable_accounts_table, headers, formula=formula
         )
-        + ")"
-    )
-    existing_records = fetch_records_from_airtable(
-        ACCOUNTS_TABLE_ID, headers, formula=formula
-    )
 
     # Update accounts dict with any existing accounts we didn't know about
     for record in existing_records:
@@ -93,19 +188,29 @@ async def fetch_and_update_accounts(
             logging.debug(f"Found existing account: {username} -> {record['id']}")
 
     # Now create any truly new accounts
-    new_usernames = normalized_usernames - set(accounts.keys())
+    new_usernames = {u for u in unknown_usernames if u not in accounts}
     if new_usernames:
         logging.info(f"Creating {len(new_usernames)} new accounts")
-        new_entries = [{"fields": {"Username": username}} for username in new_usernames]
+        profiles = profiles or {}
+        new_entries = [
+            {
+                "fields": {
+                    "Username": username,
+                    **harvested_fields(profiles.get(username)),
+                }
+            }
+            for username in new_usernames
+        ]
 
         if session:
             # Use session directly for async operation
             try:
-                async with session.post(
-                    f"https://api.airtable.com/v0/{BASE_ID}/{ACCOUNTS_TABLE_ID}",
+                async with get_limiter("airtable").slot() as slot, session.post(
+                    accounts_url(),
                     headers=headers,
                     json={"records": new_entries},
                 ) as response:
+                    slot.record_status(response.status)
                     if response.status == 200:
                         created_records = await response.json()
                         created_records = created_records.get("records", [])
@@ -116,6 +221,10 @@ async def fetch_and_update_accounts(
                             )
                             if username:
                                 accounts[username] = record["id"]
+                                if on_created:
+                                    on_created(
+                                        record["id"], username, record["fields"]
+                                    )
                                 logging.debug(
                                     f"Created new account: {username} -> {record['id']}"
                                 )
@@ -125,7 +234,7 @@ async def fetch_and_update_accounts(
             # Fallback to synchronous operation if no session provided
             try:
                 response = requests.post(
-                    f"https://api.airtable.com/v0/{BASE_ID}/{ACCOUNTS_TABLE_ID}",
+                    accounts_url(),
                     headers=headers,
                     json={"records": new_entries},
                 )
@@ -135,6 +244,8 @@ async def fetch_and_update_accounts(
                     username = normalize_username(record["fields"].get("Username", ""))
                     if username:
                         accounts[username] = record["id"]
+                        if on_created:
+                            on_created(record["id"], username, record["fields"])
                         logging.debug(
                             f"Created new account: {username} -> {record['id']}"
                         )
@@ -145,25 +256,18 @@ async def fetch_and_update_accounts(
 
 
 def fetch_existing_follows(
-    record_id: str, headers: Dict[str, str], record_id_to_username: Dict[str, str]
+    record_id: str, headers: Dict[str, str], accounts: AccountIndex
 ) -> Set[str]:
     """
     Fetch existing follows for a given follower.
     """
     try:
         response = requests.get(
-            f"https://api.airtable.com/v0/{BASE_ID}/{FOLLOWERS_TABLE_ID}/{record_id}",
+            followers_url(record_id),
             headers=headers,
         )
         response.raise_for_status()
-        record = response.json()
-        existing_account_ids = record["fields"].get("Account", [])
-        # Reverse map to usernames if needed
-        existing_usernames = {
-            record_id_to_username.get(acc_id, "").lower()
-            for acc_id in existing_account_ids
-        }
-        return existing_usernames
+        return existing_follow_usernames(response.json(), accounts)
     except requests.HTTPError as e:
         logging.error(
             f"Failed to fetch existing follows for record {record_id}: {e.response.text}"
@@ -171,6 +275,12 @@ def fetch_existing_follows(
         return set()
 
 
+def existing_follow_usernames(record: Dict, accounts: AccountIndex) -> Set[str]:
+    """Usernames of the accounts a Followers record is linked to."""
+    handles = accounts.handles_for_record_ids(record["fields"].get("Account", []))
+    return set(accounts.usernames(handles))
+
+
 def prepare_follower_update(record_id: str, account_ids: List[str]) -> Dict:
     """
     Prepare the payload for updating a follower's Account field.
@@ -192,7 +302,7 @@ def update_airtable_followers(
     follower_update = {"id": follower_record_id, "fields": {"Account": account_ids}}
     try:
         response = requests.patch(
-            f"https://api.airtable.com/v0/{BASE_ID}/{FOLLOWERS_TABLE_ID}",
+            followers_url(),
             headers=headers,
             json={"records": [follower_update]},
         )
@@ -208,97 +318,633 @@ def update_airtable_followers(
         return False
 
 
+@dataclass
+class LinkDiff:
+    """A follower's stored Account links, split by a full reconcile."""
+
+    kept: List[str]
+    removed: List[str]
+
+
+def diff_follow_links(
+    stored_ids: List[str], observed: Set[str], accounts: AccountIndex
+) -> LinkDiff:
+    """
+    Split stored Account record ids into those still followed and those no
+    longer in the observed following set.
+
+    Both sides are turned into sorted handle arrays and diffed in one merge
+    pass. Links to accounts this process has not loaded are kept.
+    """
+    stored = accounts.handles_for_record_ids(stored_ids)
+    removed_handles = set(difference(stored, accounts.handles(observed)))
+    kept, removed = [], []
+    for record_id in stored_ids:
+        if accounts.handle_for_record_id(record_id) in removed_handles:
+            removed.append(record_id)
+        else:
+            kept.append(record_id)
+    return LinkDiff(kept, removed)
+
+
+def plausible_unfollows(diff: LinkDiff) -> bool:
+    """Whether a reconcile's removals are few enough to apply."""
+    stored = len(diff.kept) + len(diff.removed)
+    if len(diff.removed) < MIN_UNFOLLOWS_CAPPED:
+        return True
+    return len(diff.removed) <= stored * MAX_UNFOLLOW_FRACTION
+
+
+async def scrape_follower(
+    username: str,
+    follower_record_id: str,
+    driver: webdriver.Chrome,
+    headers: Dict[str, str],
+    accounts: AccountIndex,
+    session: Optional[aiohttp.ClientSession] = None,
+    reconcile: bool = False,
+    router: Optional[FollowingRouter] = None,
+) -> Tuple[List[str], Optional[LinkDiff], Dict[str, Dict[str, Any]]]:
+    """
+    Scrape the handles a follower started following since the last run.
+
+    With reconcile=True the whole Following list is scrolled and, if the end
+    was reached, the stored links are diffed against it. Returns the new
+    handles, that diff (None when no full reconcile happened) and what the
+    list showed about each new handle.
+
+    The list is read through router, by default from driver only.
+    """
+    from scraping.following_source import FollowingRouter, SeleniumSource
+
+    if router is None:
+        router = FollowingRouter([SeleniumSource(cost=1)])
+
+    # Get the accounts this user is already following
+    with run_report.phase("fetch_existing_follows", username):
+        stored_ids = await fetch_follower_links_async(
+            follower_record_id, headers, session
+        )
+    # Scans test each handle they see against the stored handles in place
+    existing_follows = accounts.handle_set(
+        accounts.handles_for_record_ids(stored_ids or [])
+    )
+    logging.info(f"Existing follows for {username}: {len(existing_follows)}")
+
+    # Get new follows from Twitter without blocking the event loop
+    with run_report.phase("get_following", username):
+        scan = await router.fetch(username, existing_follows, reconcile, driver)
+    run_report.count("followers_scraped")
+
+    diff = None
+    if reconcile and scan.reached_end and stored_ids is not None:
+        diff = diff_follow_links(stored_ids, scan.observed, accounts)
+        if not plausible_unfollows(diff):
+            logging.warning(
+                f"Not reconciling {username}: {len(diff.removed)} of "
+                f"{len(stored_ids)} links would go, the list may not have loaded"
+            )
+            run_report.count("reconciles_rejected")
+            diff = None
+        else:
+            run_report.count("followers_reconciled")
+            if diff.removed:
+                logging.info(
+                    f"{username} no longer follows {len(diff.removed)} accounts"
+                )
+    elif reconcile:
+        logging.info(f"Not reconciling {username}: the full list was not read")
+
+    if not scan.new:
+        logging.info(f"No new follows found for {username}")
+    else:
+        logging.info(f"Found {len(scan.new)} new follows for {username}")
+    profiles = {h: scan.profiles[h] for h in scan.new if h in scan.profiles}
+    return scan.new, diff, profiles
+
+
+async def resolve_follows(
+    new_follows: List[str],
+    headers: Dict[str, str],
+    accounts: AccountIndex,
+    session: Optional[aiohttp.ClientSession] = None,
+    on_created: Optional[Callable[[str, str, Dict[str, Any]], None]] = None,
+    profiles: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> List[str]:
+    """Resolve scraped handles to Account record ids, creating missing accounts."""
+    await fetch_and_update_accounts(
+        set(new_follows), headers, accounts, session, on_created, profiles
+    )
+    account_ids = []
+    for uname in new_follows:
+        account_id = accounts.get(normalize_username(uname))
+        if account_id:
+            account_ids.append(account_id)
+    return account_ids
+
+
+async def write_follow_links(
+    follower_record_id: str,
+    account_ids: List[str],
+    headers: Dict[str, str],
+    session: Optional[aiohttp.ClientSession] = None,
+) -> int:
+    """Link the follower to each account, preserving the account's existing followers."""
+    airtable = get_limiter("airtable")
+    accounts_to_update = []
+
+    async def fetch_followers(account_id: str) -> None:
+        try:
+            # Fetch current followers for this account
+            async with airtable.slot() as slot, session.get(
+                accounts_url(account_id),
+                headers=headers,
+            ) as response:
+                slot.record_status(response.status)
+                if response.status == 200:
+                    record = await response.json()
+                    current_followers = record["fields"].get("Followers", [])
+                    if follower_record_id not in current_followers:
+                        accounts_to_update.append(
+                            {
+                                "id": account_id,
+                                "fields": {
+                                    "Followers": current_followers
+                                    + [follower_record_id]
+                                },
+                            }
+                        )
+        except Exception as e:
+            logging.error(
+                f"Failed to fetch followers for account {account_id}: {str(e)}"
+            )
+
+    # As many lookups run at once as the Airtable limiter allows
+    if session:
+        await asyncio.gather(*(fetch_followers(a) for a in account_ids))
+
+    updated = 0
+    # Update in smaller batches
+    for i in range(0, len(accounts_to_update), BATCH_SIZE):
+        batch = accounts_to_update[i : i + BATCH_SIZE]
+        try:
+            if session:
+                async with airtable.slot() as slot, session.patch(
+                    accounts_url(),
+                    headers=headers,
+                    json={"records": batch},
+                ) as response:
+                    slot.record_status(response.status)
+                    if response.status == 200:
+                        updated += len(batch)
+                        logging.info(
+                            f"Successfully updated Followers field for batch of {len(batch)} accounts"
+                        )
+            await asyncio.sleep(AIRTABLE_REQUEST_DELAY)  # Rate limiting protection
+        except Exception as e:
+            logging.error(
+                f"Failed to update Followers field for accounts batch: {str(e)}"
+            )
+    return updated
+
+
 async def process_user(
     username: str,
     follower_record_id: str,
     driver: webdriver.Chrome,
     headers: Dict[str, str],
-    accounts: Dict[str, str],
-    record_id_to_username: Dict[str, str],
+    accounts: AccountIndex,
     session: Optional[aiohttp.ClientSession] = None,
-) -> tuple[Dict[str, str], int]:
+) -> tuple[AccountIndex, int]:
     """Process a user's following list and update Airtable accordingly."""
     try:
-        # Get the accounts this user is already following
-        existing_follows = await fetch_existing_follows_async(
-            follower_record_id, headers, record_id_to_username, session
+        new_follows, _, profiles = await scrape_follower(
+            username,
+            follower_record_id,
+            driver,
+            headers,
+            accounts,
+            session,
         )
-        logging.info(f"Existing follows for {username}: {len(existing_follows)}")
-
-        # Get new follows from Twitter
-        new_follows = get_following(driver, username, existing_follows)
         if not new_follows:
-            logging.info(f"No new follows found for {username}")
             return accounts, 0
 
-        logging.info(f"Found {len(new_follows)} new follows for {username}")
+        with run_report.phase("resolve_accounts", username):
+            account_ids = await resolve_follows(
+                new_follows, headers, accounts, session, profiles=profiles
+            )
+        with run_report.phase("link_writes", username):
+            await write_follow_links(
+                follower_record_id, account_ids, headers, session
+            )
+        run_report.count("new_handles", len(new_follows))
+
+        # Clean up memory
+        get_memory_governor().collect()
+        return accounts, len(new_follows)
+    except Exception as e:
+        logging.error(f"Error processing user {username}: {str(e)}")
+        return accounts, 0
+
+
+async def feed_leased_followers(
+    lease_queue: LeaseQueue, queue: asyncio.Queue, stops: int, claim_size: int
+) -> None:
+    """Claim due followers a few at a time and queue them for scraping."""
+    while True:
+        claimed = await asyncio.to_thread(lease_queue.claim, WORKER_ID, claim_size)
+        if not claimed:
+            break
+        for record_id, username in claimed:
+            await queue.put((username, record_id))
+    for _ in range(stops):
+        await queue.put(STOP)
+
 
-        # Convert list to set and process in smaller batches
-        new_follows_set = set(new_follows)
-        accounts = await fetch_and_update_accounts(
-            new_follows_set, headers, accounts, session
+async def renew_leases(lease_queue: LeaseQueue) -> None:
+    """Heartbeat our leases until cancelled so other workers leave them alone."""
+    while True:
+        await asyncio.sleep(lease_queue.lease_seconds / 3)
+        renewed = await asyncio.to_thread(lease_queue.heartbeat, WORKER_ID)
+        logging.debug(f"Renewed {renewed} follower leases")
+
+
+async def run_tracking_pipeline(
+    lease_queue: LeaseQueue,
+    drivers: List[webdriver.Chrome],
+    headers: Dict[str, str],
+    accounts: AccountIndex,
+    session: aiohttp.ClientSession,
+    enrichment_queue: Optional[asyncio.Queue] = None,
+    reconcile: bool = False,
+    follow_log: Optional[FollowLog] = None,
+    event_stream: Optional[EventStream] = None,
+    router: Optional[FollowingRouter] = None,
+) -> int:
+    """
+    Track every due follower in the lease queue through scrape -> resolve -> write stages.
+
+    Each browser worker owns one driver and feeds scraped handles to the
+    resolver, which feeds account ids to the link writer. The bounded queues
+    between stages stop a fast stage from running ahead of a slow one, so
+    browsers keep scrolling during Airtable round trips without buffering
+    the whole run in memory. Accounts created by the resolver are pushed to
+    enrichment_queue as (record_id, username) as soon as they exist, unless
+    the Following list already showed their name and bio.
+
+    With reconcile=True every follower's full Following list is read, and
+    followers whose list was read to the end get their Account field
+    rewritten to exactly what they follow, which also drops unfollows.
+    Those writes are buffered and sent BATCH_SIZE followers per request.
+
+    Once a follower's links are written, its new follows and unfollows are
+    appended to follow_log and emitted on event_stream, if given.
+
+    Following lists are read through router (see scrape_follower). Sources
+    that need no Selenium driver, such as Playwright contexts, get scrape
+    workers of their own next to the one per driver. A follower whose
+    driverless read fails goes back on the queue for the browser workers.
+    """
+    from scraping.following_source import (
+        FollowingRouter,
+        SeleniumSource,
+        driver_lost,
+    )
+
+    if router is None:
+        router = FollowingRouter([SeleniumSource(cost=1)])
+
+    def on_created(record_id: str, username: str, fields: Dict[str, Any]) -> None:
+        run_report.count("accounts_created")
+        if fields.get("Full Name"):
+            # Created from the Following list cell, nothing left to scrape
+            run_report.count("accounts_harvested")
+            return
+        if enrichment_queue is not None:
+            enrichment_queue.put_nowait((record_id, username))
+
+    browsers = get_limiter("browser")
+    browsers.set_max_limit(len(drivers))
+    scrape_workers = len(drivers) + router.extra_workers()
+    if not scrape_workers:
+        raise RuntimeError(
+            "No scrape workers: no browsers were started and no Following "
+            "source in FOLLOWING_SOURCES can read without one"
         )
+    follower_queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    resolve_queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    write_queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
 
-        # Update the Followers field for each account while preserving existing followers
-        accounts_to_update = []
-        for uname in new_follows:
-            normalized_uname = normalize_username(uname)
-            if normalized_uname in accounts:
-                account_id = accounts[normalized_uname]
-                try:
-                    # Fetch current followers for this account
-                    if session:
-                        async with session.get(
-                            f"https://api.airtable.com/v0/{BASE_ID}/{ACCOUNTS_TABLE_ID}/{account_id}",
-                            headers=headers,
-                        ) as response:
-                            if response.status == 200:
-                                record = await response.json()
-                                current_followers = record["fields"].get(
-                                    "Followers", []
-                                )
-                                if follower_record_id not in current_followers:
-                                    accounts_to_update.append(
-                                        {
-                                            "id": account_id,
-                                            "fields": {
-                                                "Followers": current_followers
-                                                + [follower_record_id]
-                                            },
-                                        }
-                                    )
-                except Exception as e:
-                    logging.error(
-                        f"Failed to fetch followers for account {account_id}: {str(e)}"
-                    )
+    scrape_stats = StageStats("scrape")
+    resolve_stats = StageStats("resolve")
+    write_stats = StageStats("write")
+    total_new_handles = 0
+    follower_started: Dict[str, float] = {}
+    # follower record id -> (username, new handles, removed ids, ids to write)
+    pending_links: Dict[str, Tuple[str, List[str], List[str], List[str]]] = {}
+    # Followers a driverless read failed on, left to the browser workers
+    browser_only: Set[str] = set()
+
+    def finish_follower(username: str) -> None:
+        started = follower_started.pop(username, None)
+        if started is not None:
+            run_report.get_run_report().record(
+                "follower", time.monotonic() - started, username
+            )
 
-        if accounts_to_update:
-            # Update in smaller batches
-            for i in range(0, len(accounts_to_update), BATCH_SIZE):
-                batch = accounts_to_update[i : i + BATCH_SIZE]
-                try:
-                    if session:
-                        async with session.patch(
-                            f"https://api.airtable.com/v0/{BASE_ID}/{ACCOUNTS_TABLE_ID}",
-                            headers=headers,
-                            json={"records": batch},
-                        ) as response:
-                            if response.status == 200:
-                                logging.info(
-                                    f"Successfully updated Followers field for batch of {len(batch)} accounts"
-                                )
-                    await asyncio.sleep(0.2)  # Rate limiting protection
-                except Exception as e:
-                    logging.error(
-                        f"Failed to update Followers field for accounts batch: {str(e)}"
+    async def feed() -> None:
+        await feed_leased_followers(lease_queue, follower_queue, 0, scrape_workers)
+        # Stop the scrape workers only once no follower can be put back
+        await follower_queue.join()
+        for _ in range(scrape_workers):
+            await follower_queue.put(STOP)
+
+    async def scrape(item: Tuple[str, str], worker: int):
+        try:
+            return await scrape_item(item, worker)
+        finally:
+            follower_queue.task_done()
+
+    async def scrape_item(item: Tuple[str, str], worker: int):
+        username, record_id = item
+        # Workers past the Selenium drivers read through driverless sources
+        driver = drivers[worker] if worker < len(drivers) else None
+        if driver is None and record_id in browser_only:
+            await follower_queue.put(item)
+            await asyncio.sleep(HANDOFF_POLL_SECONDS)
+            return None
+        follower_started[username] = time.monotonic()
+        # Pause this browser worker while the host is short on memory
+        while driver is not None and worker >= get_memory_governor().allowed_workers(
+            len(drivers)
+        ):
+            await asyncio.sleep(GOVERNOR_POLL_SECONDS)
+        # A driverless worker waits while no source has quota left
+        while driver is None and not router.candidates():
+            await asyncio.sleep(GOVERNOR_POLL_SECONDS)
+
+        try:
+            # Browser workers beyond the adaptive limit wait here
+            async with browsers.slot() if driver is not None else nullcontext():
+                new_follows, diff, profiles = await scrape_follower(
+                    username,
+                    record_id,
+                    driver,
+                    headers,
+                    accounts,
+                    session,
+                    reconcile,
+                    router,
+                )
+        except Exception as e:
+            finish_follower(username)
+            if driver is None and drivers and record_id not in browser_only:
+                logging.warning(f"Leaving {username} to the browser workers: {e}")
+                browser_only.add(record_id)
+                await follower_queue.put(item)
+                return None
+            browser_only.discard(record_id)
+            run_report.count("followers_failed")
+            await asyncio.to_thread(lease_queue.release, WORKER_ID, record_id)
+            # If WebDriver connection is lost, restart this worker's driver
+            if driver is not None and driver_lost(e):
+                logging.warning(f"WebDriver {worker} lost, restarting: {e}")
+                drivers[worker] = await restart_driver(driver)
+            raise
+        browser_only.discard(record_id)
+
+        # Another source read the list, but this worker's driver is gone
+        lost = router.lost_driver(driver)
+        if lost is not None:
+            logging.warning(f"WebDriver {worker} lost, restarting: {lost}")
+            drivers[worker] = await restart_driver(driver)
+        # Recycle a browser that has grown past its memory budget
+        elif driver is not None and get_memory_governor().driver_over_budget(driver):
+            logging.info(f"Recycling WebDriver {worker} after {username}")
+            drivers[worker] = await restart_driver(driver)
+
+        if not new_follows and not (diff and diff.removed):
+            await asyncio.to_thread(lease_queue.complete, WORKER_ID, record_id)
+            finish_follower(username)
+            return None
+        return username, record_id, new_follows, diff, profiles
+
+    async def resolve(
+        item: Tuple[str, str, List[str], Optional[LinkDiff], Dict[str, Dict]],
+        worker: int,
+    ):
+        username, record_id, new_follows, diff, profiles = item
+        with run_report.phase("resolve_accounts", username):
+            account_ids = await resolve_follows(
+                new_follows, headers, accounts, session, on_created, profiles
+            )
+        return username, record_id, account_ids, new_follows, diff
+
+    async def follower_done(
+        username: str, record_id: str, new_follows: List[str], removed_ids: List[str]
+    ) -> None:
+        nonlocal total_new_handles
+        finish_follower(username)
+        run_report.count("new_handles", len(new_follows))
+        total_new_handles += len(new_follows)
+        logging.info(f"Processed {len(new_follows)} new handles for {username}.")
+        if follow_log is None and event_stream is None:
+            return
+        now = time.time()
+        removed = accounts.usernames(accounts.handles_for_record_ids(removed_ids))
+        if follow_log is not None:
+            try:
+                with run_report.phase("follow_log", username):
+                    await asyncio.to_thread(
+                        follow_log.append, username, new_follows, FOLLOW, now
                     )
+                    if removed:
+                        await asyncio.to_thread(
+                            follow_log.append, username, removed, UNFOLLOW, now
+                        )
+            except Exception as e:
+                logging.error(f"Failed to log follow events for {username}: {str(e)}")
+        if event_stream is not None:
+            events = [
+                follow_event(
+                    kind, username, record_id, handle, accounts.get(handle), now
+                )
+                for kind, handles in ((FOLLOW, new_follows), (UNFOLLOW, removed))
+                for handle in handles
+            ]
+            with run_report.phase("event_stream", username):
+                await asyncio.to_thread(event_stream.emit, events)
+
+    async def flush_links() -> None:
+        """Write the buffered Account fields and finish those followers."""
+        batch = dict(pending_links)
+        pending_links.clear()
+        with run_report.phase("link_writes"):
+            written = await write_follower_links(
+                {record_id: ids for record_id, (_, _, _, ids) in batch.items()},
+                headers,
+                session,
+            )
+        for record_id, (username, new_follows, removed, _) in batch.items():
+            if record_id in written:
+                await asyncio.to_thread(lease_queue.complete, WORKER_ID, record_id)
+                await follower_done(username, record_id, new_follows, removed)
+            else:
+                # Try this follower again on the next pass
+                await asyncio.to_thread(lease_queue.release, WORKER_ID, record_id)
+                finish_follower(username)
+
+    async def write(
+        item: Tuple[str, str, List[str], List[str], Optional[LinkDiff]], worker: int
+    ):
+        username, record_id, account_ids, new_follows, diff = item
+        if diff is not None:
+            # The complete set of follows is known, so write it as a whole
+            kept = set(diff.kept)
+            links = diff.kept + [a for a in account_ids if a not in kept]
+            pending_links[record_id] = (username, new_follows, diff.removed, links)
+            run_report.count("follows_removed", len(diff.removed))
+            if len(pending_links) >= BATCH_SIZE:
+                await flush_links()
+            return None
+
+        with run_report.phase("link_writes", username):
+            await write_follow_links(record_id, account_ids, headers, session)
+        await asyncio.to_thread(lease_queue.complete, WORKER_ID, record_id)
+        await follower_done(username, record_id, new_follows, [])
+        get_memory_governor().collect()
+        return None
+
+    monitor = PipelineMonitor(
+        [scrape_stats, resolve_stats, write_stats],
+        {
+            "followers": follower_queue,
+            "resolve": resolve_queue,
+            "write": write_queue,
+        },
+    )
+    monitor_task = asyncio.create_task(monitor.run())
+    heartbeat_task = asyncio.create_task(renew_leases(lease_queue))
+    # One task samples host memory; browser workers only read the limit
+    governor_task = asyncio.create_task(get_memory_governor().monitor(len(drivers)))
+    try:
+        await asyncio.gather(
+            feed(),
+            run_stage(
+                scrape_stats,
+                scrape,
+                follower_queue,
+                resolve_queue,
+                workers=scrape_workers,
+                downstream_workers=1,
+            ),
+            run_stage(resolve_stats, resolve, resolve_queue, write_queue),
+            run_stage(write_stats, write, write_queue),
+        )
+        if pending_links:
+            await flush_links()
+    finally:
+        for task in (monitor_task, heartbeat_task, governor_task):
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        # Followers that failed after scraping become due again right away
+        released = await asyncio.to_thread(lease_queue.release_all, WORKER_ID)
+        if released:
+            logging.info(f"Released {released} unfinished follower leases")
 
-        # Clean up memory
-        gc.collect()
-        return accounts, len(new_follows)
+    return total_new_handles
+
+
+def start_driver() -> webdriver.Chrome:
+    """
+    Start a WebDriver that is logged in with the session cookies.
+
+    With PROFILE_TEMPLATE_DIR set, the browser starts on a copy-on-write
+    clone of a profile that was logged in once, so it is ready without
+    loading x.com twice to set cookies. Otherwise, or if the template
+    cannot be used, the cookies are loaded into a fresh profile.
+    """
+    from scraping.scraping import init_driver, load_cookies
+
+    settings = get_settings()
+    started = time.monotonic()
+    cookie_path = settings.cookie_path
+    if cookie_path and settings.profile_template_dir:
+        driver = start_driver_from_template(cookie_path)
+        if driver is not None:
+            run_report.get_run_report().record(
+                "driver_ready", time.monotonic() - started
+            )
+            return driver
+
+    driver = init_driver()
+    if cookie_path:
+        load_cookies(driver, cookie_path)
+        logging.info(f"Cookies loaded from {cookie_path}")
+    run_report.get_run_report().record("driver_ready", time.monotonic() - started)
+    return driver
+
+
+def start_driver_from_template(cookie_path: str) -> Optional[webdriver.Chrome]:
+    """A driver on a clone of the logged-in profile template, None on failure."""
+    from fake_useragent import UserAgent
+
+    from scraping import profile_snapshot
+    from scraping.scraping import init_driver, load_cookies
+
+    template_dir = get_settings().profile_template_dir
+    try:
+        meta = profile_snapshot.ensure_template(
+            template_dir,
+            cookie_path,
+            init_driver,
+            load_cookies,
+            lambda: UserAgent().random,
+        )
+        profile_dir = profile_snapshot.clone_profile(
+            template_dir, os.path.dirname(os.path.abspath(template_dir))
+        )
     except Exception as e:
-        logging.error(f"Error processing user {username}: {str(e)}")
-        return accounts, 0
+        logging.error(f"Browser profile template unusable, loading cookies: {e}")
+        return None
+    try:
+        driver = init_driver(profile_dir, meta.get("user_agent"))
+    except Exception:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        raise
+    profile_snapshot.remove_with(driver, profile_dir)
+    logging.info(f"WebDriver started from profile template {template_dir}")
+    return driver
+
+
+def selenium_driver_count() -> int:
+    """Drivers to start: none when FOLLOWING_SOURCES leaves Selenium out."""
+    from scraping.following_source import parse_source_costs
+
+    if "selenium" not in parse_source_costs(get_settings().following_sources):
+        return 0
+    return MAX_CONCURRENT_PROCESSES
+
+
+async def start_drivers(drivers: List[webdriver.Chrome], count: int) -> None:
+    """
+    Start `count` WebDrivers into drivers, each on the thread that will run
+    all of its Selenium calls.
+    """
+    from scraping import driver_executor
+
+    for _ in range(count):
+        drivers.append(await driver_executor.start_driver(start_driver))
+
+
+async def restart_driver(driver: webdriver.Chrome) -> webdriver.Chrome:
+    """Quit a broken WebDriver and start a fresh one in its place."""
+    from scraping.driver_executor import replace_driver
+
+    return await replace_driver(driver, start_driver)
 
 
 async def batch_request_async(
@@ -311,9 +957,10 @@ async def batch_request_async(
         try:
             if isinstance(method, aiohttp.ClientSession):
                 # If method is a session, use it directly
-                async with method.post(
+                async with get_limiter("airtable").slot() as slot, method.post(
                     url, headers=headers, json={"records": batch}
                 ) as response:
+                    slot.record_status(response.status)
                     if response.status == 200:
                         response_json = await response.json()
                         results.extend(response_json.get("records", []))
@@ -334,7 +981,7 @@ async def batch_request_async(
             logging.debug(
                 f"Processed {len(batch)} entries in the {url.split('/')[-1]} table."
             )
-            await asyncio.sleep(0.2)  # Rate limiting protection
+            await asyncio.sleep(AIRTABLE_REQUEST_DELAY)  # Rate limiting protection
         except Exception as e:
             logging.error(
                 f"Failed to process entries in {url.split('/')[-1]} table: {str(e)}"
@@ -346,38 +993,28 @@ async def batch_request_async(
 async def fetch_existing_follows_async(
     record_id: str,
     headers: Dict[str, str],
-    record_id_to_username: Dict[str, str],
+    accounts: AccountIndex,
     session: Optional[aiohttp.ClientSession] = None,
 ) -> Set[str]:
     """Asynchronous version of fetch_existing_follows"""
     try:
         if session:
-            async with session.get(
-                f"https://api.airtable.com/v0/{BASE_ID}/{FOLLOWERS_TABLE_ID}/{record_id}",
+            async with get_limiter("airtable").slot() as slot, session.get(
+                followers_url(record_id),
                 headers=headers,
             ) as response:
+                slot.record_status(response.status)
                 if response.status == 200:
                     record = await response.json()
-                    existing_account_ids = record["fields"].get("Account", [])
-                    existing_usernames = {
-                        record_id_to_username.get(acc_id, "").lower()
-                        for acc_id in existing_account_ids
-                    }
-                    return existing_usernames
+                    return existing_follow_usernames(record, accounts)
 
         # Fallback to synchronous request if no session provided
         response = requests.get(
-            f"https://api.airtable.com/v0/{BASE_ID}/{FOLLOWERS_TABLE_ID}/{record_id}",
+            followers_url(record_id),
             headers=headers,
         )
         response.raise_for_status()
-        record = response.json()
-        existing_account_ids = record["fields"].get("Account", [])
-        existing_usernames = {
-            record_id_to_username.get(acc_id, "").lower()
-            for acc_id in existing_account_ids
-        }
-        return existing_usernames
+        return existing_follow_usernames(response.json(), accounts)
     except Exception as e:
         logging.error(
             f"Failed to fetch existing follows for record {record_id}: {str(e)}"
@@ -385,13 +1022,77 @@ async def fetch_existing_follows_async(
         return set()  # Return empty set instead of None
 
 
+async def fetch_follower_links_async(
+    record_id: str,
+    headers: Dict[str, str],
+    session: Optional[aiohttp.ClientSession] = None,
+) -> Optional[List[str]]:
+    """The Account record ids a follower is linked to, or None if the fetch failed."""
+    url = followers_url(record_id)
+    if session is None:
+        async with aiohttp.ClientSession() as own_session:
+            return await fetch_follower_links_async(record_id, headers, own_session)
+    try:
+        async with get_limiter("airtable").slot() as slot, session.get(
+            url, headers=headers
+        ) as response:
+            slot.record_status(response.status)
+            if response.status == 200:
+                record = await response.json()
+                return record["fields"].get("Account", [])
+            logging.error(
+                f"Failed to fetch links of follower {record_id}: {response.status}"
+            )
+    except Exception as e:
+        logging.error(f"Failed to fetch links of follower {record_id}: {str(e)}")
+    return None
+
+
+async def write_follower_links(
+    links: Dict[str, List[str]],
+    headers: Dict[str, str],
+    session: aiohttp.ClientSession,
+) -> Set[str]:
+    """
+    Set the Account field of several followers at once, BATCH_SIZE per request.
+
+    links maps follower record id -> the complete list of Account record ids.
+    Returns the follower record ids that were written.
+    """
+    written: Set[str] = set()
+    records = [
+        {"id": record_id, "fields": {"Account": account_ids}}
+        for record_id, account_ids in links.items()
+    ]
+    for i in range(0, len(records), BATCH_SIZE):
+        batch = records[i : i + BATCH_SIZE]
+        try:
+            async with get_limiter("airtable").slot() as slot, session.patch(
+                followers_url(),
+                headers=headers,
+                json={"records": batch},
+            ) as response:
+                slot.record_status(response.status)
+                if response.status == 200:
+                    written.update(record["id"] for record in batch)
+                else:
+                    logging.error(
+                        f"Failed to write links of {len(batch)} followers: "
+                        f"{response.status}"
+                    )
+            await asyncio.sleep(AIRTABLE_REQUEST_DELAY)  # Rate limiting protection
+        except Exception as e:
+            logging.error(f"Failed to write links of {len(batch)} followers: {str(e)}")
+    return written
+
+
 def fetch_current_account_ids(record_id: str, headers: Dict[str, str]) -> List[str]:
     """
     Fetch current Account IDs for a given follower record.
     """
     try:
         response = requests.get(
-            f"https://api.airtable.com/v0/{BASE_ID}/{FOLLOWERS_TABLE_ID}/{record_id}",
+            followers_url(record_id),
             headers=headers,
         )
         response.raise_for_status()
@@ -409,8 +1110,7 @@ async def process_list_members(
     followers: Dict[str, str],
     driver: webdriver.Chrome,
     headers: Dict[str, str],
-    accounts: Dict[str, str],
-    record_id_to_username: Dict[str, str],
+    accounts: AccountIndex,
 ) -> int:
     """Process list members asynchronously in batches"""
     total_new_handles = 0
@@ -434,7 +1134,6 @@ async def process_list_members(
                             driver,
                             headers,
                             accounts,
-                            record_id_to_username,
                             session,
                         )
                         total_new_handles += new_handles
@@ -447,8 +1146,8 @@ async def process_list_members(
             await asyncio.sleep(2)
 
             # Memory management after each batch
-            gc.collect()
-            log_memory_usage()
+            get_memory_governor().collect()
+            log_memory_usage([driver])
 
         except Exception as e:
             logging.error(f"Error processing batch starting at index {i}: {str(e)}")
@@ -460,9 +1159,8 @@ async def process_batch_of_followers(
     batch: List[Tuple[str, str]],
     driver: webdriver.Chrome,
     headers: Dict[str, str],
-    accounts: Dict[str, str],
-    record_id_to_username: Dict[str, str],
-) -> Dict[str, str]:
+    accounts: AccountIndex,
+) -> AccountIndex:
     """Process a batch of followers asynchronously"""
     async with aiohttp.ClientSession() as session:
         for username, record_id in batch:
@@ -473,7 +1171,6 @@ async def process_batch_of_followers(
                     driver,
                     headers,
                     accounts,
-                    record_id_to_username,
                     session,
                 )
                 logging.info(f"Processed {new_handles} new handles for {username}.")
@@ -486,10 +1183,152 @@ async def process_batch_of_followers(
     return accounts
 
 
-async def main_async():
+def load_tracking_state(
+    headers: Dict[str, str]
+) -> Tuple[Dict[str, str], AccountIndex]:
+    """
+    Load the Followers and Accounts tables.
+
+    Returns (followers, accounts): followers maps lowercase username -> record
+    id, accounts indexes Account usernames and record ids both ways.
+    """
+    # Fetch existing followers
+    existing_followers = fetch_records_from_airtable(
+        get_settings().airtable_followers_table, headers
+    )
+    followers = {
+        record["fields"]["Username"].lower(): record["id"]
+        for record in existing_followers
+        if "Username" in record["fields"]
+    }
+    del existing_followers
+
+    # Fetch existing accounts
+    existing_accounts = fetch_records_from_airtable(
+        get_settings().airtable_accounts_table, headers
+    )
+    accounts = AccountIndex(
+        (record["fields"]["Username"].lower(), record["id"])
+        for record in existing_accounts
+        if "Username" in record["fields"]
+    )
+    return followers, accounts
+
+
+async def sync_followers_from_lists(
+    followers: Dict[str, str],
+    headers: Dict[str, str],
+    session: Optional[aiohttp.ClientSession] = None,
+) -> None:
+    """Add and remove Followers rows to match the members of LIST_ID."""
+    settings = get_settings()
+    # Twitter lists whose members are tracked as followers
+    list_ids = parse_list_ids(settings.list_id)
+    bearer_token = settings.twitter_bearer_token
+    if not list_ids or not bearer_token:
+        return
+    if session is None:
+        async with aiohttp.ClientSession() as session:
+            return await sync_followers_from_lists(followers, headers, session)
+    created, deleted = await sync_list_followers(
+        list_ids,
+        {"Authorization": f"Bearer {bearer_token}"},
+        followers_url(),
+        headers,
+        followers,
+        session,
+        list_membership_cache(),
+    )
+    if created or deleted:
+        logging.info(f"List sync added {created} and removed {deleted} followers")
+
+
+def seed_follower_leases(lease_queue: LeaseQueue, followers: Dict[str, str]) -> None:
+    """Make the lease queue's work set match the Followers table."""
+    lease_queue.seed(
+        {record_id: username for username, record_id in followers.items()},
+        prune=True,
+    )
+
+
+async def track_followers(
+    drivers: List[webdriver.Chrome],
+    headers: Dict[str, str],
+    followers: Dict[str, str],
+    accounts: AccountIndex,
+    session: aiohttp.ClientSession,
+    reconcile: bool = False,
+    nitter_scraper: Optional[NitterScraper] = None,
+) -> int:
+    """
+    One tracking pass over the followers that are due, with already started
+    drivers and already loaded tables.
+
+    Syncs list members into followers, then scrapes every follower this
+    worker can lease while new accounts are enriched through Nitter, with
+    nitter_scraper if given or else a new scraper for this pass.
+    followers and accounts are updated in place, so a long-running caller
+    can keep them for the next pass. With reconcile=True unfollows are
+    detected too (see run_tracking_pipeline). Returns the number of new
+    handles.
+    """
+    from scrape_empty_accounts import run_enrichment_workers
+    from scraping.following_source import default_router
+
+    with run_report.phase("list_sync"):
+        await sync_followers_from_lists(followers, headers, session)
+
+    # Share the follower set with any other tracker processes
+    lease_queue = LeaseQueue(
+        lease_db_path(),
+        lease_seconds=LEASE_SECONDS,
+        revisit_seconds=revisit_seconds(),
+    )
+    seed_follower_leases(lease_queue, followers)
+    logging.info(
+        f"Worker {WORKER_ID}: {lease_queue.due_count()} of {len(followers)} "
+        f"followers due, {len(drivers)} browser workers"
+    )
+    # Each follower is read from the cheapest Following source with quota left
+    router = default_router(session)
+    # New accounts are enriched through Nitter while tracking continues
+    enrichment_queue: asyncio.Queue = asyncio.Queue()
+    event_stream = open_event_stream(get_settings().follow_event_stream)
+    enrichment_task = asyncio.create_task(
+        run_enrichment_workers(enrichment_queue, ENRICHMENT_WORKERS, nitter_scraper)
+    )
+    try:
+        total_new_handles = await run_tracking_pipeline(
+            lease_queue,
+            drivers,
+            headers,
+            accounts,
+            session,
+            enrichment_queue,
+            reconcile,
+            FollowLog(follow_log_path()),
+            event_stream,
+            router,
+        )
+        logging.info(f"Tracking found {total_new_handles} new handles in total")
+        logging.info(f"Following sources - {router.summary()}")
+        log_memory_usage(drivers)
+    finally:
+        await router.close()
+        if event_stream is not None:
+            event_stream.close()
+        # Let the enrichment workers drain what is already queued
+        for _ in range(ENRICHMENT_WORKERS):
+            enrichment_queue.put_nowait(STOP)
+        enrichment_stats = await enrichment_task
+        logging.info(f"Enrichment finished - {enrichment_stats.summary()}")
+    return total_new_handles
+
+
+async def main_async(reconcile: bool = False):
     """Asynchronous version of main function"""
     logger = logging.getLogger(__name__)
-    driver = None
+    drivers: List[webdriver.Chrome] = []
     max_retries = 3
     retry_count = 0
 
@@ -498,109 +1337,15 @@ async def main_async():
 
         while retry_count < max_retries:
             try:
-                # Initialize the driver before the loop
-                driver = init_driver()
-                cookie_path = env_vars.get("cookie_path")
-                if cookie_path:
-                    load_cookies(driver, cookie_path)
-                    logger.info(f"Cookies loaded from {cookie_path}")
-
-                headers = {
-                    "Authorization": f"Bearer {env_vars['airtable_token']}",
-                    "Content-Type": "application/json",
-                }
-
-                # Fetch existing followers
-                existing_followers = fetch_records_from_airtable(
-                    FOLLOWERS_TABLE_ID, headers
-                )
-                followers = {
-                    record["fields"]["Username"].lower(): record["id"]
-                    for record in existing_followers
-                    if "Username" in record["fields"]
-                }
-
-                # Fetch existing accounts
-                existing_accounts = fetch_records_from_airtable(
-                    ACCOUNTS_TABLE_ID, headers
-                )
-                accounts = {
-                    record["fields"]["Username"].lower(): record["id"]
-                    for record in existing_accounts
-                    if "Username" in record["fields"]
-                }
-
-                record_id_to_username = {
-                    record["id"]: record["fields"]["Username"].lower()
-                    for record in existing_accounts
-                    if "Username" in record["fields"]
-                }
-
-                # Process followers in batches
-                processed_count = 0
-                total_followers = len(followers.items())
+                # Initialize one driver per browser worker
+                await start_drivers(drivers, selenium_driver_count())
 
+                headers = airtable_headers()
+                followers, accounts = load_tracking_state(headers)
                 async with aiohttp.ClientSession() as session:
-                    async with asyncio.TaskGroup() as tg:
-                        for i in range(0, total_followers, BATCH_SIZE):
-                            batch = list(followers.items())[i : i + BATCH_SIZE]
-                            batch_tasks = []
-
-                            for username, record_id in batch:
-                                try:
-                                    task = tg.create_task(
-                                        process_user(
-                                            username,
-                                            record_id,
-                                            driver,
-                                            headers,
-                                            accounts,
-                                            record_id_to_username,
-                                            session,
-                                        )
-                                    )
-                                    batch_tasks.append(task)
-                                    processed_count += 1
-
-                                    if processed_count % 10 == 0:
-                                        logger.info(
-                                            f"Progress: {processed_count}/{total_followers} followers processed"
-                                        )
-
-                                    # Add a small delay between user task creation
-                                    await asyncio.sleep(0.5)
-                                except Exception as e:
-                                    logger.error(
-                                        f"Error processing follower {username}: {str(e)}",
-                                        exc_info=True,
-                                    )
-                                    # If WebDriver error, break the loop to restart driver
-                                    if "Connection refused" in str(e):
-                                        raise Exception("WebDriver connection lost")
-
-                            # Process tasks in the batch
-                            for task, username in zip(
-                                batch_tasks, [item[0] for item in batch]
-                            ):
-                                try:
-                                    result = await task
-                                    new_accounts, new_handles = result
-                                    accounts.update(new_accounts)
-                                    logger.info(
-                                        f"Processed {new_handles} new handles for {username}."
-                                    )
-                                except Exception as e:
-                                    logger.error(
-                                        f"Task failed for {username}: {str(e)}",
-                                        exc_info=True,
-                                    )
-
-                            # Add delay between batches
-                            await asyncio.sleep(2)
-
-                            # Memory management after each batch
-                            gc.collect()
-                            log_memory_usage()
+                    await track_followers(
+                        drivers, headers, followers, accounts, session, reconcile
+                    )
 
                 # If we get here, everything worked
                 break
@@ -608,12 +1353,7 @@ async def main_async():
             except Exception as e:
                 retry_count += 1
                 logger.error(f"Attempt {retry_count} failed: {str(e)}")
-                if driver:
-                    try:
-                        driver.quit()
-                    except:
-                        pass
-                    driver = None
+                await quit_drivers(drivers)
                 if retry_count < max_retries:
                     logger.info(f"Retrying in 30 seconds...")
                     await asyncio.sleep(30)
@@ -621,46 +1361,37 @@ async def main_async():
                     logger.error("Max retries reached. Exiting.")
                     raise
 
-        # Enrich new Accounts running scrape_empty_accounts.py
-        scrape_empty_accounts_main()
-
     except Exception as e:
         logger.exception("An error occurred during execution")
     finally:
-        if driver:
-            try:
-                driver.quit()
-            except:
-                pass
+        await quit_drivers(drivers)
         log_memory_usage()
         logger.info("Main function completed.")
 
 
-def main():
-    """Main function that runs the script."""
-    lock = FileLock(LOCK_FILE, timeout=1)
+async def quit_drivers(drivers: List[webdriver.Chrome]) -> None:
+    """Quit every driver in the list, each on its own thread, and empty it."""
+    from scraping.driver_executor import quit_driver
+
+    await asyncio.gather(*(quit_driver(driver) for driver in drivers))
+    drivers.clear()
 
+
+def main(reconcile: bool = False):
+    """
+    Main function that runs the script.
+
+    Any number of copies may run at once, on this host or on others sharing
+    the lease database directory; each claims followers from the lease queue.
+    With reconcile=True each follower's whole Following list is read so that
+    unfollows are removed from Airtable as well.
+    """
+    logging.info(f"Starting tracking worker {WORKER_ID} (leases in {lease_db_path()})")
     try:
-        with lock:
-            logging.info("Lock acquired successfully")
-            try:
-                asyncio.run(main_async())
-            except Exception as e:
-                logging.exception(f"An error occurred in main_async: {e}")
-                sys.exit(1)
-    except Timeout:
-        logging.warning("Another instance is already running")
-        sys.exit(0)
+        asyncio.run(main_async(reconcile))
     except Exception as e:
-        logging.exception(f"An unexpected error occurred: {e}")
+        logging.exception(f"An error occurred in main_async: {e}")
         sys.exit(1)
-    finally:
-        try:
-            if os.path.exists(LOCK_FILE):
-                os.unlink(LOCK_FILE)
-                logging.info("Lock released")
-        except Exception as e:
-            logging.error(f"Error removing lock file: {e}")
 
 
 def load_env():
@@ -673,4 +1404,21 @@ def load_env():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(
+        description="Track new follows for the followers in Airtable."
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="add cProfile output for the hottest functions to the run report",
+    )
+    parser.add_argument(
+        "--reconcile",
+        action="store_true",
+        help="read each Following list to the end and remove unfollowed accounts",
+    )
+    args = parser.parse_args()
+    setup_logging()
+    run_report.run_with_report(
+        "main", lambda: main(args.reconcile), profile=args.profile
+    )
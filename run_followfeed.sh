@@ -68,31 +68,8 @@ if [ -f "$LOG_FILE" ]; then
     fi
 fi
 
-# Check for lock file to prevent concurrent runs
-LOCK_FILE="/tmp/followfeed_script.lock"
-if [ -f "$LOCK_FILE" ]; then
-    # Check if the process is still running
-    LOCK_PID=$(cat "$LOCK_FILE" 2>/dev/null || echo "")
-    if [ -n "$LOCK_PID" ] && kill -0 "$LOCK_PID" 2>/dev/null; then
-        log "Another instance is already running (PID: $LOCK_PID). Exiting."
-        exit 0
-    else
-        log "Removing stale lock file"
-        rm -f "$LOCK_FILE"
-    fi
-fi
-
-# Create lock file
-echo $$ > "$LOCK_FILE"
-
-# Cleanup function
-cleanup() {
-    log "Cleaning up..."
-    rm -f "$LOCK_FILE"
-}
-
-# Register cleanup on exit
-trap cleanup EXIT
+# No lock file here: concurrent runs are safe because main.py claims
+# followers through expiring work leases (see TRACKING_LEASE_DB)
 
 # Run the main script
 log "Executing main.py"
@@ -1,39 +1,56 @@
+from __future__ import annotations
+
 import sys
 import os
-from typing import Any, Dict, List, Tuple, TypedDict
+import argparse
+import asyncio
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypedDict,
+    Union,
+)
 from datetime import datetime
 import logging
 import json
 import unicodedata
 import re
+from functools import lru_cache
 
-from dotenv import load_dotenv
-from pyairtable import Api
-
-from utils.config import load_env_variables
+from utils.config import get_settings
 from utils.logging_setup import setup_logging
-from twitter.nitter_scraper import NitterScraper
+from utils.pipeline import StageStats, run_stage
+from utils import run_report
+
+if TYPE_CHECKING:
+    from twitter.nitter_scraper import NitterScraper
 
-# Initialize logging
-setup_logging()
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-config = load_env_variables()
+settings = get_settings()
 
-AIRTABLE_TOKEN: str = config["airtable_token"]
-BASE_ID: str = config["airtable_base_id"]
-TABLE_ID: str = config.get("airtable_accounts_table", "tblJCXhcrCxDUJR3F")
-JSON_FILE_PATH: str = config.get("json_file_path", "user_details.json")
+AIRTABLE_TOKEN = settings.airtable_token
+BASE_ID = settings.airtable_base_id
+TABLE_ID = settings.airtable_accounts_table
+JSON_FILE_PATH: str = "user_details.json"
 
-# Ensure critical configuration variables are present
-assert AIRTABLE_TOKEN, "AIRTABLE_TOKEN is not set in the environment variables."
-assert BASE_ID, "AIRTABLE_BASE_ID is not set in the environment variables."
-assert TABLE_ID, "AIRTABLE_ACCOUNTS_TABLE is not set in the environment variables."
 
-# Initialize Airtable API
-api = Api(AIRTABLE_TOKEN)
-table = api.table(BASE_ID, TABLE_ID)
+@lru_cache(maxsize=None)
+def get_table():
+    """The Accounts table, connected on first use."""
+    # Ensure critical configuration variables are present
+    assert AIRTABLE_TOKEN, "AIRTABLE_TOKEN is not set in the environment variables."
+    assert BASE_ID, "AIRTABLE_BASE_ID is not set in the environment variables."
+    assert TABLE_ID, "AIRTABLE_ACCOUNTS_TABLE is not set in the environment variables."
+
+    from pyairtable import Api
+
+    return Api(AIRTABLE_TOKEN).table(BASE_ID, TABLE_ID)
 
 
 def get_unenriched_accounts() -> List[Tuple[str, str]]:
@@ -43,7 +60,8 @@ def get_unenriched_accounts() -> List[Tuple[str, str]]:
     """
     try:
         formula = "OR(AND({Full Name} = BLANK(), {Description} = BLANK()), {Full Name} = BLANK())"
-        records = table.all(formula=formula)
+        with run_report.phase("airtable_fetch_records"):
+            records = get_table().all(formula=formula)
         logger.info(f"Pulled {len(records)} unenriched records from Airtable")
         airtable_usernames = {
             record["fields"].get("Username", "").lower(): record["id"]
@@ -125,7 +143,8 @@ def batch_update_airtable_records(records_to_update: List[UpdateRecordDict]) ->
         BATCH_SIZE = 10
         for i in range(0, len(records_to_update), BATCH_SIZE):
             batch = records_to_update[i : i + BATCH_SIZE]
-            table.batch_update(batch)
+            with run_report.phase("airtable_update"):
+                get_table().batch_update(batch)
             logger.info(f"Updated batch of {len(batch)} records in Airtable.")
         logger.info(
             f"Successfully updated {len(records_to_update)} records in Airtable."
@@ -139,17 +158,123 @@ def delete_airtable_record(record_id: str) -> None:
     Delete a specific Airtable record by its ID.
     """
     try:
-        table.delete(record_id)
+        get_table().delete(record_id)
         logger.info(f"Successfully deleted record {record_id} from Airtable")
     except Exception as e:
         logger.error(f"Error deleting record {record_id}: {e}", exc_info=True)
 
 
-def main() -> None:
+MAX_RETRIES = 3
+RECORD_DELETED = "RECORD_DELETED"
+ENRICHMENT_FLUSH_SIZE = 10  # Airtable allows 10 records per batch update
+
+
+def enrich_record(
+    scraper: NitterScraper,
+    record_id: str,
+    username: str,
+    delete_missing: bool = True,
+) -> Union[UpdateRecordDict, str, None]:
+    """
+    Scrape one account through Nitter and build its Airtable update.
+    Deletes the record and returns RECORD_DELETED if the profile cannot be
+    fetched after all retries, unless delete_missing is False.
+    """
+    # Get profile data using NitterScraper with retries
+    profile = None
+    retry_count = 0
+
+    while profile is None and retry_count < MAX_RETRIES:
+        try:
+            with run_report.phase("nitter_profile", username):
+                profile = scraper.get_profile(username)
+            if profile:
+                break
+        except Exception as e:
+            logger.warning(
+                f"Retry {retry_count+1}/{MAX_RETRIES} failed for {username}: {e}"
+            )
+
+        retry_count += 1
+        if retry_count < MAX_RETRIES:
+            logger.info(f"Retrying {username}, attempt {retry_count+1}/{MAX_RETRIES}")
+
+    if not profile:
+        logger.warning(
+            f"Could not fetch profile for {username} after {MAX_RETRIES} attempts"
+        )
+        if not delete_missing:
+            run_report.count("accounts_not_enriched")
+            return None
+        # Only delete records that don't exist after all retries
+        delete_airtable_record(record_id)
+        run_report.count("accounts_deleted")
+        return RECORD_DELETED
+
+    # Format data for Airtable
+    formatted_data = format_data_for_airtable(profile)
+    if not formatted_data:
+        logger.warning(f"No data found for {username}")
+        return None
+
+    logger.info(f"Successfully scraped data for {username}")
+    run_report.count("accounts_enriched")
+    return {"id": record_id, "fields": formatted_data}
+
+
+async def run_enrichment_workers(
+    queue: asyncio.Queue, workers: int = 2, scraper: Optional[NitterScraper] = None
+) -> StageStats:
+    """
+    Enrich accounts pushed onto the queue as (record_id, username) tuples
+    until every worker has received a STOP.
+
+    Profiles are scraped through Nitter in worker threads while the caller
+    keeps producing, and updates are written to Airtable in batches. The
+    accounts were just created by the tracking run, which still links to
+    them, so one Nitter cannot fetch is left for main() rather than deleted.
+    """
+    from twitter.nitter_scraper import NitterScraper
+
+    scraper = scraper or NitterScraper()
+    stats = StageStats("enrich")
+    pending: List[UpdateRecordDict] = []
+
+    async def enrich(item: Tuple[str, str], worker: int):
+        record_id, username = item
+        record = await asyncio.to_thread(
+            enrich_record, scraper, record_id, username, False
+        )
+        if isinstance(record, dict):
+            pending.append(record)
+            stats.items_out += 1
+        if len(pending) >= ENRICHMENT_FLUSH_SIZE:
+            batch = pending[:]
+            pending.clear()
+            await asyncio.to_thread(batch_update_airtable_records, batch)
+        return None
+
+    await run_stage(stats, enrich, queue, workers=workers)
+    if pending:
+        await asyncio.to_thread(batch_update_airtable_records, pending[:])
+        pending.clear()
+    return stats
+
+
+def main(
+    scraper: Optional[NitterScraper] = None,
+    on_deleted: Optional[Callable[[str, str], None]] = None,
+) -> None:
+    """
+    Enrich every unenriched account, reusing scraper if one is given.
+    on_deleted(record_id, username) is called for each record deleted.
+    """
+    from twitter.nitter_scraper import NitterScraper
+
     try:
-        # Initialize NitterScraper
-        scraper = NitterScraper()
-        logger.info("Initialized NitterScraper")
+        if scraper is None:
+            scraper = NitterScraper()
+            logger.info("Initialized NitterScraper")
 
         # Get all unenriched records from Airtable
         unenriched_records = get_unenriched_accounts()
@@ -162,48 +287,15 @@ def main() -> None:
         # Process each unenriched record
         records_to_update = []
         deleted_records_count = 0
-        MAX_RETRIES = 3
         for record_id, username in unenriched_records:
             try:
-                # Get profile data using NitterScraper with retries
-                profile = None
-                retry_count = 0
-
-                while profile is None and retry_count < MAX_RETRIES:
-                    try:
-                        profile = scraper.get_profile(username)
-                        if profile:
-                            break
-                    except Exception as e:
-                        logger.warning(
-                            f"Retry {retry_count+1}/{MAX_RETRIES} failed for {username}: {e}"
-                        )
-
-                    retry_count += 1
-                    if retry_count < MAX_RETRIES:
-                        logger.info(
-                            f"Retrying {username}, attempt {retry_count+1}/{MAX_RETRIES}"
-                        )
-
-                if profile:
-                    # Format data for Airtable
-                    formatted_data = format_data_for_airtable(profile)
-
-                    if formatted_data:
-                        records_to_update.append(
-                            {"id": record_id, "fields": formatted_data}
-                        )
-                        logger.info(f"Successfully scraped data for {username}")
-                    else:
-                        logger.warning(f"No data found for {username}")
-                else:
-                    logger.warning(
-                        f"Could not fetch profile for {username} after {MAX_RETRIES} attempts"
-                    )
-                    # Only delete records that don't exist after all retries
-                    delete_airtable_record(record_id)
+                record = enrich_record(scraper, record_id, username)
+                if record == RECORD_DELETED:
                     deleted_records_count += 1
-
+                    if on_deleted is not None:
+                        on_deleted(record_id, username)
+                elif record:
+                    records_to_update.append(record)
             except Exception as e:
                 logger.error(f"Error processing {username}: {e}", exc_info=True)
 
@@ -227,4 +319,14 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(
+        description="Fill in Accounts missing profile data by scraping Nitter."
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="add cProfile output for the hottest functions to the run report",
+    )
+    args = parser.parse_args()
+    setup_logging()
+    run_report.run_with_report("scrape_empty_accounts", main, profile=args.profile)
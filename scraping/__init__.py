@@ -3,6 +3,8 @@ from .scraping import (
     load_cookies,
     update_twitter_data,
     get_following,
+    scan_following,
+    FollowingScan,
     clean_text,
     parse_date,
     parse_numeric_value,
@@ -14,6 +16,8 @@ __all__ = [
     "load_cookies",
     "update_twitter_data",
     "get_following",
+    "scan_following",
+    "FollowingScan",
     "clean_text",
     "parse_date",
     "parse_numeric_value",
@@ -0,0 +1,51 @@
+import logging
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "js")
+IDLE_SCRIPT = (
+    "return window.__followingCollector"
+    " ? window.__followingCollector.idleMs() : null;"
+)
+# The spinner the timeline shows while it fetches its next page
+LOADING_SCRIPT = (
+    'return !!document.querySelector(\'[aria-label="Timeline: Following"]'
+    ' [role="progressbar"]\');'
+)
+
+
+@lru_cache(maxsize=None)
+def load_script(name: str) -> str:
+    """The source of a script in scraping/js, read once."""
+    with open(os.path.join(JS_DIR, name), encoding="utf-8") as file:
+        return file.read()
+
+
+def drain_following(driver) -> Optional[List[Dict[str, Any]]]:
+    """
+    Accounts rendered in the Following timeline since the last call.
+
+    Each is a dict with the username and, when the link sits in a user cell,
+    the name, description and verified flag the cell shows. The first call
+    on a page installs the collector, which then keeps recording cells as
+    they render; every call is one execute_script round trip. Returns None
+    while the timeline is not on the page.
+    """
+    return driver.execute_script(load_script("following_collector.js"))
+
+
+def idle_seconds(driver) -> Optional[float]:
+    """
+    Seconds since a timeline cell last rendered or a request last finished,
+    or None before the collector is installed.
+    """
+    idle_ms = driver.execute_script(IDLE_SCRIPT)
+    return None if idle_ms is None else idle_ms / 1000
+
+
+def still_loading(driver) -> bool:
+    """Whether the timeline is still fetching more accounts."""
+    return bool(driver.execute_script(LOADING_SCRIPT))
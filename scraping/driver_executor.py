@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import count
+from typing import Any, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# driver -> the single thread that owns it
+_executors: "weakref.WeakKeyDictionary[Any, ThreadPoolExecutor]" = (
+    weakref.WeakKeyDictionary()
+)
+_names = count(1)
+
+
+def _new_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix=f"webdriver-{next(_names)}"
+    )
+
+
+def executor_for(driver: Any) -> ThreadPoolExecutor:
+    """The thread that owns a driver, created on first use."""
+    executor = _executors.get(driver)
+    if executor is None:
+        executor = _executors[driver] = _new_executor()
+    return executor
+
+
+async def run_on_driver(
+    driver: Any, func: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """
+    Run func(driver, *args, **kwargs) on the driver's own thread.
+
+    Every Selenium call for one browser goes through the same thread, so a
+    WebDriver is never used from two threads at once, and a browser that is
+    scrolling for minutes holds its own thread rather than one of the
+    event loop's default executor threads that the lease queue and logs use.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor_for(driver), partial(func, driver, *args, **kwargs)
+    )
+
+
+async def start_driver(factory: Callable[[], T]) -> T:
+    """Start a driver with factory() on a new thread, which then owns it."""
+    executor = _new_executor()
+    loop = asyncio.get_running_loop()
+    try:
+        driver = await loop.run_in_executor(executor, factory)
+    except BaseException:
+        executor.shutdown(wait=False)
+        raise
+    _executors[driver] = executor
+    return driver
+
+
+def _quit(driver: Any) -> None:
+    try:
+        driver.quit()
+    except Exception as e:
+        logger.debug(f"Ignoring error while quitting WebDriver: {e}")
+
+
+async def replace_driver(driver: Any, factory: Callable[[], T]) -> T:
+    """Quit a driver and start its replacement on the same thread."""
+    executor = executor_for(driver)
+    loop = asyncio.get_running_loop()
+
+    def replace() -> T:
+        _quit(driver)
+        return factory()
+
+    new_driver = await loop.run_in_executor(executor, replace)
+    _executors.pop(driver, None)
+    _executors[new_driver] = executor
+    return new_driver
+
+
+async def quit_driver(driver: Any) -> None:
+    """Quit a driver on its thread and let the thread go."""
+    executor = _executors.pop(driver, None)
+    if executor is None:
+        await asyncio.to_thread(_quit, driver)
+        return
+    await asyncio.get_running_loop().run_in_executor(executor, _quit, driver)
+    executor.shutdown(wait=False)
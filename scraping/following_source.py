@@ -0,0 +1,381 @@
+import logging
+import time
+import weakref
+from abc import ABC, abstractmethod
+from typing import AbstractSet, Any, Dict, List, Optional, Set
+
+from scraping.driver_executor import run_on_driver
+from scraping.scraping import FollowingScan, normalize_username, scan_following
+from utils import run_report
+from utils.concurrency import get_limiter
+from utils.config import get_settings
+from utils.lazy import lazy_import
+
+aiohttp = lazy_import("aiohttp")
+
+logger = logging.getLogger(__name__)
+
+LATENCY_SMOOTHING = 0.3  # Weight of the newest read in a source's latency
+API_URL = "https://api.twitter.com/2"
+API_PAGE_SIZE = 1000  # Most accounts /2/users/:id/following returns per page
+API_USER_FIELDS = "description,public_metrics,verified"
+# What Selenium says when the worker's browser is gone
+DRIVER_LOST_ERRORS = ("Connection refused", "invalid session id")
+# Relative price of reading one list when FOLLOWING_SOURCES names no cost
+DEFAULT_COSTS = {"selenium": 1.0, "playwright": 1.0, "api": 3.0}
+
+
+def driver_lost(error: BaseException) -> bool:
+    """Whether error means the worker's WebDriver has to be restarted."""
+    return any(marker in str(error) for marker in DRIVER_LOST_ERRORS)
+
+
+class SourceUnavailable(Exception):
+    """The source cannot read this list right now; the next one should."""
+
+
+class FollowingSource(ABC):
+    """
+    Somewhere a follower's Following list can be read from.
+
+    Every source reports its cost (relative price of reading one list), its
+    quota (reads left before it runs dry, None when unmetered) and its
+    latency (running average of how long reads took), which
+    FollowingRouter uses to pick one. Subclasses implement _fetch(), which
+    tests scraped handles against existing_follows, a set of lowercase
+    usernames.
+    """
+
+    name = "source"
+    # Reads the source can run at once without a Selenium driver
+    workers = 0
+
+    def __init__(self, cost: float):
+        self.cost = cost
+        self.latency: Optional[float] = None
+        self.served = 0
+        self.failed = 0
+
+    def quota_left(self) -> Optional[int]:
+        return None
+
+    def available(self, driver=None) -> bool:
+        quota = self.quota_left()
+        return quota is None or quota > 0
+
+    @abstractmethod
+    async def _fetch(
+        self, username: str, existing_follows: AbstractSet[str], full: bool, driver
+    ) -> FollowingScan:
+        """Read the list once; fetch() keeps the statistics."""
+
+    async def fetch(
+        self,
+        username: str,
+        existing_follows: AbstractSet[str],
+        full: bool = False,
+        driver=None,
+    ) -> FollowingScan:
+        """Read a follower's list; an empty scan counts as a failed read."""
+        started = time.monotonic()
+        try:
+            scan = await self._fetch(username, existing_follows, full, driver)
+        except Exception:
+            self.failed += 1
+            raise
+        elapsed = time.monotonic() - started
+        if self.latency is None:
+            self.latency = elapsed
+        else:
+            self.latency += LATENCY_SMOOTHING * (elapsed - self.latency)
+        if scan.observed:
+            self.served += 1
+        else:
+            self.failed += 1
+        return scan
+
+    async def close(self) -> None:
+        pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "cost": self.cost,
+            "quota_left": self.quota_left(),
+            "latency": None if self.latency is None else round(self.latency, 2),
+            "served": self.served,
+            "failed": self.failed,
+        }
+
+
+class SeleniumSource(FollowingSource):
+    """Scroll the Following page in the worker's browser."""
+
+    name = "selenium"
+
+    def available(self, driver=None) -> bool:
+        return driver is not None
+
+    async def _fetch(
+        self, username: str, existing_follows: AbstractSet[str], full: bool, driver
+    ) -> FollowingScan:
+        return await run_on_driver(
+            driver, scan_following, username, existing_follows, None, full
+        )
+
+
+class TwitterApiSource(FollowingSource):
+    """
+    Page through /2/users/:id/following with the bearer token.
+
+    Quota is what the x-rate-limit headers of the last Following response
+    said, until their reset time has passed. Follower ids are looked up by
+    username once per process.
+    """
+
+    name = "api"
+
+    def __init__(
+        self,
+        bearer_token: str,
+        cost: float,
+        session: Optional["aiohttp.ClientSession"] = None,
+        workers: int = 1,
+    ):
+        super().__init__(cost)
+        # Scrape workers that read only through the API
+        self.workers = workers
+        self.headers = {"Authorization": f"Bearer {bearer_token}"}
+        self.session = session
+        self.user_ids: Dict[str, str] = {}
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+
+    def quota_left(self) -> Optional[int]:
+        if self.remaining is None or time.time() >= self.reset_at:
+            return None
+        return self.remaining
+
+    def _record_rate_limit(self, response) -> None:
+        remaining = response.headers.get("x-rate-limit-remaining")
+        reset = response.headers.get("x-rate-limit-reset")
+        if remaining is not None and reset is not None:
+            self.remaining = int(remaining)
+            self.reset_at = float(reset)
+        elif response.status == 429:
+            self.remaining = 0
+            self.reset_at = time.time() + 15 * 60
+
+    async def _get(
+        self, session, path: str, params: Dict[str, Any], metered: bool
+    ) -> Dict[str, Any]:
+        async with get_limiter("twitter_api").slot() as slot, session.get(
+            f"{API_URL}{path}", headers=self.headers, params=params
+        ) as response:
+            slot.record_status(response.status)
+            if metered:
+                self._record_rate_limit(response)
+            if response.status != 200:
+                raise SourceUnavailable(
+                    f"{path} returned {response.status}: {await response.text()}"
+                )
+            return await response.json()
+
+    async def _user_id(self, session, username: str) -> str:
+        if username not in self.user_ids:
+            data = await self._get(
+                session, f"/users/by/username/{username}", {}, metered=False
+            )
+            if "id" not in data.get("data", {}):
+                raise SourceUnavailable(f"No user id for {username}: {data}")
+            self.user_ids[username] = data["data"]["id"]
+        return self.user_ids[username]
+
+    async def _fetch(
+        self, username: str, existing_follows: AbstractSet[str], full: bool, driver
+    ) -> FollowingScan:
+        if self.session is None:
+            async with aiohttp.ClientSession() as session:
+                return await self._read(session, username, existing_follows, full)
+        return await self._read(self.session, username, existing_follows, full)
+
+    async def _read(
+        self, session, username: str, existing_follows: AbstractSet[str], full: bool
+    ) -> FollowingScan:
+        user_id = await self._user_id(session, username)
+        scan = FollowingScan()
+        params = {"max_results": API_PAGE_SIZE, "user.fields": API_USER_FIELDS}
+        # Pages come newest follow first, like the timeline
+        while True:
+            page = await self._get(
+                session, f"/users/{user_id}/following", params, metered=True
+            )
+            page_new = 0
+            for user in page.get("data", []):
+                profile = api_profile(user)
+                handle = profile["username"]
+                scan.profiles[handle] = profile
+                scan.observed.add(handle)
+                if handle not in existing_follows:
+                    scan.new.append(handle)
+                    page_new += 1
+            next_token = page.get("meta", {}).get("next_token")
+            if not next_token:
+                scan.reached_end = True
+                break
+            if not full and not page_new:
+                break
+            params["pagination_token"] = next_token
+        return scan
+
+
+def api_profile(user: Dict[str, Any]) -> Dict[str, Any]:
+    """A followed account's fields from one API v2 user object."""
+    metrics = user.get("public_metrics") or {}
+    return {
+        "username": normalize_username(user["username"]),
+        "id": user.get("id"),
+        "name": user.get("name"),
+        "description": user.get("description"),
+        "followers_count": metrics.get("followers_count"),
+        "following_count": metrics.get("following_count"),
+        "verified": bool(user.get("verified")),
+    }
+
+
+class FollowingRouter:
+    """
+    Read each follower's list from the cheapest source that can serve it.
+
+    Sources without quota left, or (for Selenium) without a driver, are
+    skipped; ties on cost go to the faster source. When a read raises or
+    comes back empty, the next source is tried. If every source raised, the
+    last error is re-raised so callers still see a lost browser; if another
+    source served the read instead, lost_driver() hands the error over.
+    """
+
+    def __init__(self, sources: List[FollowingSource]):
+        self.sources = sources
+        # driver -> the driver-loss error a fallback read covered for
+        self._lost: "weakref.WeakKeyDictionary[Any, Exception]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def candidates(self, driver=None) -> List[FollowingSource]:
+        usable = [source for source in self.sources if source.available(driver)]
+        return sorted(usable, key=lambda s: (s.cost, s.latency or 0.0))
+
+    async def fetch(
+        self,
+        username: str,
+        existing_follows: AbstractSet[str],
+        full: bool = False,
+        driver=None,
+    ) -> FollowingScan:
+        empty: Optional[FollowingScan] = None
+        error: Optional[Exception] = None
+        for source in self.candidates(driver):
+            try:
+                scan = await source.fetch(username, existing_follows, full, driver)
+            except Exception as e:
+                logger.warning(f"{source.name} could not read {username}: {e}")
+                error = e
+                if driver is not None and driver_lost(e):
+                    self._lost[driver] = e
+                continue
+            if scan.observed:
+                run_report.count(f"following_via_{source.name}")
+                return scan
+            logger.warning(f"{source.name} read no accounts for {username}")
+            empty = empty or scan
+        if empty is not None:
+            return empty
+        if error is not None:
+            if driver is not None:
+                self._lost.pop(driver, None)
+            raise error
+        logger.error(f"No Following source available for {username}")
+        return FollowingScan()
+
+    def lost_driver(self, driver) -> Optional[Exception]:
+        """
+        The error that showed driver is gone, if a fallback source served
+        the read anyway; the caller restarts the driver. Reported once.
+        """
+        if driver is None:
+            return None
+        return self._lost.pop(driver, None)
+
+    def extra_workers(self) -> int:
+        """Scrape workers the sources can serve on top of the Selenium drivers."""
+        return sum(source.workers for source in self.sources)
+
+    async def close(self) -> None:
+        for source in self.sources:
+            try:
+                await source.close()
+            except Exception as e:
+                logger.warning(f"Error closing Following source {source.name}: {e}")
+
+    def summary(self) -> str:
+        return ", ".join(
+            f"{source.name}: {source.served} read, {source.failed} failed, "
+            f"latency {source.snapshot()['latency']}s, "
+            f"quota {source.quota_left()}"
+            for source in self.sources
+        )
+
+
+def parse_source_costs(value: Optional[str]) -> Dict[str, float]:
+    """Split FOLLOWING_SOURCES ("selenium=1,api=3") into source -> cost."""
+    costs = {}
+    for entry in (value or "").split(","):
+        name, _, cost = entry.strip().partition("=")
+        name = name.strip().lower()
+        if not name:
+            continue
+        try:
+            costs[name] = float(cost) if cost.strip() else DEFAULT_COSTS.get(name, 1)
+        except ValueError:
+            logger.error(f"Ignoring bad cost in FOLLOWING_SOURCES entry {entry!r}")
+    return costs
+
+
+def default_router(
+    session: Optional["aiohttp.ClientSession"] = None,
+) -> FollowingRouter:
+    """The sources FOLLOWING_SOURCES enables, skipping the API without a token."""
+    settings = get_settings()
+    costs = parse_source_costs(settings.following_sources)
+    api_workers = settings.api_workers
+    if api_workers is None:
+        # Next to Selenium the API is a fallback, not a reader of its own
+        api_workers = 0 if "selenium" in costs else 1
+    sources: List[FollowingSource] = []
+    for name, cost in costs.items():
+        if name == "selenium":
+            sources.append(SeleniumSource(cost))
+        elif name == "playwright":
+            from scraping import playwright_backend
+
+            if playwright_backend.PLAYWRIGHT_AVAILABLE:
+                browser = playwright_backend.PlaywrightBrowser(
+                    settings.playwright_contexts, settings.cookie_path
+                )
+                sources.append(playwright_backend.PlaywrightSource(cost, browser))
+            else:
+                logger.error("playwright is not installed, not reading lists with it")
+        elif name == "api":
+            if settings.twitter_bearer_token:
+                sources.append(
+                    TwitterApiSource(
+                        settings.twitter_bearer_token,
+                        cost,
+                        session,
+                        api_workers,
+                    )
+                )
+            else:
+                logger.info("TWITTER_BEARER_TOKEN not set, not reading lists via API")
+        else:
+            logger.error(f"Unknown Following source {name!r} in FOLLOWING_SOURCES")
+    return FollowingRouter(sources)
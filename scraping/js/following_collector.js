@@ -0,0 +1,162 @@
+// Collects the accounts shown in the Following timeline as its cells render.
+//
+// Runs as a function body (Selenium execute_script, or wrapped in a function
+// for Playwright). Installs window.__followingCollector once per page and
+// returns the accounts collected since the last drain, or null when the
+// timeline is not on the page yet. Each account is {username} plus, when the
+// link sits in a user cell, the name, description and verified flag the
+// cell shows, so new accounts need no profile visit for those. Within a
+// cell only its own profile link counts; @mentions in the bio are not
+// follows. X's timeline is virtualized and drops cells as they scroll away;
+// the MutationObserver sees every cell while it is rendered, so no handle
+// is missed between two drains.
+const TIMELINE = '[aria-label="Timeline: Following"]';
+const CELL = '[data-testid="UserCell"]';
+const VERIFIED = '[data-testid="icon-verified"], svg[aria-label="Verified account"]';
+const RESERVED = new Set([
+  "compose", "explore", "hashtag", "home", "i", "messages",
+  "notifications", "search", "settings", "tos", "privacy",
+]);
+
+if (!window.__followingCollector) {
+  if (!document.querySelector(TIMELINE)) {
+    return null;
+  }
+  const seen = new Set();
+  let pending = [];
+  // Last time a cell rendered or a network request finished
+  let lastActivity = performance.now();
+
+  const text = (element) => (element ? element.innerText.trim() : "");
+
+  // The handle a link points at, or null if it is not a profile link
+  const profileHandle = (anchor) => {
+    let url;
+    try {
+      url = new URL(anchor.getAttribute("href"), location.origin);
+    } catch (e) {
+      return null;
+    }
+    if (url.hostname !== "x.com" && url.hostname !== "twitter.com") {
+      return null;
+    }
+    const parts = url.pathname.split("/").filter(Boolean);
+    if (parts.length !== 1 || url.search) {
+      return null;
+    }
+    const handle = parts[0].trim().toLowerCase();
+    return RESERVED.has(handle) ? null : handle;
+  };
+
+  // A cell's bio: the first text block that is not a link or a button
+  const bioBlock = (cell) => {
+    for (const block of cell.querySelectorAll('div[dir="auto"]')) {
+      if (!block.closest("a") && !block.closest('[role="button"]')) {
+        return block;
+      }
+    }
+    return null;
+  };
+
+  // The account a cell is about: its first profile link outside the bio,
+  // which wraps the avatar
+  const cellHandle = (cell, bio) => {
+    for (const link of cell.querySelectorAll("a[href]")) {
+      if (bio && bio.contains(link)) {
+        continue;
+      }
+      const handle = profileHandle(link);
+      if (handle) {
+        return handle;
+      }
+    }
+    return null;
+  };
+
+  // What a cell shows about its own account
+  const cellFields = (cell, bio, handle) => {
+    let name = "";
+    for (const link of cell.querySelectorAll("a[href]")) {
+      const linkText = text(link);
+      const href = (link.getAttribute("href") || "").toLowerCase();
+      if (linkText && !linkText.startsWith("@") && href.endsWith("/" + handle)) {
+        name = linkText;
+        break;
+      }
+    }
+    return {
+      username: handle,
+      name: name || null,
+      description: text(bio),
+      verified: cell.querySelector(VERIFIED) !== null,
+    };
+  };
+
+  const add = (anchor) => {
+    if (!anchor.closest(TIMELINE)) {
+      return;
+    }
+    const handle = profileHandle(anchor);
+    if (!handle || seen.has(handle)) {
+      return;
+    }
+    const cell = anchor.closest(CELL);
+    if (!cell) {
+      seen.add(handle);
+      pending.push({ username: handle });
+      return;
+    }
+    // Mentions in the bio and links to other accounts are not this follow
+    const bio = bioBlock(cell);
+    if (cellHandle(cell, bio) !== handle) {
+      return;
+    }
+    seen.add(handle);
+    pending.push(cellFields(cell, bio, handle));
+  };
+
+  const scan = (node) => {
+    if (node.nodeType !== Node.ELEMENT_NODE) {
+      return;
+    }
+    if (node.tagName === "A") {
+      add(node);
+    }
+    node.querySelectorAll("a[href]").forEach(add);
+  };
+
+  const observer = new MutationObserver((records) => {
+    lastActivity = performance.now();
+    for (const record of records) {
+      record.addedNodes.forEach(scan);
+    }
+  });
+  // Watch the whole body: X may replace the timeline element itself
+  observer.observe(document.body, { childList: true, subtree: true });
+  scan(document.body);
+  const network = new PerformanceObserver(() => {
+    lastActivity = performance.now();
+  });
+  network.observe({ type: "resource" });
+
+  window.__followingCollector = {
+    drain() {
+      const accounts = pending;
+      pending = [];
+      return accounts;
+    },
+    size() {
+      return seen.size;
+    },
+    idleMs() {
+      return performance.now() - lastActivity;
+    },
+    stop() {
+      observer.disconnect();
+      network.disconnect();
+      delete window.__followingCollector;
+    },
+  };
+}
+
+return window.__followingCollector.drain();
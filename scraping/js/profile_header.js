@@ -0,0 +1,36 @@
+// Reads every profile header field that is present, in one pass.
+//
+// Runs as a function body once [data-testid="UserName"] is on the page and
+// returns an object with the fields it found; missing fields are left out.
+const header = {};
+const text = (selector, root = document) => {
+  const element = root.querySelector(selector);
+  return element ? element.innerText : null;
+};
+const attribute = (selector, name) => {
+  const element = document.querySelector(selector);
+  return element ? element.getAttribute(name) : null;
+};
+const items = '[data-testid="UserProfileHeader_Items"]';
+
+header.fullName = text('[data-testid="UserName"] div span span');
+header.description = text('[data-testid="UserDescription"]');
+header.location = text(`${items} [data-testid="UserLocation"]`);
+header.website = attribute(`${items} [data-testid="UserUrl"]`, "href");
+header.joinDate = text(`${items} [data-testid="UserJoinDate"]`);
+header.followers =
+  text('a[href$="/verified_followers"] span span') ||
+  text('a[href$="/followers"] span span');
+header.following = text('a[href$="/following"] span span');
+header.profileImage = attribute('[data-testid^="UserAvatar-Container-"] img', "src");
+header.verified = Boolean(
+  document.querySelector('[aria-label="Provides details about verified accounts."]') ||
+    document.querySelector('[data-testid="UserName"] [data-testid="icon-verified"]')
+);
+
+for (const key of Object.keys(header)) {
+  if (header[key] === null || header[key] === "") {
+    delete header[key];
+  }
+}
+return header;
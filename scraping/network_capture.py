@@ -0,0 +1,110 @@
+import json
+import logging
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# The GraphQL operation the Following timeline loads its pages with
+FOLLOWING_OPERATION = "/Following"
+
+
+def capture_options(chrome_options) -> None:
+    """Turn on the performance log that carries DevTools network events."""
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+
+def capture_available(driver) -> bool:
+    """Whether the driver was started with capture_options()."""
+    try:
+        return "performance" in driver.log_types
+    except Exception:
+        return False
+
+
+def _network_events(driver) -> Iterator[Dict[str, Any]]:
+    for entry in driver.get_log("performance"):
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        if message.get("method", "").startswith("Network."):
+            yield message
+
+
+def drain_following_responses(driver) -> List[Dict[str, Any]]:
+    """
+    The JSON bodies of Following pages loaded since the last call.
+
+    Reads (and so empties) the driver's performance log, keeps the requests
+    to the Following GraphQL endpoint that finished loading and fetches
+    their bodies with Network.getResponseBody.
+    """
+    following_requests = set()
+    finished = []
+    for message in _network_events(driver):
+        params = message.get("params", {})
+        if message["method"] == "Network.responseReceived":
+            response = params.get("response", {})
+            if FOLLOWING_OPERATION in response.get("url", "").split("?")[0]:
+                following_requests.add(params.get("requestId"))
+        elif message["method"] == "Network.loadingFinished":
+            finished.append(params.get("requestId"))
+
+    payloads = []
+    for request_id in finished:
+        if request_id not in following_requests:
+            continue
+        try:
+            body = driver.execute_cdp_cmd(
+                "Network.getResponseBody", {"requestId": request_id}
+            )
+            payloads.append(json.loads(body["body"]))
+        except Exception as e:
+            # The body is gone once the page has moved on; the DOM still has it
+            logger.warning(f"Could not read Following response {request_id}: {e}")
+    return payloads
+
+
+def _user_results(node: Any) -> Iterator[Dict[str, Any]]:
+    """Every user_results.result object anywhere in a GraphQL payload."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            result = node.get("user_results", {})
+            if isinstance(result, dict) and isinstance(result.get("result"), dict):
+                yield result["result"]
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+
+def parse_user(result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """A followed account's fields from one GraphQL user result."""
+    legacy = result.get("legacy") or {}
+    core = result.get("core") or {}
+    username = core.get("screen_name") or legacy.get("screen_name")
+    if not username:
+        return None
+    description = legacy.get("description")
+    if description is None:
+        description = (result.get("profile_bio") or {}).get("description")
+    return {
+        "username": username.strip().lower(),
+        "id": result.get("rest_id"),
+        "name": core.get("name") or legacy.get("name"),
+        "description": description,
+        "followers_count": legacy.get("followers_count"),
+        "following_count": legacy.get("friends_count"),
+        "verified": bool(result.get("is_blue_verified") or legacy.get("verified")),
+    }
+
+
+def parse_following_users(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """The accounts in one Following page response, in timeline order."""
+    users = []
+    for result in _user_results(payload):
+        user = parse_user(result)
+        if user is not None:
+            users.append(user)
+    return users
@@ -0,0 +1,110 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional
+
+from utils.config import get_settings
+
+POLL_SECONDS = 0.25  # How often the load signals are checked while waiting
+IDLE_SECONDS = 1.5  # Quiet time after which nothing more is coming
+
+
+class ScrollPacer:
+    """
+    Waits after a scroll until the page has actually loaded more content.
+
+    A wait lasts at least min_dwell (stretched by up to `jitter` at random,
+    so scrolls do not run at a fixed rhythm) and at most max_dwell. Between
+    the two it ends as soon as new content has shown up, or once the page
+    has been idle for IDLE_SECONDS, which is how the end of a list looks.
+    """
+
+    def __init__(
+        self,
+        min_dwell: float,
+        max_dwell: float,
+        jitter: float = 0.5,
+        poll: float = POLL_SECONDS,
+        idle: float = IDLE_SECONDS,
+        sleep: Optional[Callable[[float], None]] = None,
+        clock: Optional[Callable[[], float]] = None,
+        rng: Optional[random.Random] = None,
+    ):
+        self.min_dwell = min_dwell
+        self.max_dwell = max(min_dwell, max_dwell)
+        self.jitter = jitter
+        self.poll = poll
+        self.idle = idle
+        self._sleep = sleep
+        self._clock = clock
+        self.rng = rng or random.Random()
+
+    def sleep(self, seconds: float) -> None:
+        (self._sleep or time.sleep)(seconds)
+
+    def clock(self) -> float:
+        return (self._clock or time.monotonic)()
+
+    def wait(
+        self,
+        loaded: Callable[[], bool],
+        idle_seconds: Optional[Callable[[], Optional[float]]] = None,
+        max_dwell: Optional[float] = None,
+    ) -> bool:
+        """
+        Wait for loaded() to return True. Returns False when the wait ended
+        on idleness or on max_dwell instead.
+
+        idle_seconds, if given, returns how long the page has been quiet.
+        """
+        max_dwell = self.max_dwell if max_dwell is None else max_dwell
+        min_dwell = min(
+            max_dwell, self.min_dwell * (1 + self.rng.uniform(0, self.jitter))
+        )
+        started = self.clock()
+        self.sleep(min_dwell)
+        while True:
+            if loaded():
+                return True
+            if idle_seconds is not None:
+                quiet = idle_seconds()
+                if quiet is not None and quiet >= self.idle:
+                    return False
+            elapsed = self.clock() - started
+            if elapsed >= max_dwell:
+                return False
+            self.sleep(min(self.poll, max_dwell - elapsed))
+
+    async def wait_async(
+        self,
+        loaded: Callable[[], Awaitable[bool]],
+        idle_seconds: Optional[Callable[[], Awaitable[Optional[float]]]] = None,
+        max_dwell: Optional[float] = None,
+    ) -> bool:
+        """wait() for async browsers: the checks are awaited, and so are sleeps."""
+        max_dwell = self.max_dwell if max_dwell is None else max_dwell
+        min_dwell = min(
+            max_dwell, self.min_dwell * (1 + self.rng.uniform(0, self.jitter))
+        )
+        started = self.clock()
+        await asyncio.sleep(min_dwell)
+        while True:
+            if await loaded():
+                return True
+            if idle_seconds is not None:
+                quiet = await idle_seconds()
+                if quiet is not None and quiet >= self.idle:
+                    return False
+            elapsed = self.clock() - started
+            if elapsed >= max_dwell:
+                return False
+            await asyncio.sleep(min(self.poll, max_dwell - elapsed))
+
+    def dwell(self) -> None:
+        """Pause for the minimum dwell only, e.g. after scrolling back up."""
+        self.sleep(self.min_dwell * (1 + self.rng.uniform(0, self.jitter)))
+
+
+def default_pacer() -> ScrollPacer:
+    settings = get_settings()
+    return ScrollPacer(settings.scroll_min_dwell, settings.scroll_max_dwell)
@@ -0,0 +1,300 @@
+import asyncio
+import fnmatch
+import logging
+import pickle
+import random
+from contextlib import asynccontextmanager
+from typing import AbstractSet, Any, AsyncIterator, Dict, List, Optional, Set
+
+from scraping import collector, resource_blocking
+from scraping.following_source import FollowingSource
+from scraping.pacing import ScrollPacer, default_pacer
+from scraping.scraping import (
+    INITIAL_MAX_DWELL,
+    FollowingScan,
+    ScanProgress,
+    is_error_url,
+    x_breaker,
+)
+from utils import run_report
+from utils.circuit_breaker import POLL_SECONDS
+
+# Optional: pip install playwright && playwright install chromium
+try:
+    from playwright.async_api import async_playwright
+except ImportError:
+    async_playwright = None
+
+logger = logging.getLogger(__name__)
+
+PLAYWRIGHT_AVAILABLE = async_playwright is not None
+VIEWPORT = {"width": 1920, "height": 1080}
+
+
+def as_function(script: str) -> str:
+    """A scraping/js function body as an expression evaluate() can call."""
+    return f"() => {{\n{script}\n}}"
+
+
+def playwright_cookies(cookies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Selenium's pickled cookies as Playwright add_cookies() entries for x.com."""
+    converted = []
+    for cookie in cookies:
+        entry = {
+            "name": cookie["name"],
+            "value": cookie["value"],
+            # load_cookies drops the domain too, so they land on x.com
+            "domain": ".x.com",
+            "path": cookie.get("path") or "/",
+            "httpOnly": bool(cookie.get("httpOnly")),
+            "secure": bool(cookie.get("secure")),
+        }
+        if cookie.get("expiry"):
+            entry["expires"] = float(cookie["expiry"])
+        if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+            entry["sameSite"] = cookie["sameSite"]
+        converted.append(entry)
+    return converted
+
+
+class PlaywrightBrowser:
+    """
+    One headless Chromium whose contexts are lent out one scrape at a time.
+
+    Selenium needs a Chrome process and a thread per parallel scrape; here
+    up to `contexts` isolated contexts share one Chromium and are driven
+    from the event loop. Contexts are created on demand, each logged in
+    with the cookies at cookie_path, and kept for later scrapes. The
+    browser itself starts on first use.
+    """
+
+    def __init__(
+        self,
+        contexts: int,
+        cookie_path: Optional[str] = None,
+        user_agent: Optional[str] = None,
+    ):
+        if not PLAYWRIGHT_AVAILABLE:
+            raise RuntimeError("playwright is not installed")
+        self.contexts = contexts
+        self.cookie_path = cookie_path
+        self.user_agent = user_agent
+        self._playwright = None
+        self._browser = None
+        self._start_lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(contexts)
+        self._idle: List[Any] = []
+        self._blocked: Dict[Any, str] = {}
+
+    async def _ensure_started(self) -> None:
+        async with self._start_lock:
+            if self._browser is not None:
+                return
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(
+                headless=True,
+                args=["--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu"],
+            )
+            logger.info(f"Playwright Chromium started for {self.contexts} contexts")
+
+    async def _new_page(self):
+        context = await self._browser.new_context(
+            user_agent=self.user_agent, viewport=VIEWPORT
+        )
+        if self.cookie_path:
+            try:
+                with open(self.cookie_path, "rb") as f:
+                    cookies = pickle.load(f)
+                await context.add_cookies(playwright_cookies(cookies))
+            except Exception as e:
+                logger.error(f"Error loading cookies into Playwright: {e}")
+        return await context.new_page()
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Any]:
+        """Borrow a page, waiting while all contexts are busy."""
+        await self._ensure_started()
+        async with self._slots:
+            page = self._idle.pop() if self._idle else await self._new_page()
+            try:
+                yield page
+            except BaseException:
+                # A page that failed mid-scrape is not trusted again
+                self._blocked.pop(page, None)
+                await page.context.close()
+                raise
+            self._idle.append(page)
+
+    async def block_for(self, page, page_type: str) -> None:
+        """Abort the requests BLOCK_RESOURCES lists for this page type."""
+        if self._blocked.get(page) == page_type:
+            return
+        patterns = resource_blocking.blocked_urls(page_type)
+        if page in self._blocked:
+            await page.unroute("**/*")
+        if patterns:
+
+            async def handle(route):
+                url = route.request.url
+                if any(fnmatch.fnmatchcase(url, pattern) for pattern in patterns):
+                    await route.abort()
+                else:
+                    await route.continue_()
+
+            await page.route("**/*", handle)
+        self._blocked[page] = page_type
+
+    async def close(self) -> None:
+        if self._browser is not None:
+            await self._browser.close()
+            await self._playwright.stop()
+            self._browser = self._playwright = None
+
+
+async def _breaker_wait() -> None:
+    while not x_breaker.allow():
+        await asyncio.sleep(POLL_SECONDS)
+
+
+def _on_error_page(page) -> bool:
+    return is_error_url(page.url)
+
+
+async def navigate(
+    browser: PlaywrightBrowser, page, url: str, page_type: str, handle: str
+) -> bool:
+    """Playwright counterpart of scraping.navigate()."""
+    with run_report.phase("breaker_wait", handle):
+        await _breaker_wait()
+    await browser.block_for(page, page_type)
+    phase = "page_load" if page_type == "following" else f"{page_type}_page_load"
+    with run_report.phase(phase, handle):
+        await page.goto(url, wait_until="domcontentloaded")
+    if _on_error_page(page):
+        x_breaker.trip(f"{page.url} while loading {url}")
+        return False
+    x_breaker.success()
+    return True
+
+
+async def scan_following_async(
+    browser: PlaywrightBrowser,
+    page,
+    handle: str,
+    existing_follows: AbstractSet[str],
+    full: bool = False,
+    pacer: Optional[ScrollPacer] = None,
+) -> FollowingScan:
+    """
+    scraping.scan_following on a Playwright page: the same collector script,
+    pacing and stopping rules, awaited instead of blocking a thread.
+    """
+    pacer = pacer or default_pacer()
+    handle = handle.lower()
+    url = f"https://x.com/{handle}/following"
+    if not await navigate(browser, page, url, "following", handle):
+        logger.warning(f"Error page instead of the following of {handle}")
+        return FollowingScan()
+    drain_script = as_function(collector.load_script("following_collector.js"))
+    idle_script = as_function(collector.IDLE_SCRIPT)
+    loading_script = as_function(collector.LOADING_SCRIPT)
+
+    profiles: Dict[str, Dict[str, Any]] = {}
+    collected: Set[str] = set()
+
+    async def rendered_handles() -> Set[str]:
+        with run_report.phase("collector_drain", handle):
+            for cell in await page.evaluate(drain_script) or ():
+                collected.add(cell["username"])
+                if len(cell) > 1:
+                    profiles.setdefault(cell["username"], cell)
+        return collected
+
+    async def idle_seconds() -> Optional[float]:
+        idle_ms = await page.evaluate(idle_script)
+        return None if idle_ms is None else idle_ms / 1000
+
+    async def first_accounts_loaded() -> bool:
+        return bool(await rendered_handles())
+
+    with run_report.phase("scroll_wait", handle):
+        await pacer.wait_async(first_accounts_loaded, max_dwell=INITIAL_MAX_DWELL)
+    if not collected:
+        logger.error(f"No following links loaded for {handle}")
+        return FollowingScan()
+
+    progress = ScanProgress(existing_follows, full)
+    current: Set[str] = set()
+    scroll_height = 0
+
+    async def more_loaded() -> bool:
+        nonlocal current
+        current = set(await rendered_handles())
+        return len(current) > len(progress.observed)
+
+    try:
+        while True:
+            scroll_height += random.randint(100, 300)
+            if random.random() < 0.1:
+                scroll_height -= random.randint(50, 150)
+                await page.evaluate(f"window.scrollTo(0, {max(0, scroll_height)})")
+                with run_report.phase("scroll_wait", handle):
+                    await asyncio.sleep(pacer.min_dwell)
+            await page.evaluate(
+                f"window.scrollTo({{top: {scroll_height}, behavior: 'smooth'}})"
+            )
+            with run_report.phase("scroll_wait", handle):
+                await pacer.wait_async(more_loaded, idle_seconds)
+
+            # Same order as scraping.scan_following: an error page is not the end
+            if _on_error_page(page):
+                logger.warning("Detected potential rate limiting or error page")
+                progress.interrupted = True
+                x_breaker.trip(page.url)
+                if not await navigate(browser, page, url, "following", handle):
+                    break
+                scroll_height = 0
+                continue
+
+            if progress.update(current):
+                break
+
+        still_loading = progress.stopped_growing and bool(
+            await page.evaluate(loading_script)
+        )
+    except Exception as e:
+        logger.error(
+            f"An error occurred while fetching following for {handle}: {e}",
+            exc_info=True,
+        )
+        progress.interrupted = True
+        still_loading = False
+
+    logger.info(f"Found {len(progress.new)} new handles for {handle} via Playwright")
+    return progress.result(profiles, still_loading)
+
+
+class PlaywrightSource(FollowingSource):
+    """Read Following lists in Playwright contexts; needs no Selenium driver."""
+
+    name = "playwright"
+
+    def __init__(self, cost: float, browser: PlaywrightBrowser):
+        super().__init__(cost)
+        self.browser = browser
+        # Scrapes this source can run next to the Selenium drivers
+        self.workers = browser.contexts
+
+    def available(self, driver=None) -> bool:
+        return True
+
+    async def _fetch(
+        self, username: str, existing_follows: AbstractSet[str], full: bool, driver
+    ) -> FollowingScan:
+        async with self.browser.page() as page:
+            return await scan_following_async(
+                self.browser, page, username, existing_follows, full
+            )
+
+    async def close(self) -> None:
+        await self.browser.close()
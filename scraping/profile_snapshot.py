@@ -0,0 +1,157 @@
+import fcntl
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+META_FILE = "snapshot.json"
+# Chrome's per-process locks; a clone carrying them would refuse to start
+SINGLETON_FILES = ("SingletonLock", "SingletonCookie", "SingletonSocket")
+
+_build_lock = threading.Lock()
+
+
+def read_meta(template_dir: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(template_dir, META_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def template_is_current(template_dir: str, cookie_path: str) -> bool:
+    """Whether the template was built from the cookie file as it is now."""
+    meta = read_meta(template_dir)
+    if not meta:
+        return False
+    try:
+        return meta.get("cookie_mtime") == os.path.getmtime(cookie_path)
+    except OSError:
+        return False
+
+
+def build_template(
+    template_dir: str,
+    cookie_path: str,
+    start_browser: Callable[[str, Optional[str]], Any],
+    login: Callable[[Any, str], None],
+    user_agent: str,
+) -> Dict[str, Any]:
+    """
+    Log a browser into x.com once and keep its user-data-dir as the template.
+
+    start_browser(user_data_dir, user_agent) starts Chrome on a directory and
+    login(driver, cookie_path) loads the session cookies into it. The browser
+    is quit before the directory is published, so Chrome has flushed its
+    cookie store, and the template is swapped in with a rename so readers
+    never see half of one.
+    """
+    parent = os.path.dirname(os.path.abspath(template_dir))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".template-", dir=parent)
+    try:
+        driver = start_browser(staging, user_agent)
+        try:
+            login(driver, cookie_path)
+        finally:
+            driver.quit()
+        meta = {
+            "user_agent": user_agent,
+            "cookie_mtime": os.path.getmtime(cookie_path),
+            "created": time.time(),
+        }
+        with open(os.path.join(staging, META_FILE), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        _strip_singletons(staging)
+        old = None
+        if os.path.exists(template_dir):
+            old = f"{staging}.old"
+            os.rename(template_dir, old)
+        os.rename(staging, template_dir)
+        if old:
+            shutil.rmtree(old, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    logger.info(f"Built authenticated browser profile template at {template_dir}")
+    return meta
+
+
+def ensure_template(
+    template_dir: str,
+    cookie_path: str,
+    start_browser: Callable[[str, Optional[str]], Any],
+    login: Callable[[Any, str], None],
+    user_agent: Callable[[], str],
+) -> Dict[str, Any]:
+    """
+    The template's metadata, building the template first if it is missing
+    or older than the cookie file. Other threads and processes wait while
+    one of them builds it.
+    """
+    if template_is_current(template_dir, cookie_path):
+        return read_meta(template_dir)
+    parent = os.path.dirname(os.path.abspath(template_dir))
+    os.makedirs(parent, exist_ok=True)
+    with _build_lock, open(f"{template_dir}.lock", "w") as lock_file:
+        fcntl.lockf(lock_file, fcntl.LOCK_EX)
+        try:
+            if template_is_current(template_dir, cookie_path):
+                return read_meta(template_dir)
+            return build_template(
+                template_dir, cookie_path, start_browser, login, user_agent()
+            )
+        finally:
+            fcntl.lockf(lock_file, fcntl.LOCK_UN)
+
+
+def _strip_singletons(profile_dir: str) -> None:
+    for name in SINGLETON_FILES:
+        path = os.path.join(profile_dir, name)
+        if os.path.lexists(path):
+            os.remove(path)
+
+
+def clone_profile(template_dir: str, parent: Optional[str] = None) -> str:
+    """
+    A private copy of the template for one browser, as a new directory.
+
+    Uses `cp --reflink=auto`, so on copy-on-write filesystems (btrfs, XFS)
+    the clone shares the template's blocks until Chrome writes to them;
+    elsewhere it is a plain copy. Reflinks only work within one filesystem,
+    so clones go next to the template unless parent says otherwise.
+    """
+    if parent is None:
+        parent = os.path.dirname(os.path.abspath(template_dir))
+    clone = tempfile.mkdtemp(prefix="chrome-profile-", dir=parent)
+    source = os.path.join(template_dir, ".")
+    try:
+        subprocess.run(
+            ["cp", "-a", "--reflink=auto", source, clone],
+            check=True,
+            capture_output=True,
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.debug(f"cp --reflink unavailable ({e}), copying the profile instead")
+        shutil.rmtree(clone, ignore_errors=True)
+        shutil.copytree(
+            template_dir,
+            clone,
+            symlinks=True,
+            ignore=shutil.ignore_patterns(*SINGLETON_FILES),
+        )
+    _strip_singletons(clone)
+    return clone
+
+
+def remove_with(driver: Any, profile_dir: str) -> None:
+    """Delete a cloned profile once its driver is gone."""
+    weakref.finalize(driver, shutil.rmtree, profile_dir, True)
@@ -0,0 +1,127 @@
+import logging
+import weakref
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils import run_report
+from utils.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# URL patterns (Network.setBlockedURLs wildcards) for each kind of resource
+RESOURCE_PATTERNS: Dict[str, List[str]] = {
+    "images": [
+        "*pbs.twimg.com/profile_images/*",
+        "*pbs.twimg.com/profile_banners/*",
+        "*pbs.twimg.com/media/*",
+        "*pbs.twimg.com/card_img/*",
+        "*abs.twimg.com/emoji/*",
+        "*.jpg*",
+        "*.jpeg*",
+        "*.png*",
+        "*.gif*",
+        "*.webp*",
+    ],
+    "video": [
+        "*video.twimg.com/*",
+        "*.mp4*",
+        "*.m3u8*",
+        "*.m4s*",
+    ],
+    "fonts": ["*.woff*", "*.ttf*", "*.otf*"],
+    "analytics": [
+        "*google-analytics.com/*",
+        "*googletagmanager.com/*",
+        "*doubleclick.net/*",
+        "*ads-twitter.com/*",
+        "*ads-api.x.com/*",
+        "*/i/jot/*",
+        "*/1.1/jot/*",
+    ],
+}
+
+# Bytes downloaded for the page so far and the page's JS heap
+PAGE_WEIGHT_SCRIPT = """
+const entries = performance.getEntriesByType("navigation")
+  .concat(performance.getEntriesByType("resource"));
+return {
+  bytes: entries.reduce((total, entry) => total + (entry.transferSize || 0), 0),
+  heap: performance.memory ? performance.memory.usedJSHeapSize : null,
+};
+"""
+
+# driver -> page type whose patterns are currently blocked
+_applied: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+
+
+def parse_block_policy(value: Optional[str]) -> Dict[str, Tuple[str, ...]]:
+    """
+    Split BLOCK_RESOURCES ("following=images,video;profile=fonts") into
+    page type -> resource kinds. "off" or an empty value blocks nothing.
+    """
+    policy = {}
+    if not value or value.strip().lower() == "off":
+        return policy
+    for entry in value.split(";"):
+        page, _, kinds = entry.partition("=")
+        page = page.strip().lower()
+        if not page:
+            continue
+        known = []
+        for kind in (k.strip().lower() for k in kinds.split(",")):
+            if kind in RESOURCE_PATTERNS:
+                known.append(kind)
+            elif kind:
+                logger.error(f"Unknown resource kind {kind!r} in BLOCK_RESOURCES")
+        policy[page] = tuple(known)
+    return policy
+
+
+@lru_cache(maxsize=None)
+def block_policy() -> Dict[str, Tuple[str, ...]]:
+    """The BLOCK_RESOURCES policy, parsed on first use."""
+    return parse_block_policy(get_settings().block_resources)
+
+
+def blocked_urls(page: str) -> List[str]:
+    return [
+        pattern
+        for kind in block_policy().get(page, ())
+        for pattern in RESOURCE_PATTERNS[kind]
+    ]
+
+
+def block_for(driver, page: str) -> None:
+    """
+    Block what BLOCK_RESOURCES lists for this page type on the driver.
+
+    Costs a DevTools round trip only when the page type changes; the
+    Following and profile pages X serves still render everything the
+    scrapers read.
+    """
+    if _applied.get(driver) == page:
+        return
+    patterns = blocked_urls(page)
+    try:
+        if patterns:
+            driver.execute_cdp_cmd("Network.enable", {})
+        if patterns or driver in _applied:
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except Exception as e:
+        logger.warning(f"Could not block resources for {page} pages: {e}")
+    _applied[driver] = page
+
+
+def record_page_weight(driver, page: str) -> None:
+    """Add the current page's downloaded bytes and JS heap to the run report."""
+    try:
+        weight = driver.execute_script(PAGE_WEIGHT_SCRIPT)
+    except Exception as e:
+        logger.debug(f"Could not measure {page} page: {e}")
+        return
+    if not isinstance(weight, dict):
+        return
+    run_report.count(f"{page}_pages_measured")
+    run_report.count(f"{page}_page_kb", int(weight.get("bytes") or 0) // 1024)
+    if weight.get("heap"):
+        run_report.count(f"{page}_page_heap_kb", int(weight["heap"]) // 1024)
@@ -1,12 +1,13 @@
 import logging
+from dataclasses import dataclass, field
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from typing import Dict, List, Tuple, Optional, Any, Union
+from selenium.common.exceptions import TimeoutException
+from typing import AbstractSet, Dict, List, Set, Tuple, Optional, Any, Union
 from datetime import datetime
 import time
 import random
@@ -14,7 +15,13 @@ import pickle
 import unicodedata
 import re
 import os
+from urllib.parse import urlparse
 from fake_useragent import UserAgent
+from utils import run_report
+from utils.circuit_breaker import get_breaker
+from utils.config import get_settings
+from scraping import collector, network_capture, resource_blocking
+from scraping.pacing import default_pacer
 from utils.user_data import update_user_details, get_user_details
 from utils.airtable import (
     prepare_update_record,
@@ -31,6 +38,92 @@ logger = logging.getLogger(__name__)
 
 DELETE_RECORD_INDICATOR = "DELETE_RECORD"
 
+END_OF_LIST_CHECKS = 3  # Scrolls without any new handle before we stop
+# "network" reads the Following pages from DevTools network responses
+# instead of the rendered timeline
+FOLLOWING_CAPTURE = get_settings().following_capture
+INITIAL_MAX_DWELL = 15  # Longest wait for the first accounts to appear
+scroll_pacer = default_pacer()
+# Shared by every driver in the process: one rate-limit page pauses them all
+x_breaker = get_breaker("x.com")
+# Where X redirects a blocked session. None of them can be a profile path:
+# handles have no hyphen, and "i" and "account" are reserved.
+ERROR_PATHS = ("/rate-limit", "/i/rate-limit", "/i/error", "/account/access")
+
+
+@dataclass
+class FollowingScan:
+    """What one scroll through a Following page saw."""
+
+    new: List[str] = field(default_factory=list)  # Handles not in existing_follows
+    observed: Set[str] = field(default_factory=set)  # Every handle seen
+    reached_end: bool = False  # Scrolled until the list stopped growing
+    # What the list showed about each account: name, bio, verified and, from
+    # network responses, id and counts
+    profiles: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
+@dataclass
+class ScanProgress:
+    """
+    The stopping rules of a Following scan, shared by the Selenium and
+    Playwright scans: update() takes the handles read after each scroll.
+
+    The list only counts as read to the end when it stopped growing with
+    no error page on the way and nothing still loading, since a throttled
+    or stalled page stops growing too.
+    """
+
+    existing: AbstractSet[str]  # Lowercase usernames already stored
+    full: bool = False
+    max_accounts: Optional[int] = None
+    new: Set[str] = field(default_factory=set)
+    observed: Set[str] = field(default_factory=set)
+    no_new_data: int = 0
+    no_growth: int = 0
+    interrupted: bool = False  # An error page, failed load or error was seen
+
+    @property
+    def stopped_growing(self) -> bool:
+        return self.no_growth >= END_OF_LIST_CHECKS
+
+    def update(self, current: Set[str]) -> bool:
+        """Record the handles read after a scroll; True once it should stop."""
+        # Only handles not seen before are tested against the stored follows
+        fresh = current - self.observed
+        new_handles = {h for h in fresh if h not in self.existing}
+        if new_handles:
+            logger.info(f"Found {len(new_handles)} new handles.")
+            self.new.update(new_handles)
+            self.no_new_data = 0
+        else:
+            self.no_new_data += 1
+        if fresh:
+            self.observed.update(fresh)
+            self.no_growth = 0
+        else:
+            self.no_growth += 1
+
+        if self.stopped_growing:
+            logger.info(f"End of the list reached after {len(self.observed)} handles.")
+            return True
+        if not self.full and self.no_new_data >= END_OF_LIST_CHECKS:
+            logger.info("No new data found after multiple attempts.")
+            return True
+        if self.max_accounts and len(self.new) >= self.max_accounts:
+            logger.info(f"Reached max accounts limit of {self.max_accounts}")
+            return True
+        return False
+
+    def result(
+        self, profiles: Dict[str, Dict[str, Any]], still_loading: bool = False
+    ) -> FollowingScan:
+        if self.stopped_growing and still_loading:
+            logger.warning("The list stopped growing while still loading")
+            self.interrupted = True
+        reached_end = self.stopped_growing and not self.interrupted
+        return FollowingScan(list(self.new), self.observed, reached_end, profiles)
+
 
 def retry_with_backoff(func):
     def wrapper(*args, max_retries=5, initial_wait=1, max_wait=60, **kwargs):
@@ -120,7 +213,63 @@ def normalize_username(username: str) -> str:
     return username.strip().lower()
 
 
-@retry_with_backoff
+def profile_from_header(username: str, header: Dict[str, Any]) -> Dict[str, Any]:
+    """Map the fields read by profile_header.js to Accounts fields."""
+    profile_data: Dict[str, Any] = {"Username": username}
+    for field_name, key in [
+        ("Full Name", "fullName"),
+        ("Description", "description"),
+        ("Location", "location"),
+        ("Website", "website"),
+        ("Profile Image URL", "profileImage"),
+    ]:
+        if header.get(key):
+            profile_data[field_name] = clean_text(header[key])
+    if header.get("joinDate"):
+        parsed_date = parse_date(clean_text(header["joinDate"]))
+        if parsed_date:
+            profile_data["Created At"] = parsed_date
+    for field_name, key in [
+        ("Followers Count", "followers"),
+        ("Following Count", "following"),
+    ]:
+        profile_data[field_name] = parse_numeric_value(header.get(key) or "0")
+    profile_data["Verified"] = bool(header.get("verified"))
+    return profile_data
+
+
+def is_error_url(url: str) -> bool:
+    """Whether url is one of X's rate-limit or error pages."""
+    path = urlparse(url or "").path.rstrip("/").lower()
+    return any(path == p or path.startswith(f"{p}/") for p in ERROR_PATHS)
+
+
+def on_error_page(driver: webdriver.Chrome) -> bool:
+    """Whether X sent the driver to its rate-limit or error page."""
+    return is_error_url(driver.current_url)
+
+
+def navigate(driver: webdriver.Chrome, url: str, page: str, handle: str) -> bool:
+    """
+    Load url, a page of the given type, once x_breaker lets this driver
+    through and with the resources BLOCK_RESOURCES lists for it blocked.
+
+    Trips the breaker, and returns False, when the load ends on an error
+    page; a clean load closes the breaker if this driver was its probe.
+    """
+    with run_report.phase("breaker_wait", handle):
+        x_breaker.wait()
+    resource_blocking.block_for(driver, page)
+    phase = "page_load" if page == "following" else f"{page}_page_load"
+    with run_report.phase(phase, handle):
+        driver.get(url)
+    if on_error_page(driver):
+        x_breaker.trip(f"{driver.current_url} while loading {url}")
+        return False
+    x_breaker.success()
+    return True
+
+
 def scrape_twitter_profile(
     driver: webdriver.Chrome, username: str
 ) -> Union[Dict[str, Any], str, None]:
@@ -128,82 +277,21 @@ def scrape_twitter_profile(
     username = normalize_username(username)  # Ensures consistency
     logger.info(f"Attempting to scrape profile for {username}")
     try:
-        driver.get(f"https://x.com/{username}")
+        if not navigate(driver, f"https://x.com/{username}", "profile", username):
+            # Rate limited, not gone: leave the record for a later run
+            logger.warning(f"Error page instead of the profile of {username}")
+            return None
         WebDriverWait(driver, 30).until(
             EC.presence_of_element_located(
                 (By.CSS_SELECTOR, '[data-testid="UserName"]')
             )
         )
 
-        profile_data: Dict[str, Optional[Union[str, int]]] = {"Username": username}
-
-        def safe_get_element(
-            selector: str, get_attribute: Optional[str] = None
-        ) -> Optional[str]:
-            try:
-                element = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                )
-                if get_attribute:
-                    attr_value = element.get_attribute(get_attribute)
-                    return clean_text(attr_value) if attr_value is not None else None
-                return clean_text(element.text) if element.text is not None else None
-            except (NoSuchElementException, TimeoutException):
-                logger.warning(f"Element not found: {selector}")
-                return None
-
-        # Extract Full Name
-        profile_data["Full Name"] = safe_get_element(
-            '[data-testid="UserName"] div span span'
-        )
-
-        # Extract Description
-        profile_data["Description"] = safe_get_element(
-            '[data-testid="UserDescription"]'
-        )
-
-        # Extract Location
-        profile_data["Location"] = safe_get_element(
-            '[data-testid="UserProfileHeader_Items"] [data-testid="UserLocation"]'
-        )
-
-        # Extract Website
-        profile_data["Website"] = safe_get_element(
-            '[data-testid="UserProfileHeader_Items"] [data-testid="UserUrl"]', "href"
-        )
-
-        # Extract Join Date and map to Created At
-        join_date = safe_get_element(
-            '[data-testid="UserProfileHeader_Items"] [data-testid="UserJoinDate"]'
-        )
-        parsed_date = parse_date(join_date) if join_date else ""
-        if parsed_date:
-            profile_data["Created At"] = parsed_date
-
-        # Extract Followers Count
-        profile_data["Followers Count"] = parse_numeric_value(
-            safe_get_element('a[href$="/verified_followers"] span span') or "0"
-        )
-
-        # Extract Following Count
-        profile_data["Following Count"] = parse_numeric_value(
-            safe_get_element('a[href$="/following"] span span') or "0"
-        )
-
-        # Extract Profile Image URL
-        profile_image = safe_get_element(
-            '[data-testid="UserAvatar-Container-HadickM"] img', "src"
-        )
-        profile_data["Profile Image URL"] = profile_image
-
-        # Check Verified Status
-        verified_button = driver.find_elements(
-            By.CSS_SELECTOR, '[aria-label="Provides details about verified accounts."]'
-        )
-        profile_data["Verified"] = bool(verified_button)
-
-        # Remove None values
-        profile_data = {k: v for k, v in profile_data.items() if v is not None}
+        # Every header field in one round trip; missing fields cost nothing
+        with run_report.phase("profile_extract", username):
+            header = driver.execute_script(collector.load_script("profile_header.js"))
+        profile_data = profile_from_header(username, header or {})
+        resource_blocking.record_page_weight(driver, "profile")
 
         logger.info(f"Successfully scraped data for {username}")
         return profile_data
@@ -284,8 +372,16 @@ def update_twitter_data(
     return enriched_data
 
 
-def init_driver() -> webdriver.Chrome:
-    """Initialize Chrome WebDriver with appropriate options."""
+def init_driver(
+    user_data_dir: Optional[str] = None, user_agent: Optional[str] = None
+) -> webdriver.Chrome:
+    """
+    Initialize Chrome WebDriver with appropriate options.
+
+    user_data_dir starts Chrome on an existing profile (such as a clone of
+    a logged-in template) and user_agent replaces the random one, which a
+    logged-in profile should keep using.
+    """
     chrome_options = webdriver.ChromeOptions()
     chrome_options.add_argument("--headless=new")  # New headless mode
     chrome_options.add_argument("--no-sandbox")
@@ -295,7 +391,11 @@ def init_driver() -> webdriver.Chrome:
     chrome_options.add_argument("--disable-notifications")
     chrome_options.add_argument("--disable-popup-blocking")
     chrome_options.add_argument("--start-maximized")
-    chrome_options.add_argument(f"user-agent={UserAgent().random}")
+    chrome_options.add_argument(f"user-agent={user_agent or UserAgent().random}")
+    if user_data_dir:
+        chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
+    if FOLLOWING_CAPTURE == "network":
+        network_capture.capture_options(chrome_options)
 
     # Set binary location explicitly
     chrome_binary = os.environ.get("CHROME_BIN", "/usr/bin/google-chrome")
@@ -360,36 +460,127 @@ def load_cookies(driver: webdriver.Chrome, cookie_path: str) -> None:
 def get_following(
     driver: webdriver.Chrome,
     handle: str,
-    existing_follows: set,
+    existing_follows: AbstractSet[str],
+    max_accounts: Optional[int] = None,
+    with_profiles: bool = False,
+) -> Union[List[str], List[Dict[str, Any]]]:
+    """
+    Fetch following accounts for a specific user using Selenium.
+
+    With with_profiles=True each account is a record with its username and
+    whatever its cell showed (name, description, verified) instead of a
+    bare handle.
+    """
+    scan = scan_following(driver, handle, existing_follows, max_accounts)
+    if not with_profiles:
+        return scan.new
+    return [scan.profiles.get(h, {"username": h}) for h in scan.new]
+
+
+def scan_following(
+    driver: webdriver.Chrome,
+    handle: str,
+    existing_follows: AbstractSet[str],
     max_accounts: Optional[int] = None,
-) -> List[str]:
-    """Fetch following accounts for a specific user using Selenium."""
+    full: bool = False,
+) -> FollowingScan:
+    """
+    Scroll a user's Following page and collect the handles on it.
+
+    Twitter lists the newest follows first, so by default scrolling stops
+    once a few scrolls in a row bring nothing that is not in
+    existing_follows. With full=True it keeps going until the list itself
+    stops growing, so scan.observed is the complete following set whenever
+    scan.reached_end is true.
+
+    With FOLLOWING_CAPTURE=network and a driver started with the
+    performance log, handles come from the JSON the timeline downloads, and
+    scan.profiles holds the id, name, bio and counts of every account seen.
+    Otherwise, or if no response was captured, an in-page collector records
+    each timeline cell's handle, display name, bio and verified badge as it
+    renders and is drained once per scroll; scan.profiles then holds those.
+
+    After the page load and after every scroll it waits only until new
+    accounts show up or the page goes idle, within the dwell limits of
+    scroll_pacer.
+    """
     handle = handle.lower()  # Ensure username consistency
     url = f"https://x.com/{handle}/following"
-    driver.get(url)
+    if not navigate(driver, url, "following", handle):
+        logger.warning(f"Error page instead of the following of {handle}")
+        return FollowingScan()
     logger.info(f"Fetching new following for {handle}")
 
-    # Random initial wait between 5-15 seconds
-    time.sleep(random.uniform(5, 15))
-
-    initial_elements = driver.find_elements(
-        By.XPATH, "//div[@aria-label='Timeline: Following']//a[contains(@href, '/')]"
-    )
-    if not initial_elements:
+    def pause(min_seconds: float, max_seconds: float) -> None:
+        with run_report.phase("scroll_sleep", handle):
+            time.sleep(random.uniform(min_seconds, max_seconds))
+
+    profiles: Dict[str, Dict[str, Any]] = {}
+    captured: Set[str] = set()
+
+    def capture_handles() -> Set[str]:
+        """Every handle in the Following responses downloaded so far."""
+        with run_report.phase("network_capture", handle):
+            for payload in network_capture.drain_following_responses(driver):
+                for user in network_capture.parse_following_users(payload):
+                    profiles[user["username"]] = user
+                    captured.add(user["username"])
+        return captured
+
+    collected: Set[str] = set()
+
+    def rendered_handles() -> Set[str]:
+        """Every handle the collector has seen rendered so far."""
+        with run_report.phase("collector_drain", handle):
+            for cell in collector.drain_following(driver) or ():
+                collected.add(cell["username"])
+                if len(cell) > 1:
+                    profiles.setdefault(cell["username"], cell)
+        return collected
+
+    use_capture = FOLLOWING_CAPTURE == "network"
+    if use_capture and not network_capture.capture_available(driver):
+        logger.warning("Network capture needs the performance log; using the DOM")
+        use_capture = False
+
+    def first_accounts_loaded() -> bool:
+        if use_capture and capture_handles():
+            return True
+        return bool(rendered_handles())
+
+    # Wait for the first accounts instead of a fixed 5-15 seconds
+    with run_report.phase("scroll_wait", handle):
+        scroll_pacer.wait(first_accounts_loaded, max_dwell=INITIAL_MAX_DWELL)
+
+    read_handles = rendered_handles
+    if captured:
+        read_handles = capture_handles
+    elif use_capture:
+        logger.warning(f"No Following responses captured for {handle}; using the DOM")
+
+    def idle_seconds() -> Optional[float]:
+        if read_handles is capture_handles:
+            return None
+        return collector.idle_seconds(driver)
+
+    if not (captured or collected):
         logger.error("No following links loaded on the page. Exiting function.")
         screenshot_path = f"screenshots/{handle}_following.png"
         driver.save_screenshot(screenshot_path)
         logger.info(f"Screenshot saved at {screenshot_path}")
-        return []
+        return FollowingScan()
 
-    normalized_existing = {normalize_username(ef) for ef in existing_follows}
     logger.info(f"Existing handles: {len(existing_follows)}")
 
-    new_follows = set()
-    previous_total = 0
-    no_new_data_count = 0
+    progress = ScanProgress(existing_follows, full, max_accounts)
+    current_handles: Set[str] = set()
     scroll_height = 0
 
+    def more_loaded() -> bool:
+        nonlocal current_handles
+        current_handles = read_handles()
+        return len(current_handles) > len(progress.observed)
+
     try:
         while True:
             # Random scroll amount between 100-300 pixels
@@ -400,79 +591,45 @@ def get_following(
             if random.random() < 0.1:  # 10% chance
                 scroll_height -= random.randint(50, 150)
                 driver.execute_script(f"window.scrollTo(0, {max(0, scroll_height)});")
-                time.sleep(random.uniform(0.5, 1.5))
+                with run_report.phase("scroll_wait", handle):
+                    scroll_pacer.dwell()
 
             # Scroll down with smooth behavior
             driver.execute_script(
                 f"window.scrollTo({{top: {scroll_height}, behavior: 'smooth'}});"
             )
 
-            # Random pause between scrolls (longer than before)
-            time.sleep(random.uniform(2, 4))
-
-            # Occasionally take a longer pause
-            if random.random() < 0.15:  # 15% chance
-                time.sleep(random.uniform(4, 8))
-
-            elements = driver.find_elements(
-                By.XPATH,
-                "//div[@aria-label='Timeline: Following']//a[contains(@href, '/')]",
-            )
-            current_handles = {
-                normalize_username(href.split("/")[-1])
-                for el in elements
-                if (href := el.get_attribute("href"))
-                and href.startswith("https://x.com/")
-                and href is not None
-                and "/following" not in href
-                and "search?q=" not in href
-            }
-
-            # Only keep handles we haven't seen before
-            new_handles = current_handles - normalized_existing - new_follows
-            if new_handles:
-                logger.info(f"Found {len(new_handles)} new handles.")
-                new_follows.update(new_handles)
-                no_new_data_count = 0  # Reset counter when we find new handles
-            else:
-                no_new_data_count += 1
-
-            logger.info(f"Current total new handles: {len(new_follows)}")
-
-            # Check if we've reached the end (multiple checks with no new data)
-            if no_new_data_count >= 3:
-                logger.info(
-                    "No new data found after multiple attempts. Likely reached the end."
-                )
-                break
+            # Wait until the scroll has loaded more accounts or the page is idle
+            with run_report.phase("scroll_wait", handle):
+                scroll_pacer.wait(more_loaded, idle_seconds)
 
-            if len(new_follows) == previous_total:
-                # Take a longer pause and try one more time before giving up
-                time.sleep(random.uniform(5, 10))
+            # An error page shows no new accounts either; it is not the end
+            if on_error_page(driver):
+                logger.warning("Detected potential rate limiting or error page")
+                progress.interrupted = True
+                # Every driver backs off until the cool-down is over
+                x_breaker.trip(driver.current_url)
+                if not navigate(driver, url, "following", handle):
+                    break
+                scroll_height = 0
+                pause(5, 10)
                 continue
 
-            previous_total = len(new_follows)
-
-            if max_accounts and len(new_follows) >= max_accounts:
-                logger.info(f"Reached max accounts limit of {max_accounts}")
+            if progress.update(current_handles):
                 break
+            logger.info(f"Current total new handles: {len(progress.new)}")
 
-            # Check if we've hit Twitter's rate limit or other issues
-            if "rate-limit" in driver.current_url or "error" in driver.current_url:
-                logger.warning("Detected potential rate limiting or error page")
-                time.sleep(60)  # Wait a minute before continuing
-                driver.get(url)  # Reload the page
-                time.sleep(random.uniform(5, 10))
-
+        still_loading = progress.stopped_growing and collector.still_loading(driver)
     except Exception as e:
         logger.error(
             f"An error occurred while fetching following for {handle}: {e}",
             exc_info=True,
         )
+        progress.interrupted = True
+        still_loading = False
 
-    # Final random pause before returning
-    time.sleep(random.uniform(2, 5))
-    return list(new_follows)
+    resource_blocking.record_page_weight(driver, "following")
+    return progress.result(profiles, still_loading)
 
 
 def random_delay(min_seconds: int, max_seconds: int) -> None:
@@ -0,0 +1,49 @@
+import sys
+from array import array
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.account_index import AccountIndex, difference, intersection, union
+
+
+def test_index_maps_both_ways_like_a_dict():
+    """The index stands in for the accounts dict and its reverse map"""
+    accounts = AccountIndex([("alice", "rec1"), ("bob", "rec2")])
+    accounts["carol"] = "rec3"
+    accounts["alice"] = "rec9"  # duplicate row for the same account
+
+    assert len(accounts) == 3
+    assert "bob" in accounts and "dave" not in accounts
+    assert accounts.get("alice") == "rec9"
+    assert accounts.get("dave") is None
+    assert accounts.username_for("rec1") == "alice"
+    assert accounts.username_for("rec9") == "alice"
+
+    del accounts["bob"]
+    assert accounts.username_for("rec2") is None
+    assert sorted(accounts) == ["alice", "carol"]
+
+
+def test_handle_arrays_support_set_operations():
+    """Handles come back sorted and unknown ids are skipped"""
+    accounts = AccountIndex((f"user{i}", f"rec{i}") for i in range(6))
+    existing = accounts.handles_for_record_ids(["rec4", "rec1", "missing", "rec1"])
+    scraped = accounts.handles(["user1", "user2", "user5", "nobody"])
+
+    assert existing == array("l", [1, 4])
+    assert accounts.usernames(difference(scraped, existing)) == ["user2", "user5"]
+    assert accounts.usernames(intersection(scraped, existing)) == ["user1"]
+    assert list(union(scraped, existing)) == [1, 2, 4, 5]
+
+
+def test_handle_set_tests_usernames_without_building_strings():
+    accounts = AccountIndex((f"user{i}", f"rec{i}") for i in range(6))
+    follows = accounts.handle_set(accounts.handles_for_record_ids(["rec4", "rec1"]))
+
+    assert len(follows) == 2
+    assert "user4" in follows and "user1" in follows
+    assert "user2" not in follows and "nobody" not in follows
+    assert sorted(follows) == ["user1", "user4"]
+    assert {"user1", "user2"} - follows == {"user2"}
@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import benchmark
+import main
+from scraping import pacing, scraping
+
+
+@pytest.fixture(autouse=True)
+def restore_patched_globals(monkeypatch):
+    # run_benchmark swaps these out; have monkeypatch put them back
+    for module, name in [
+        (scraping, "time"),
+        (pacing, "time"),
+        (main, "AIRTABLE_REQUEST_DELAY"),
+        (main, "_memory_governor"),
+        (main, "fetch_records_from_airtable"),
+    ]:
+        monkeypatch.setattr(module, name, getattr(module, name))
+
+
+@pytest.mark.asyncio
+async def test_dry_run_tracks_every_follower():
+    """The fake browser and Airtable drive every follower through the pipeline"""
+    (result,) = await benchmark.run_benchmark(
+        [25], follows=30, new_follows=4, workers=2, trace=False
+    )
+
+    assert result["scraped"] == 25
+    assert result["failed"] == 0
+    assert result["new_handles"] == 25 * 4
+    assert result["accounts_created"] == 25 * 2
+    # Every new account got its name from the Following list cell
+    assert result["accounts_harvested"] == result["accounts_created"]
+    assert result["follow_events"] == 25 * 4
+
+
+@pytest.mark.asyncio
+async def test_reconcile_removes_unfollowed_links():
+    """A full reconcile drops stale links and still adds the new follows"""
+    (result,) = await benchmark.run_benchmark(
+        [25], follows=30, new_follows=4, workers=2, trace=False, unfollows=3
+    )
+
+    assert result["failed"] == 0
+    assert result["follows_removed"] == 25 * 3
+    assert result["new_handles"] == 25 * 4
+    assert result["follow_events"] == 25 * (4 + 3)
@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def breaker(clock):
+    return CircuitBreaker(
+        "test", base_cooldown=60, max_cooldown=200, clock=clock, sleep=clock.sleep
+    )
+
+
+def test_fleet_backs_off_once_and_lets_one_probe_through():
+    clock = FakeClock()
+    b = breaker(clock)
+    b.trip("rate-limit")
+    clock.now = 30
+    b.trip("rate-limit")  # a second driver finding the same block
+
+    assert b.state == OPEN and b.open_until == 60 and b.trips == 1
+    assert not b.allow()
+
+    clock.now = 60
+    assert b.allow() and b.state == HALF_OPEN
+    assert not b.allow()  # everyone else waits for the probe
+
+    b.success()
+    assert b.state == CLOSED and b.allow()
+
+
+def test_failed_probe_doubles_the_cooldown_up_to_the_limit():
+    clock = FakeClock()
+    b = breaker(clock)
+    cooldowns = []
+    for _ in range(4):
+        b.trip()
+        cooldowns.append(b.cooldown)
+        clock.now = b.open_until
+        assert b.allow()  # the probe, which fails again
+
+    assert cooldowns == [60, 120, 200, 200]
+    b.success()
+    assert b.cooldown == 60
+
+
+def test_wait_blocks_until_the_cooldown_is_over():
+    clock = FakeClock()
+    b = breaker(clock)
+    b.trip()
+
+    assert b.wait() == 60
+    assert b.state == HALF_OPEN
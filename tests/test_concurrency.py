@@ -0,0 +1,91 @@
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.concurrency import AdaptiveLimiter
+
+
+class RateLimited(Exception):
+    status = 429
+
+
+def test_limit_grows_while_healthy_and_halves_on_overload():
+    """Additive increase per window of healthy calls, one backoff per burst"""
+    limiter = AdaptiveLimiter("test", initial=2, min_limit=1, max_limit=4)
+    for _ in range(2 + 3):
+        with limiter.slot():
+            pass
+    assert limiter.limit == 4
+
+    # Four calls in flight hit a 429 together; only the first backs off
+    slots = [limiter.slot().__enter__() for _ in range(4)]
+    for slot in slots:
+        slot.overloaded()
+        slot.__exit__(None, None, None)
+    assert limiter.limit == 2
+
+    with pytest.raises(RateLimited):
+        with limiter.slot():
+            raise RateLimited()
+    assert limiter.limit == 1
+    assert limiter.snapshot()["overloads"] == 5
+
+    for _ in range(10):
+        with limiter.slot():
+            pass
+    assert limiter.limit == 4
+
+
+def test_slow_calls_count_as_overload():
+    limiter = AdaptiveLimiter("test", initial=4, max_limit=4, latency_target=0.01)
+    with limiter.slot():
+        time.sleep(0.02)
+    assert limiter.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_coroutines_and_threads_share_the_limit():
+    limiter = AdaptiveLimiter("test", initial=2, min_limit=2, max_limit=2)
+    busy = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def enter():
+        nonlocal busy, peak
+        with lock:
+            busy += 1
+            peak = max(peak, busy)
+
+    def leave():
+        nonlocal busy
+        with lock:
+            busy -= 1
+
+    async def task():
+        async with limiter.slot():
+            enter()
+            await asyncio.sleep(0.01)
+            leave()
+
+    def thread_call():
+        with limiter.slot():
+            enter()
+            time.sleep(0.01)
+            leave()
+
+    threads = [threading.Thread(target=thread_call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    await asyncio.gather(*(task() for _ in range(8)))
+    await asyncio.to_thread(lambda: [thread.join() for thread in threads])
+
+    assert peak == 2
+    assert limiter.in_flight == 0
+    assert limiter.completed == 12
@@ -0,0 +1,60 @@
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scraping import driver_executor
+
+
+class FakeDriver:
+    def __init__(self):
+        self.threads = {threading.get_ident()}
+        self.quit_called = False
+
+    def quit(self):
+        self.threads.add(threading.get_ident())
+        self.quit_called = True
+
+
+def scroll(driver, seconds):
+    driver.threads.add(threading.get_ident())
+    time.sleep(seconds)
+    return threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_each_driver_keeps_one_thread_and_the_loop_keeps_running():
+    """Slow Selenium calls block only their own driver's thread"""
+    first = await driver_executor.start_driver(FakeDriver)
+    second = await driver_executor.start_driver(FakeDriver)
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    threads = await asyncio.gather(
+        driver_executor.run_on_driver(first, scroll, 0.1),
+        driver_executor.run_on_driver(first, scroll, 0.1),
+        driver_executor.run_on_driver(second, scroll, 0.1),
+        tick(),
+    )
+    assert ticks == 5
+    assert len(first.threads) == 1 and len(second.threads) == 1
+    assert threads[0] == threads[1] != threads[2]
+
+    replacement = await driver_executor.replace_driver(first, FakeDriver)
+    assert first.quit_called
+    assert replacement.threads == first.threads
+
+    await driver_executor.quit_driver(replacement)
+    await driver_executor.quit_driver(second)
+    assert replacement.quit_called and second.quit_called
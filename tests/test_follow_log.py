@@ -0,0 +1,57 @@
+import json
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.event_stream import follow_event, open_event_stream
+from utils.follow_log import FOLLOW, UNFOLLOW, FollowLog
+
+
+def test_events_replay_in_order_and_scan_by_time(tmp_path):
+    """Readers can resume from a sequence number or pick a time window"""
+    log = FollowLog(str(tmp_path / "follows.sqlite"))
+    assert log.append("alice", ["bob", "carol"], ts=100.0) == 2
+    log.append("dave", ["bob"], ts=200.0)
+    log.append("alice", ["carol"], UNFOLLOW, ts=300.0)
+
+    events = list(log.replay())
+    assert [e.seq for e in events] == [1, 2, 3, 4]
+    assert [(e.follower, e.account) for e in log.replay(after_seq=2)] == [
+        ("dave", "bob"),
+        ("alice", "carol"),
+    ]
+    assert [e.follower for e in log.between(150, 400)] == ["dave", "alice"]
+    assert [e.seq for e in log.between(0, 400, kind=UNFOLLOW)] == [4]
+    assert log.last_seq() == 4
+
+
+def test_first_seen_survives_refollows(tmp_path):
+    log = FollowLog(str(tmp_path / "follows.sqlite"))
+    log.append("alice", ["bob"], ts=100.0)
+    log.append("alice", ["bob"], UNFOLLOW, ts=200.0)
+    log.append("alice", ["bob"], FOLLOW, ts=300.0)
+
+    assert log.first_seen("alice", "bob") == 100.0
+    assert log.first_seen("bob", "alice") is None
+
+
+def test_event_stream_writes_ndjson_and_rotates(tmp_path):
+    path = tmp_path / "events" / "follows.ndjson"
+    stream = open_event_stream(f"file:{path}")
+    stream.max_bytes = 200
+    event = follow_event(FOLLOW, "alice", "recF1", "bob", "recA1", 100.0)
+    stream.emit([event, dict(event, account="carol")])
+    stream.emit([dict(event, type=UNFOLLOW)])
+    stream.close()
+
+    assert [json.loads(line)["account"] for line in open(f"{path}.1")] == [
+        "bob",
+        "carol",
+    ]
+    (line,) = path.read_text().splitlines()
+    assert json.loads(line) == dict(event, type=UNFOLLOW)
+    assert stream.emitted == 3
+    assert open_event_stream("") is None
+    assert open_event_stream("kafka:follows") is None
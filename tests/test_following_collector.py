@@ -0,0 +1,122 @@
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scraping import collector
+
+NODE = shutil.which("node")
+
+# Just enough DOM for the collector: elements with attributes, text,
+# closest(), contains() and querySelectorAll() for simple selectors
+DOM = r"""
+const matches = (node, selector) => selector.split(",").some((part) => {
+  const m = part.trim().match(/^(\w*)(?:\[([\w-]+)(?:="([^"]*)")?\])?$/);
+  if (!m) return false;
+  const [, tag, attr, value] = m;
+  if (tag && node.tagName !== tag.toUpperCase()) return false;
+  if (attr && !(attr in node.attrs)) return false;
+  return value === undefined || node.attrs[attr] === value;
+});
+
+class Element {
+  constructor(tag, attrs = {}, children = [], text = "") {
+    this.nodeType = 1;
+    this.tagName = tag.toUpperCase();
+    this.attrs = attrs;
+    this.children = children;
+    this.ownText = text;
+    this.parent = null;
+    children.forEach((child) => { child.parent = this; });
+  }
+  getAttribute(name) { return name in this.attrs ? this.attrs[name] : null; }
+  get innerText() {
+    return [this.ownText, ...this.children.map((c) => c.innerText)]
+      .filter(Boolean).join(" ");
+  }
+  closest(selector) {
+    for (let node = this; node; node = node.parent) {
+      if (matches(node, selector)) return node;
+    }
+    return null;
+  }
+  contains(other) {
+    for (let node = other; node; node = node.parent) {
+      if (node === this) return true;
+    }
+    return false;
+  }
+  querySelector(selector) { return this.querySelectorAll(selector)[0] || null; }
+  querySelectorAll(selector) {
+    const found = [];
+    const walk = (node) => node.children.forEach((child) => {
+      if (matches(child, selector)) found.push(child);
+      walk(child);
+    });
+    walk(this);
+    return found;
+  }
+}
+const h = (tag, attrs, children = [], text = "") =>
+  new Element(tag, attrs, children, text);
+"""
+
+# Two cells; alice's bio mentions bob, whose own cell says something else
+PAGE = r"""
+const cell = (handle, name, bio) => h("div", { "data-testid": "UserCell" }, [
+  h("a", { href: `/${handle}` }, [h("img", {})]),
+  h("a", { href: `/${handle}` }, [h("div", { dir: "auto" }, [], name)]),
+  h("a", { href: `/${handle}` }, [], `@${handle}`),
+  h("div", { dir: "auto" }, bio),
+]);
+const timeline = h("div", { "aria-label": "Timeline: Following" }, [
+  cell("Alice", "Alice A", [
+    h("span", {}, [], "Co-founder with"),
+    h("a", { href: "/bob" }, [], "@bob"),
+  ]),
+  cell("bob", "Bob B", [h("span", {}, [], "Building things")]),
+]);
+const body = h("body", {}, [timeline]);
+global.Node = { ELEMENT_NODE: 1 };
+global.location = { origin: "https://x.com" };
+global.window = {};
+global.document = { body, querySelector: (s) => body.querySelector(s) };
+global.MutationObserver = class { observe() {} disconnect() {} };
+global.PerformanceObserver = class { observe() {} disconnect() {} };
+"""
+
+
+def run_collector(page: str):
+    script = DOM + page + (
+        "const collect = new Function(process.argv[1]);\n"
+        "console.log(JSON.stringify(collect()));\n"
+    )
+    output = subprocess.run(
+        [NODE, "-e", script, collector.load_script("following_collector.js")],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+@pytest.mark.skipif(NODE is None, reason="needs node to run the collector")
+def test_bio_mentions_are_not_follows():
+    """An @mention in a bio is neither collected nor given the host cell's bio"""
+    accounts = {account["username"]: account for account in run_collector(PAGE)}
+
+    assert sorted(accounts) == ["alice", "bob"]
+    assert accounts["alice"]["name"] == "Alice A"
+    assert accounts["alice"]["description"] == "Co-founder with @bob"
+    assert accounts["bob"] == {
+        "username": "bob",
+        "name": "Bob B",
+        "description": "Building things",
+        "verified": False,
+    }
@@ -0,0 +1,165 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scraping.following_source import (
+    FollowingRouter,
+    FollowingSource,
+    SourceUnavailable,
+    TwitterApiSource,
+    parse_source_costs,
+)
+from scraping.scraping import FollowingScan
+
+
+class StubSource(FollowingSource):
+    def __init__(self, name, cost, result, quota=None):
+        super().__init__(cost)
+        self.name = name
+        self.result = result
+        self.quota = quota
+        self.calls = 0
+
+    def quota_left(self):
+        return self.quota
+
+    async def _fetch(self, username, existing_follows, full, driver):
+        self.calls += 1
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class StubDriver:
+    pass
+
+
+def scan_of(*handles):
+    return FollowingScan(new=list(handles), observed=set(handles))
+
+
+@pytest.mark.asyncio
+async def test_router_prefers_the_cheapest_source_with_quota():
+    cheap_but_dry = StubSource("cheap", 1, scan_of("a"), quota=0)
+    middle = StubSource("middle", 2, scan_of("b"))
+    dear = StubSource("dear", 3, scan_of("c"))
+    router = FollowingRouter([dear, cheap_but_dry, middle])
+
+    scan = await router.fetch("someone", set())
+
+    assert scan.new == ["b"]
+    assert (cheap_but_dry.calls, middle.calls, dear.calls) == (0, 1, 0)
+    assert middle.latency is not None and middle.served == 1
+
+
+@pytest.mark.asyncio
+async def test_router_falls_back_on_errors_and_empty_reads():
+    broken = StubSource("broken", 1, SourceUnavailable("429"))
+    empty = StubSource("empty", 2, FollowingScan())
+    working = StubSource("working", 3, scan_of("a"))
+    router = FollowingRouter([broken, empty, working])
+
+    assert (await router.fetch("someone", set())).new == ["a"]
+    assert broken.failed == empty.failed == 1
+
+
+@pytest.mark.asyncio
+async def test_router_reraises_when_every_source_failed():
+    router = FollowingRouter([StubSource("broken", 1, RuntimeError("session lost"))])
+
+    with pytest.raises(RuntimeError):
+        await router.fetch("someone", set())
+
+
+def test_parse_source_costs():
+    assert parse_source_costs("Selenium=2, api") == {"selenium": 2.0, "api": 3.0}
+    assert parse_source_costs("") == {}
+
+
+class FakeResponse:
+    def __init__(self, data, status=200, headers=None):
+        self.data = data
+        self.status = status
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def json(self):
+        return self.data
+
+    async def text(self):
+        return str(self.data)
+
+
+class FakeSession:
+    """Serves a Following list of `total` accounts in pages of `page_size`."""
+
+    def __init__(self, total, page_size):
+        self.total = total
+        self.page_size = page_size
+        self.urls = []
+
+    def get(self, url, headers=None, params=None):
+        self.urls.append(url)
+        if "/users/by/username/" in url:
+            return FakeResponse({"data": {"id": "42"}})
+        start = int(params.get("pagination_token", 0))
+        end = min(start + self.page_size, self.total)
+        users = [
+            {
+                "id": str(i),
+                "username": f"Account{i}",
+                "name": f"Name {i}",
+                "description": f"bio {i}",
+                "public_metrics": {"followers_count": i, "following_count": 1},
+                "verified": False,
+            }
+            for i in range(start, end)
+        ]
+        meta = {"next_token": str(end)} if end < self.total else {}
+        reset = str(int(time.time()) + 900)
+        return FakeResponse(
+            {"data": users, "meta": meta},
+            headers={"x-rate-limit-remaining": "7", "x-rate-limit-reset": reset},
+        )
+
+
+@pytest.mark.asyncio
+async def test_api_source_pages_until_nothing_new():
+    """Paging stops after a page of known follows unless reading in full"""
+    session = FakeSession(total=25, page_size=10)
+    source = TwitterApiSource("token", cost=3, session=session)
+    known = {f"account{i}" for i in range(5, 25)}
+
+    scan = await source.fetch("someone", known)
+
+    assert scan.new == [f"account{i}" for i in range(5)]
+    assert not scan.reached_end
+    assert scan.profiles["account3"]["name"] == "Name 3"
+    assert source.quota_left() == 7
+    assert len(session.urls) == 3  # user id, then two pages
+
+    full = await source.fetch("someone", known, full=True)
+    assert full.reached_end and len(full.observed) == 25
+    assert len(session.urls) == 6  # the user id is cached
+
+
+@pytest.mark.asyncio
+async def test_router_reports_a_lost_driver_even_when_a_fallback_served():
+    """The worker must still restart its browser after the API covered for it"""
+    driver = StubDriver()
+    dead = StubSource("selenium", 1, RuntimeError("invalid session id"))
+    api = StubSource("api", 3, scan_of("a"))
+    router = FollowingRouter([dead, api])
+
+    assert (await router.fetch("someone", set(), driver=driver)).new == ["a"]
+    assert "invalid session id" in str(router.lost_driver(driver))
+    assert router.lost_driver(driver) is None
@@ -0,0 +1,81 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils import lease_queue
+from utils.lease_queue import LeaseQueue
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time for lease expiry"""
+    now = [1_000_000.0]
+    monkeypatch.setattr(lease_queue.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    q = LeaseQueue(
+        str(tmp_path / "leases.sqlite"),
+        lease_seconds=60,
+        revisit_seconds=3600,
+        retry_seconds=300,
+    )
+    q.seed({"rec1": "alice", "rec2": "bob", "rec3": "carol"})
+    return q
+
+
+def test_workers_never_share_a_live_lease(queue):
+    """Two workers claiming at once get disjoint items"""
+    first = queue.claim("worker-a", limit=2)
+    second = queue.claim("worker-b", limit=2)
+
+    assert len(first) == 2
+    assert len(second) == 1
+    assert not {k for k, _ in first} & {k for k, _ in second}
+    assert queue.claim("worker-c", limit=2) == []
+
+
+def test_expired_lease_is_reclaimed_unless_heartbeat(queue, clock):
+    """A dead worker's lease expires while a live worker keeps its own"""
+    dead = queue.claim("dead", limit=1)
+    live = queue.claim("live", limit=1)
+
+    clock[0] += 45
+    assert queue.heartbeat("live") == 1
+    clock[0] += 30
+
+    reclaimed = queue.claim("other", limit=3)
+    keys = {k for k, _ in reclaimed}
+    assert dead[0][0] in keys
+    assert live[0][0] not in keys
+
+
+def test_completed_item_waits_for_revisit(queue, clock):
+    """Completed items come back only after the revisit interval"""
+    (key, payload), *_ = queue.claim("worker", limit=3)
+    queue.complete("worker", key)
+    queue.release_all("worker")
+
+    assert key not in {k for k, _ in queue.claim("worker", limit=3)}
+    queue.release_all("worker")
+
+    clock[0] += 3601
+    assert key in {k for k, _ in queue.claim("worker", limit=3)}
+
+
+def test_release_backs_off_and_prune_drops_removed(queue, clock):
+    """Released items retry later and pruned items disappear"""
+    (key, _), *_ = queue.claim("worker", limit=1)
+    queue.release("worker", key)
+    assert key not in {k for k, _ in queue.claim("other", limit=3)}
+    queue.release_all("other")
+
+    queue.seed({"rec1": "alice"}, prune=True)
+    clock[0] += 301
+    assert queue.claim("worker", limit=3) == [("rec1", "alice")]
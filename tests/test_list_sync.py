@@ -0,0 +1,134 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from twitter import list_sync
+
+
+class FakeResponse:
+    def __init__(self, payload, status=200):
+        self.status = status
+        self._payload = payload
+
+    async def json(self):
+        return self._payload
+
+    async def text(self):
+        return json.dumps(self._payload)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    """Records Airtable writes made through the shared session"""
+
+    def __init__(self, existing=None):
+        self.existing = existing or {}
+        self.created = []
+        self.deleted = []
+        self.lookups = 0
+
+    def get(self, url, headers=None, params=None):
+        self.lookups += 1
+        records = [
+            {"id": record_id, "fields": {"Username": username}}
+            for username, record_id in self.existing.items()
+            if f"'{username}'" in params["filterByFormula"]
+        ]
+        return FakeResponse({"records": records})
+
+    def post(self, url, headers=None, json=None):
+        records = []
+        for record in json["records"]:
+            username = record["fields"]["Username"]
+            self.created.append(username)
+            records.append({"id": f"rec_{username}", "fields": record["fields"]})
+        return FakeResponse({"records": records})
+
+    def delete(self, url, headers=None, params=None):
+        self.deleted.extend(record_id for _, record_id in params)
+        return FakeResponse({"records": []})
+
+
+def fake_lists(monkeypatch, members):
+    """Serve list id -> usernames, or None for a list that fails to load"""
+
+    async def fetch(list_id, headers, session=None):
+        usernames = members[list_id]
+        if usernames is None:
+            return None
+        return [{"username": u, "id": u} for u in usernames]
+
+    monkeypatch.setattr(list_sync, "fetch_list_members_async", fetch)
+
+
+def test_moving_between_lists_is_not_a_change():
+    joined, left = list_sync.diff_membership(
+        {"a": {"alice", "bob"}, "b": {"carol"}},
+        {"a": {"alice"}, "b": {"carol", "bob", "dave"}},
+    )
+    assert joined == {"dave"}
+    assert left == set()
+
+
+@pytest.mark.asyncio
+async def test_sync_writes_only_membership_changes(monkeypatch, tmp_path):
+    """Joiners get rows, leavers lose theirs, and hand-added followers stay"""
+    cache = str(tmp_path / "list_members.json")
+    list_sync.save_membership(cache, {"a": {"alice", "bob"}, "b": {"carol"}})
+    fake_lists(monkeypatch, {"a": ["Alice", "Dave"], "b": None})
+    followers = {"alice": "rec1", "bob": "rec2", "carol": "rec3", "manual": "rec4"}
+    session = FakeSession()
+
+    created, deleted = await list_sync.sync_list_followers(
+        ["a", "b"], {}, "url", {}, followers, session, cache
+    )
+
+    assert (created, deleted) == (1, 1)
+    assert session.created == ["dave"]
+    assert session.deleted == ["rec2"]
+    assert followers == {
+        "alice": "rec1",
+        "carol": "rec3",
+        "manual": "rec4",
+        "dave": "rec_dave",
+    }
+    # The list that failed to load keeps its cached membership
+    assert list_sync.load_membership(cache) == {
+        "a": ["alice", "dave"],
+        "b": ["carol"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_joiners_another_host_added_are_not_created_again(monkeypatch, tmp_path):
+    """A second host sharing the lists sees the first host's rows, not new joiners"""
+    cache = str(tmp_path / "list_members.json")
+    fake_lists(monkeypatch, {"a": ["alice", "bob"]})
+    first_host = FakeSession()
+    await list_sync.sync_list_followers(["a"], {}, "url", {}, {}, first_host, cache)
+
+    # Same shared cache: nothing joined since the first host's sync
+    second_host = FakeSession()
+    assert await list_sync.sync_list_followers(
+        ["a"], {}, "url", {}, {}, second_host, cache
+    ) == (0, 0)
+    assert second_host.lookups == 0 and second_host.created == []
+
+    # Own cache, but the rows already exist in Airtable
+    third_host = FakeSession(existing={"alice": "rec_alice", "bob": "rec_bob"})
+    followers = {}
+    created, _ = await list_sync.sync_list_followers(
+        ["a"], {}, "url", {}, followers, third_host, str(tmp_path / "own.json")
+    )
+    assert created == 0 and third_host.created == []
+    assert followers == {"alice": "rec_alice", "bob": "rec_bob"}
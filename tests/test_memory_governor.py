@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils import memory
+from utils.memory import MemoryGovernor
+
+
+def fake_host(monkeypatch, percents):
+    """Make psutil report the given host memory percentages in turn"""
+    readings = iter(percents)
+    monkeypatch.setattr(
+        memory.psutil,
+        "virtual_memory",
+        lambda: SimpleNamespace(percent=next(readings)),
+    )
+
+
+def test_workers_step_down_under_pressure_and_recover(monkeypatch):
+    """Workers drop one at a time while memory is high and come back once it is low"""
+    fake_host(monkeypatch, [90, 90, 90, 80, 60, 60])
+    governor = MemoryGovernor(host_limit_percent=85, host_resume_percent=70)
+
+    allowed = [governor.sample(3) for _ in range(6)]
+
+    assert allowed == [2, 1, 1, 1, 2, 3]
+
+
+def test_limit_moves_per_sample_not_per_caller(monkeypatch):
+    """More workers checking more often must not lower the limit any faster"""
+    fake_host(monkeypatch, [90, 90])
+    governor = MemoryGovernor(host_limit_percent=85, host_resume_percent=70)
+    assert governor.allowed_workers(4) == 4
+
+    governor.sample(4)
+    readings = [governor.allowed_workers(4) for _ in range(100)]
+    governor.sample(4)
+
+    assert set(readings) == {3}
+    assert governor.allowed_workers(4) == 2
+
+
+def test_driver_budget_uses_whole_browser_tree(monkeypatch):
+    """A driver is over budget based on its process tree, not just chromedriver"""
+    monkeypatch.setattr(memory, "process_tree_rss", lambda pid: 600 * memory.MB)
+    governor = MemoryGovernor(driver_budget_mb=500)
+    driver = SimpleNamespace(service=SimpleNamespace(process=SimpleNamespace(pid=1)))
+
+    assert governor.driver_over_budget(driver)
+    assert not governor.driver_over_budget(SimpleNamespace())
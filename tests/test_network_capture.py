@@ -0,0 +1,139 @@
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scraping import network_capture, resource_blocking, scraping
+from scraping.pacing import ScrollPacer
+
+PAGE_SIZE = 3
+
+
+def user_entry(i):
+    return {
+        "entryId": f"user-{i}",
+        "content": {
+            "itemContent": {
+                "user_results": {
+                    "result": {
+                        "__typename": "User",
+                        "rest_id": str(1000 + i),
+                        "is_blue_verified": i == 0,
+                        "core": {"screen_name": f"Account{i}", "name": f"Name {i}"},
+                        "legacy": {
+                            "description": f"bio {i}",
+                            "followers_count": i * 10,
+                            "friends_count": i,
+                        },
+                    }
+                }
+            }
+        },
+    }
+
+
+def following_page(users):
+    entries = [user_entry(i) for i in users]
+    entries.append({"entryId": "cursor-bottom-1", "content": {"value": "x"}})
+    return {
+        "data": {
+            "user": {
+                "result": {
+                    "timeline": {
+                        "timeline": {
+                            "instructions": [
+                                {"type": "TimelineAddEntries", "entries": entries}
+                            ]
+                        }
+                    }
+                }
+            }
+        }
+    }
+
+
+class CapturingDriver:
+    """Serves the Following timeline as GraphQL responses in the performance log."""
+
+    log_types = ["browser", "performance"]
+    current_url = "https://x.com/someone/following"
+
+    def __init__(self, total):
+        self.total = total
+        self.loaded = 0
+        self.bodies = {}
+        self.log = []
+        self.dom_queries = 0
+
+    def _load_page(self):
+        users = range(self.loaded, min(self.loaded + PAGE_SIZE, self.total))
+        self.loaded = users.stop
+        request_id = f"req{len(self.bodies)}"
+        self.bodies[request_id] = json.dumps(following_page(users))
+        url = "https://x.com/i/api/graphql/abc123/Following?variables=%7B%7D"
+        for method, params in [
+            ("Network.requestWillBeSent", {"requestId": request_id}),
+            (
+                "Network.responseReceived",
+                {"requestId": request_id, "response": {"url": url}},
+            ),
+            ("Network.responseReceived", {"requestId": "other", "response": {}}),
+            ("Network.loadingFinished", {"requestId": request_id}),
+            ("Network.loadingFinished", {"requestId": "other"}),
+        ]:
+            message = {"message": {"method": method, "params": params}}
+            self.log.append({"message": json.dumps(message)})
+
+    def get(self, url):
+        self._load_page()
+
+    def get_log(self, kind):
+        entries, self.log = self.log, []
+        return entries
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd != "Network.getResponseBody":
+            return {}
+        return {"body": self.bodies[params["requestId"]], "base64Encoded": False}
+
+    def execute_script(self, script, *args):
+        if "__followingCollector" in script:
+            self.dom_queries += 1
+            return []
+        if script == resource_blocking.PAGE_WEIGHT_SCRIPT:
+            return None
+        if self.loaded < self.total:
+            self._load_page()
+
+
+def test_parse_following_users_reads_every_field():
+    (first, second) = network_capture.parse_following_users(following_page([0, 1]))
+    assert first == {
+        "username": "account0",
+        "id": "1000",
+        "name": "Name 0",
+        "description": "bio 0",
+        "followers_count": 0,
+        "following_count": 0,
+        "verified": True,
+    }
+    assert second["username"] == "account1" and not second["verified"]
+
+
+def test_scan_reads_following_from_network_responses(monkeypatch):
+    """A full scan collects every handle and profile without DOM queries"""
+    monkeypatch.setattr(scraping, "FOLLOWING_CAPTURE", "network")
+    monkeypatch.setattr(scraping, "time", SimpleNamespace(sleep=lambda seconds: None))
+    monkeypatch.setattr(scraping, "scroll_pacer", ScrollPacer(0, 0))
+    driver = CapturingDriver(total=10)
+
+    scan = scraping.scan_following(driver, "someone", {"account1"}, full=True)
+
+    assert scan.reached_end
+    assert scan.observed == {f"account{i}" for i in range(10)}
+    assert sorted(scan.new) == sorted(scan.observed - {"account1"})
+    assert scan.profiles["account7"]["description"] == "bio 7"
+    assert driver.dom_queries == 0
@@ -0,0 +1,56 @@
+import random
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scraping.pacing import ScrollPacer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def make_pacer(clock):
+    return ScrollPacer(
+        1.0,
+        6.0,
+        jitter=0.0,
+        poll=0.25,
+        idle=1.5,
+        sleep=clock.sleep,
+        clock=clock,
+        rng=random.Random(1),
+    )
+
+
+def test_wait_ends_when_content_loads_but_not_before_min_dwell():
+    clock = FakeClock()
+    pacer = make_pacer(clock)
+
+    assert pacer.wait(lambda: True)
+    assert clock.now == 1.0
+
+    clock.now = 0.0
+    assert pacer.wait(lambda: clock.now >= 2.2)
+    assert clock.now == 2.25
+
+
+def test_wait_gives_up_on_idle_or_max_dwell():
+    clock = FakeClock()
+    pacer = make_pacer(clock)
+
+    assert not pacer.wait(lambda: False, idle_seconds=lambda: clock.now)
+    assert clock.now == 1.5
+
+    clock.now = 0.0
+    assert not pacer.wait(lambda: False, idle_seconds=lambda: None)
+    assert clock.now == 6.0
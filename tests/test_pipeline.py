@@ -0,0 +1,58 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.pipeline import StageStats, feed_queue, run_stage
+
+
+@pytest.mark.asyncio
+async def test_stages_pass_items_through_bounded_queues():
+    """Items flow through every stage and each stage stops cleanly"""
+    inbox: asyncio.Queue = asyncio.Queue(maxsize=2)
+    middle: asyncio.Queue = asyncio.Queue(maxsize=1)
+    seen = []
+    max_depth = 0
+
+    async def double(item, worker):
+        nonlocal max_depth
+        max_depth = max(max_depth, middle.qsize())
+        return item * 2
+
+    async def collect(item, worker):
+        await asyncio.sleep(0)
+        seen.append(item)
+
+    first = StageStats("double")
+    second = StageStats("collect")
+    await asyncio.gather(
+        feed_queue(range(10), inbox, 3),
+        run_stage(first, double, inbox, middle, workers=3),
+        run_stage(second, collect, middle),
+    )
+
+    assert sorted(seen) == [i * 2 for i in range(10)]
+    assert first.items_in == 10 and first.items_out == 10
+    assert second.items_in == 10
+    assert max_depth <= middle.maxsize
+
+
+@pytest.mark.asyncio
+async def test_stage_counts_errors_and_keeps_going():
+    """A failing item is counted and the stage moves on to the next one"""
+    inbox: asyncio.Queue = asyncio.Queue()
+
+    async def flaky(item, worker):
+        if item == 1:
+            raise ValueError("boom")
+        return None
+
+    stats = StageStats("flaky")
+    await asyncio.gather(feed_queue([0, 1, 2], inbox, 1), run_stage(stats, flaky, inbox))
+
+    assert stats.items_in == 3
+    assert stats.errors == 1
@@ -0,0 +1,126 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scraping.following_source import FollowingRouter, SeleniumSource
+from scraping.pacing import ScrollPacer
+from scraping.scraping import x_breaker
+from scraping.playwright_backend import (
+    PlaywrightSource,
+    as_function,
+    playwright_cookies,
+    scan_following_async,
+)
+
+
+class FakeBrowser:
+    contexts = 3
+
+    def __init__(self):
+        self.blocked = []
+
+    async def block_for(self, page, page_type):
+        self.blocked.append(page_type)
+
+
+class FollowingPage:
+    """A Following page whose collector hands out `total` cells, 4 per drain."""
+
+    def __init__(self, total, error_after=None):
+        self.cells = [
+            {"username": f"account{i}", "name": f"Account {i}"}
+            for i in range(total)
+        ]
+        self.url = "about:blank"
+        self.scrolls = 0
+        self.error_after = error_after
+
+    async def goto(self, url, wait_until=None):
+        self.url = url
+
+    async def evaluate(self, script):
+        if "scrollTo" in script:
+            self.scrolls += 1
+            if self.scrolls == self.error_after:
+                self.url = "https://x.com/i/rate-limit"
+            return None
+        if "idleMs()" in script and "TIMELINE" not in script:
+            return 5000  # ms since the list last changed
+        if "progressbar" in script:
+            return False
+        drained, self.cells = self.cells[:4], self.cells[4:]
+        return drained
+
+
+def test_cookies_are_converted_for_x_com():
+    cookies = playwright_cookies(
+        [
+            {
+                "name": "auth_token",
+                "value": "secret",
+                "domain": ".twitter.com",
+                "expiry": 1900000000,
+                "sameSite": "None",
+                "secure": True,
+            }
+        ]
+    )
+
+    assert cookies == [
+        {
+            "name": "auth_token",
+            "value": "secret",
+            "domain": ".x.com",
+            "path": "/",
+            "httpOnly": False,
+            "secure": True,
+            "expires": 1900000000.0,
+            "sameSite": "None",
+        }
+    ]
+
+
+def test_scripts_are_wrapped_as_functions():
+    assert as_function("return 1;") == "() => {\nreturn 1;\n}"
+
+
+@pytest.mark.asyncio
+async def test_scan_reads_the_whole_list_with_profiles():
+    browser = FakeBrowser()
+    page = FollowingPage(total=10)
+
+    scan = await scan_following_async(
+        browser, page, "Someone", {"account1"}, full=True, pacer=ScrollPacer(0, 0)
+    )
+
+    assert page.url == "https://x.com/someone/following"
+    assert browser.blocked == ["following"]
+    assert len(scan.observed) == 10 and scan.reached_end
+    assert sorted(scan.new) == sorted(f"account{i}" for i in range(10) if i != 1)
+    assert scan.profiles["account3"]["name"] == "Account 3"
+
+
+@pytest.mark.asyncio
+async def test_error_page_mid_scroll_is_not_the_end_of_the_list(monkeypatch):
+    tripped = []
+    monkeypatch.setattr(x_breaker, "allow", lambda: True)
+    monkeypatch.setattr(x_breaker, "trip", tripped.append)
+    monkeypatch.setattr(x_breaker, "success", lambda: None)
+    page = FollowingPage(total=10, error_after=1)
+
+    scan = await scan_following_async(
+        FakeBrowser(), page, "someone", set(), full=True, pacer=ScrollPacer(0, 0)
+    )
+
+    assert tripped == ["https://x.com/i/rate-limit"]
+    assert len(scan.observed) == 10 and not scan.reached_end
+
+
+def test_playwright_contexts_add_scrape_workers():
+    router = FollowingRouter([SeleniumSource(1), PlaywrightSource(1, FakeBrowser())])
+
+    assert router.extra_workers() == 3
+    assert [s.name for s in router.candidates(driver=None)] == ["playwright"]
@@ -0,0 +1,53 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scraping import profile_snapshot
+
+
+class FakeBrowser:
+    """Writes a cookie store and Chrome's lock into the profile it runs on."""
+
+    def __init__(self, user_data_dir):
+        self.dir = Path(user_data_dir)
+        (self.dir / "SingletonLock").symlink_to("host-1234")
+
+    def quit(self):
+        pass
+
+
+def test_template_is_built_once_per_cookie_file_and_cloned(tmp_path):
+    cookie_path = tmp_path / "cookies.pkl"
+    cookie_path.write_bytes(b"cookies")
+    template = str(tmp_path / "template")
+    started = []
+
+    def start_browser(user_data_dir, user_agent):
+        started.append(user_agent)
+        return FakeBrowser(user_data_dir)
+
+    def login(driver, path):
+        (driver.dir / "Default").mkdir()
+        (driver.dir / "Default" / "Cookies").write_bytes(Path(path).read_bytes())
+
+    def ensure():
+        return profile_snapshot.ensure_template(
+            template, str(cookie_path), start_browser, login, lambda: "UA"
+        )
+
+    assert ensure()["user_agent"] == "UA"
+    ensure()
+    assert started == ["UA"]
+    assert not os.path.lexists(os.path.join(template, "SingletonLock"))
+
+    clone = profile_snapshot.clone_profile(template)
+    assert (Path(clone) / "Default" / "Cookies").read_bytes() == b"cookies"
+    # Next to the template, on the filesystem a reflink can share
+    assert Path(clone).parent == Path(template).parent
+
+    # New cookies make the template stale
+    os.utime(cookie_path, (1, 1))
+    ensure()
+    assert len(started) == 2
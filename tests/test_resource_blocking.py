@@ -0,0 +1,50 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scraping import resource_blocking
+
+
+class CdpDriver:
+    def __init__(self):
+        self.commands = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.commands.append((cmd, params))
+        return {}
+
+
+def test_parse_block_policy():
+    policy = resource_blocking.parse_block_policy(
+        "following=images, fonts,bogus;profile=analytics"
+    )
+    assert policy == {"following": ("images", "fonts"), "profile": ("analytics",)}
+    assert resource_blocking.parse_block_policy("off") == {}
+
+
+def test_patterns_are_sent_only_when_the_page_type_changes(monkeypatch):
+    monkeypatch.setattr(
+        resource_blocking,
+        "block_policy",
+        lambda: {"following": ("images", "video"), "profile": ("fonts",)},
+    )
+    driver = CdpDriver()
+
+    resource_blocking.block_for(driver, "following")
+    resource_blocking.block_for(driver, "following")
+    resource_blocking.block_for(driver, "profile")
+
+    blocked = [p["urls"] for c, p in driver.commands if c == "Network.setBlockedURLs"]
+    assert len(blocked) == 2
+    assert "*video.twimg.com/*" in blocked[0]
+    assert blocked[1] == resource_blocking.RESOURCE_PATTERNS["fonts"]
+
+
+def test_nothing_is_sent_when_blocking_is_off(monkeypatch):
+    monkeypatch.setattr(resource_blocking, "block_policy", lambda: {})
+    driver = CdpDriver()
+
+    resource_blocking.block_for(driver, "following")
+
+    assert driver.commands == []
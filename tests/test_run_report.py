@@ -0,0 +1,127 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils import run_report
+from utils.run_report import RunReport, percentile
+
+
+@pytest.fixture(autouse=True)
+def restore_current_report(monkeypatch):
+    monkeypatch.setattr(run_report, "_current", run_report.get_run_report())
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(v) for v in range(1, 21)]
+
+    assert percentile(values, 0.5) == 10.0
+    assert percentile(values, 0.95) == 19.0
+    assert percentile(values, 1.0) == 20.0
+    assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 0.5) == 3.0
+    assert percentile([float(v) for v in range(1, 10)], 0.5) == 5.0
+    assert percentile([float(v) for v in range(1, 10)], 0.95) == 9.0
+    assert percentile([3.0], 0.5) == 3.0
+    assert percentile([3.0], 0.95) == 3.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_phases_are_timed_per_phase_and_per_follower(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(run_report.time, "monotonic", clock)
+    report = RunReport("test")
+
+    for seconds in (1.0, 3.0):
+        with report.phase("page_load", "alice"):
+            clock.now += seconds
+    try:
+        with report.phase("page_load", "bob"):
+            clock.now += 2.0
+            raise RuntimeError("still timed")
+    except RuntimeError:
+        pass
+
+    summary = report.summary()
+    assert summary["phases"]["page_load"] == {
+        "count": 3,
+        "total": 6.0,
+        "p50": 2.0,
+        "p95": 3.0,
+        "max": 3.0,
+    }
+    assert summary["followers"] == {
+        "alice": {"page_load": 4.0},
+        "bob": {"page_load": 2.0},
+    }
+    assert summary["wall_time"] == 6.0
+
+
+def test_counts_add_up():
+    report = RunReport("test")
+    report.count("followers_scraped")
+    report.count("followers_scraped")
+    report.count("follows_removed", 5)
+
+    assert report.summary()["counts"] == {"followers_scraped": 2, "follows_removed": 5}
+
+
+def test_write_saves_the_summary_as_json(tmp_path):
+    report = RunReport("test")
+    report.count("accounts_created", 3)
+    report.extra["concurrency"] = {"browser": {"limit": 2}}
+
+    path = report.write(str(tmp_path / "report.json"))
+
+    written = json.loads(Path(path).read_text())
+    assert written["name"] == "test"
+    assert written["counts"] == {"accounts_created": 3}
+    assert written["concurrency"] == {"browser": {"limit": 2}}
+
+
+def test_profiled_run_writes_report_and_stats(monkeypatch, tmp_path):
+    monkeypatch.setattr(run_report, "REPORT_DIR", str(tmp_path))
+
+    def work():
+        run_report.count("followers_scraped")
+        return sum(i * i for i in range(1000))
+
+    assert run_report.run_with_report("profiled", work, profile=True) == 332833500
+
+    (report_path,) = tmp_path.glob("profiled-*.json")
+    written = json.loads(report_path.read_text())
+    assert written["counts"] == {"followers_scraped": 1}
+    assert written["profile"] and {"function", "calls", "own_time"} <= set(
+        written["profile"][0]
+    )
+    assert os.path.exists(os.path.splitext(report_path)[0] + ".prof")
+
+
+def test_starting_a_run_leaves_earlier_reports_alone():
+    """Module-level count() and phase() follow the newest run only"""
+    first = run_report.start_run_report("first")
+    run_report.count("followers_scraped")
+    second = run_report.start_run_report("second")
+    run_report.count("followers_scraped", 2)
+    with run_report.phase("page_load"):
+        pass
+    # Code still holding the first report keeps recording into it
+    first.count("followers_failed")
+
+    assert run_report.get_run_report() is second
+    assert first.summary()["counts"] == {"followers_scraped": 1, "followers_failed": 1}
+    assert second.summary()["counts"] == {"followers_scraped": 2}
+    assert "page_load" not in first.summary()["phases"]
+    assert second.summary()["phases"]["page_load"]["count"] == 1
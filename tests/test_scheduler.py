@@ -0,0 +1,80 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils import run_report
+from utils.scheduler import Scheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def no_report_files(monkeypatch):
+    monkeypatch.setattr(run_report.RunReport, "write", lambda self: "report.json")
+
+
+def make_scheduler(clock, ran):
+    scheduler = Scheduler(clock=clock, rng=random.Random(1))
+
+    def job(name):
+        async def run():
+            ran.append(name)
+            if name == "enrich" and ran.count("enrich") == 1:
+                raise RuntimeError("nitter down")
+
+        return run
+
+    scheduler.add("track", job("track"), 600, jitter=0.1, delay=5)
+    scheduler.add("enrich", job("enrich"), 100, jitter=0, after=["track"])
+    scheduler.add("analyze", job("analyze"), 1000, jitter=0, after=["enrich"])
+    return scheduler
+
+
+@pytest.mark.asyncio
+async def test_dependents_wait_for_and_follow_their_dependency():
+    """Nothing runs before tracking, then each finished job pulls the next forward"""
+    clock = FakeClock()
+    ran = []
+    scheduler = make_scheduler(clock, ran)
+
+    assert await scheduler.run_pending() == []
+    clock.now = 5
+    await scheduler.run_pending()
+    await scheduler.run_pending()
+    await scheduler.run_pending()
+    # A failed run still counts as finished and is retried on its interval
+    assert ran == ["track", "enrich", "analyze"]
+    assert scheduler.jobs["enrich"].failures == 1
+
+    clock.now = 105
+    await scheduler.run_pending()
+    assert ran[3:] == ["enrich"]
+    # analyze was pulled forward again by the enrich run
+    await scheduler.run_pending()
+    assert ran[4:] == ["analyze"]
+
+
+@pytest.mark.asyncio
+async def test_jitter_stays_within_the_interval_fraction():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, [])
+    track = scheduler.jobs["track"]
+    gaps = []
+    for _ in range(50):
+        clock.now = track.next_run
+        await scheduler.run_job(track)
+        gaps.append(track.next_run - clock.now)
+
+    assert all(540 <= gap <= 660 for gap in gaps)
+    assert len(set(gaps)) > 1
@@ -0,0 +1,135 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scraping import resource_blocking, scraping
+from scraping.pacing import ScrollPacer
+
+
+class ProfileDriver:
+    """A profile page whose header holds only some of the fields."""
+
+    def __init__(self, header):
+        self.header = header
+        self.scripts = 0
+        self.current_url = "about:blank"
+
+    def get(self, url):
+        self.current_url = url
+
+    def find_element(self, by, value):
+        return object()
+
+    def execute_script(self, script, *args):
+        if script == resource_blocking.PAGE_WEIGHT_SCRIPT:
+            return {"bytes": 2048, "heap": None}
+        self.scripts += 1
+        return self.header
+
+
+def test_profile_is_read_in_one_script_and_missing_fields_are_skipped():
+    driver = ProfileDriver(
+        {
+            "fullName": "Alice  Example",
+            "description": "Builds things &amp; writes",
+            "joinDate": "Joined March 2015",
+            "followers": "1.5K",
+            "following": "321",
+            "verified": True,
+        }
+    )
+
+    profile = scraping.scrape_twitter_profile(driver, " Alice ")
+
+    assert driver.scripts == 1
+    assert driver.current_url == "https://x.com/alice"
+    assert profile == {
+        "Username": "alice",
+        "Full Name": "Alice Example",
+        "Description": "Builds things & writes",
+        "Created At": "2015-03-01",
+        "Followers Count": 1500,
+        "Following Count": 321,
+        "Verified": True,
+    }
+
+
+def test_rate_limited_profile_is_not_marked_for_deletion(monkeypatch):
+    """An error page trips the shared breaker instead of deleting the account"""
+    tripped = []
+    monkeypatch.setattr(scraping.x_breaker, "wait", lambda: 0.0)
+    monkeypatch.setattr(scraping.x_breaker, "trip", tripped.append)
+    driver = ProfileDriver({})
+    driver.get = lambda url: setattr(driver, "current_url", "https://x.com/rate-limit")
+
+    assert scraping.scrape_twitter_profile(driver, "alice") is None
+    assert tripped and driver.scripts == 0
+
+
+def test_only_x_error_routes_count_as_error_pages():
+    assert scraping.is_error_url("https://x.com/i/rate-limit")
+    assert scraping.is_error_url("https://x.com/account/access?lang=en")
+    assert not scraping.is_error_url("https://x.com/errorbot/following")
+    assert not scraping.is_error_url("https://x.com/terror_alerts")
+
+
+class FollowingDriver:
+    """A Following timeline of `total` accounts that shows 4 more per scroll."""
+
+    def __init__(self, total, error_after=None):
+        self.handles = [f"account{i}" for i in range(total)]
+        self.shown = 0
+        self.drained = 0
+        self.scrolls = 0
+        self.error_after = error_after
+        self.current_url = "about:blank"
+
+    def get(self, url):
+        self.current_url = url
+
+    def execute_script(self, script, *args):
+        if script == scraping.collector.IDLE_SCRIPT:
+            return 5000
+        if script in (
+            scraping.collector.LOADING_SCRIPT,
+            resource_blocking.PAGE_WEIGHT_SCRIPT,
+        ):
+            return None
+        if "scrollTo" in script:
+            self.scrolls += 1
+            if self.scrolls == self.error_after:
+                self.current_url = "https://x.com/i/rate-limit"
+            elif self.current_url.endswith("/following"):
+                self.shown = min(self.shown + 4, len(self.handles))
+            return None
+        cells = self.handles[self.drained : max(self.shown, 4)]
+        self.drained += len(cells)
+        return [{"username": handle} for handle in cells]
+
+
+def scan_with(monkeypatch, driver):
+    tripped = []
+    monkeypatch.setattr(scraping, "scroll_pacer", ScrollPacer(0, 0))
+    monkeypatch.setattr(scraping, "time", SimpleNamespace(sleep=lambda s: None))
+    monkeypatch.setattr(scraping.x_breaker, "wait", lambda: 0.0)
+    monkeypatch.setattr(scraping.x_breaker, "trip", tripped.append)
+    monkeypatch.setattr(scraping.x_breaker, "success", lambda: None)
+    return scraping.scan_following(driver, "someone", set(), full=True), tripped
+
+
+def test_full_scan_reaches_the_end_of_the_list(monkeypatch):
+    scan, tripped = scan_with(monkeypatch, FollowingDriver(total=10))
+
+    assert scan.reached_end and len(scan.observed) == 10 and not tripped
+
+
+def test_error_page_mid_scroll_is_not_the_end_of_the_list(monkeypatch):
+    """A rate-limit page stops the list growing but must not mark it complete"""
+    scan, tripped = scan_with(monkeypatch, FollowingDriver(total=10, error_after=1))
+
+    assert tripped == ["https://x.com/i/rate-limit"]
+    assert len(scan.observed) == 10
+    assert not scan.reached_end
@@ -0,0 +1,159 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import benchmark
+import main
+import scrape_empty_accounts
+from scraping.following_source import FollowingRouter, FollowingSource
+from scraping.scraping import FollowingScan
+from utils.lease_queue import LeaseQueue
+
+
+class StubApiSource(FollowingSource):
+    """An API source that reads one brand-new follow for every follower."""
+
+    name = "api"
+    workers = 2
+
+    async def _fetch(self, username, existing_follows, full, driver):
+        return FollowingScan(new=[f"{username}new"], observed={f"{username}new"})
+
+
+class FailingApiSource(FollowingSource):
+    name = "api"
+    workers = 2
+
+    async def _fetch(self, username, existing_follows, full, driver):
+        raise RuntimeError("API read failed")
+
+
+class StubBrowserSource(FollowingSource):
+    """Reads one brand-new follow for every follower, but only with a driver."""
+
+    name = "selenium"
+
+    def available(self, driver=None):
+        return driver is not None
+
+    async def _fetch(self, username, existing_follows, full, driver):
+        await asyncio.sleep(0.01)  # Long enough for the API workers to take some
+        return FollowingScan(new=[f"{username}new"], observed={f"{username}new"})
+
+
+class FakeDriver:
+    pass
+
+
+class UnreachableNitter:
+    def __init__(self):
+        self.requested = []
+
+    def get_profile(self, username):
+        self.requested.append(username)
+        return None
+
+
+@pytest.fixture
+def tracking(monkeypatch, tmp_path):
+    store = benchmark.FakeAirtable(5, follows=4, new_follows=0)
+    monkeypatch.setattr(main, "fetch_records_from_airtable", store.fetch_records)
+    monkeypatch.setattr(main, "AIRTABLE_REQUEST_DELAY", 0)
+    headers = {"Authorization": "Bearer test"}
+    followers, accounts = main.load_tracking_state(headers)
+    leases = LeaseQueue(str(tmp_path / "leases.sqlite"))
+    main.seed_follower_leases(leases, followers)
+    return leases, headers, accounts, benchmark.FakeSession(store)
+
+
+def test_reconcile_refuses_to_drop_most_stored_links():
+    """A list that stopped loading early must not wipe a follower's links"""
+    stored = [f"rec{i}" for i in range(100)]
+
+    assert main.plausible_unfollows(main.LinkDiff(stored[:90], stored[90:]))
+    assert main.plausible_unfollows(main.LinkDiff(stored[:2], stored[2:9]))
+    assert not main.plausible_unfollows(main.LinkDiff(stored[:40], stored[40:]))
+
+
+@pytest.mark.asyncio
+async def test_api_only_setup_tracks_every_follower(tracking):
+    """FOLLOWING_SOURCES=api starts no browsers but still gets scrape workers"""
+    leases, headers, accounts, session = tracking
+    router = FollowingRouter([StubApiSource(cost=3)])
+
+    new_handles = await main.run_tracking_pipeline(
+        leases, [], headers, accounts, session, router=router
+    )
+
+    assert new_handles == 5
+    assert leases.due_count() == 0
+    assert router.sources[0].served == 5
+
+
+@pytest.mark.asyncio
+async def test_failed_api_reads_go_back_to_the_browser_workers(tracking, monkeypatch):
+    """A follower the API cannot read is scraped by a browser in the same run"""
+    leases, headers, accounts, session = tracking
+    monkeypatch.setattr(main, "HANDOFF_POLL_SECONDS", 0)
+    governor = main.get_memory_governor()
+    monkeypatch.setattr(governor, "driver_over_budget", lambda d: False)
+    api, browser = FailingApiSource(cost=3), StubBrowserSource(cost=1)
+    router = FollowingRouter([api, browser])
+
+    new_handles = await main.run_tracking_pipeline(
+        leases, [FakeDriver()], headers, accounts, session, router=router
+    )
+
+    assert new_handles == 5
+    assert leases.due_count() == 0
+    assert api.failed > 0
+    assert browser.served == 5
+
+
+@pytest.mark.asyncio
+async def test_no_scrape_workers_fails_loudly(tracking):
+    leases, headers, accounts, session = tracking
+
+    with pytest.raises(RuntimeError, match="No scrape workers"):
+        await main.run_tracking_pipeline(
+            leases, [], headers, accounts, session, router=FollowingRouter([])
+        )
+
+
+@pytest.mark.asyncio
+async def test_new_accounts_are_enriched_but_never_deleted_mid_run(
+    tracking, monkeypatch
+):
+    """Accounts the run just linked survive a Nitter that cannot find them"""
+    leases, headers, accounts, session = tracking
+    deleted = []
+    monkeypatch.setattr(scrape_empty_accounts, "delete_airtable_record", deleted.append)
+    queue = asyncio.Queue()
+
+    await main.run_tracking_pipeline(
+        leases,
+        [],
+        headers,
+        accounts,
+        session,
+        queue,
+        router=FollowingRouter([StubApiSource(cost=3)]),
+    )
+    created = [queue.get_nowait() for _ in range(queue.qsize())]
+    assert sorted(username for _, username in created) == [
+        f"follower{i}new" for i in range(5)
+    ]
+
+    nitter = UnreachableNitter()
+    for item in created + [main.STOP]:
+        queue.put_nowait(item)
+    await scrape_empty_accounts.run_enrichment_workers(queue, 1, nitter)
+
+    assert len(nitter.requested) == 5 * scrape_empty_accounts.MAX_RETRIES
+    assert deleted == []
+    assert all(accounts[username] == record_id for record_id, username in created)
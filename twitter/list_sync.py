@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import tempfile
+from typing import Dict, List, Optional, Set, Tuple
+
+from twitter.twitter_api import fetch_list_members_async
+from utils.concurrency import get_limiter
+from utils.lazy import lazy_import
+
+aiohttp = lazy_import("aiohttp")
+
+logger = logging.getLogger(__name__)
+
+WRITE_BATCH_SIZE = 10  # Airtable accepts at most 10 records per create/delete
+LOOKUP_BATCH_SIZE = 50  # Usernames per filterByFormula, to keep URLs short
+
+
+def parse_list_ids(value: Optional[str]) -> List[str]:
+    """Split a comma-separated LIST_ID setting into list ids."""
+    return [list_id.strip() for list_id in (value or "").split(",") if list_id.strip()]
+
+
+def load_membership(path: str) -> Dict[str, List[str]]:
+    """Load the cached membership (list id -> usernames) from the last sync."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.error(f"Error loading list membership cache {path}: {e}")
+        return {}
+
+
+def save_membership(path: str, membership: Dict[str, Set[str]]) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".list_members-", dir=directory or None)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(
+            {list_id: sorted(usernames) for list_id, usernames in membership.items()},
+            f,
+        )
+    os.replace(tmp_path, path)
+
+
+def diff_membership(
+    previous: Dict[str, Set[str]], current: Dict[str, Set[str]]
+) -> Tuple[Set[str], Set[str]]:
+    """
+    Usernames that joined and left the union of all lists.
+
+    Moving between two tracked lists is neither a join nor a leave.
+    """
+    before = set().union(*previous.values())
+    after = set().union(*current.values())
+    return after - before, before - after
+
+
+async def fetch_memberships(
+    list_ids: List[str], headers: Dict[str, str], session: aiohttp.ClientSession
+) -> Dict[str, Optional[Set[str]]]:
+    """Fetch every list concurrently; a list that failed maps to None."""
+    results = await asyncio.gather(
+        *(fetch_list_members_async(list_id, headers, session) for list_id in list_ids)
+    )
+    return {
+        list_id: (
+            None
+            if members is None
+            else {member["username"].lower() for member in members}
+        )
+        for list_id, members in zip(list_ids, results)
+    }
+
+
+async def find_followers(
+    usernames: List[str],
+    url: str,
+    headers: Dict[str, str],
+    session: aiohttp.ClientSession,
+) -> Optional[Dict[str, str]]:
+    """
+    Followers rows that already exist for usernames, as username -> record id,
+    or None if Airtable could not be asked.
+    """
+    found = {}
+    for i in range(0, len(usernames), LOOKUP_BATCH_SIZE):
+        batch = usernames[i : i + LOOKUP_BATCH_SIZE]
+        formula = "OR({})".format(
+            ",".join(f"LOWER({{Username}})='{u}'" for u in batch)
+        )
+        params = {"filterByFormula": formula, "fields[]": "Username"}
+        while True:
+            try:
+                async with get_limiter("airtable").slot() as slot, session.get(
+                    url, headers=headers, params=params
+                ) as response:
+                    slot.record_status(response.status)
+                    if response.status != 200:
+                        logger.error(
+                            f"Failed to look up followers {batch}: "
+                            f"{await response.text()}"
+                        )
+                        return None
+                    page = await response.json()
+            except aiohttp.ClientError as e:
+                logger.error(f"Failed to look up followers {batch}: {e}")
+                return None
+            for record in page.get("records", []):
+                username = record.get("fields", {}).get("Username")
+                if username:
+                    found[username.lower()] = record["id"]
+            if not page.get("offset"):
+                break
+            params = {**params, "offset": page["offset"]}
+    return found
+
+
+async def create_followers(
+    usernames: List[str], url: str, headers: Dict[str, str], session: aiohttp.ClientSession
+) -> Dict[str, str]:
+    """Create Followers rows and return username -> record id for those created."""
+    created = {}
+    for i in range(0, len(usernames), WRITE_BATCH_SIZE):
+        batch = usernames[i : i + WRITE_BATCH_SIZE]
+        try:
+            async with get_limiter("airtable").slot() as slot, session.post(
+                url,
+                headers=headers,
+                json={"records": [{"fields": {"Username": u}} for u in batch]},
+            ) as response:
+                slot.record_status(response.status)
+                if response.status != 200:
+                    logger.error(
+                        f"Failed to create followers {batch}: {await response.text()}"
+                    )
+                    continue
+                for record in (await response.json()).get("records", []):
+                    created[record["fields"]["Username"].lower()] = record["id"]
+        except aiohttp.ClientError as e:
+            logger.error(f"Failed to create followers {batch}: {e}")
+    return created
+
+
+async def delete_followers(
+    record_ids: Dict[str, str],
+    url: str,
+    headers: Dict[str, str],
+    session: aiohttp.ClientSession,
+) -> List[str]:
+    """Delete Followers rows (username -> record id) and return the usernames deleted."""
+    deleted = []
+    items = list(record_ids.items())
+    for i in range(0, len(items), WRITE_BATCH_SIZE):
+        batch = items[i : i + WRITE_BATCH_SIZE]
+        try:
+            async with get_limiter("airtable").slot() as slot, session.delete(
+                url,
+                headers=headers,
+                params=[("records[]", record_id) for _, record_id in batch],
+            ) as response:
+                slot.record_status(response.status)
+                if response.status != 200:
+                    logger.error(
+                        f"Failed to delete followers {[u for u, _ in batch]}: "
+                        f"{await response.text()}"
+                    )
+                    continue
+                deleted.extend(username for username, _ in batch)
+        except aiohttp.ClientError as e:
+            logger.error(f"Failed to delete followers {[u for u, _ in batch]}: {e}")
+    return deleted
+
+
+async def sync_list_followers(
+    list_ids: List[str],
+    twitter_headers: Dict[str, str],
+    followers_url: str,
+    airtable_headers: Dict[str, str],
+    followers: Dict[str, str],
+    session: aiohttp.ClientSession,
+    cache_path: str,
+) -> Tuple[int, int]:
+    """
+    Make the Followers table follow the membership of the given Twitter lists.
+
+    Each list is fetched concurrently and compared with the membership cached
+    at cache_path by the last sync. Only accounts that joined a list get a
+    Followers row and only accounts that left every list lose theirs, so an
+    unchanged membership costs one API call per list page and no writes.
+    Followers that were never on a tracked list are left alone. A list that
+    cannot be fetched is treated as unchanged.
+
+    Tracker processes on several hosts share cache_path (it lives next to
+    the lease database), so syncs hold a lock on it and one host's joiners
+    are not joiners again for the next. Joiners are also looked up in the
+    Followers table before any row is created for them.
+
+    `followers` (lowercase username -> record id) is updated in place.
+    Returns (created, deleted).
+    """
+    directory = os.path.dirname(cache_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(f"{cache_path}.lock", "w") as lock_file:
+        await asyncio.to_thread(fcntl.lockf, lock_file, fcntl.LOCK_EX)
+        try:
+            return await _sync_list_followers(
+                list_ids,
+                twitter_headers,
+                followers_url,
+                airtable_headers,
+                followers,
+                session,
+                cache_path,
+            )
+        finally:
+            fcntl.lockf(lock_file, fcntl.LOCK_UN)
+
+
+async def _sync_list_followers(
+    list_ids: List[str],
+    twitter_headers: Dict[str, str],
+    followers_url: str,
+    airtable_headers: Dict[str, str],
+    followers: Dict[str, str],
+    session: aiohttp.ClientSession,
+    cache_path: str,
+) -> Tuple[int, int]:
+    cached = load_membership(cache_path)
+    previous = {list_id: set(cached.get(list_id, [])) for list_id in list_ids}
+    fetched = await fetch_memberships(list_ids, twitter_headers, session)
+    current = {
+        list_id: members if members is not None else previous[list_id]
+        for list_id, members in fetched.items()
+    }
+
+    joined, left = diff_membership(previous, current)
+    to_create = sorted(username for username in joined if username not in followers)
+    to_delete = {
+        username: followers[username] for username in sorted(left) if username in followers
+    }
+    logger.info(
+        f"Lists {', '.join(list_ids)}: {len(joined)} joined, {len(left)} left, "
+        f"{len(to_create)} followers to add, {len(to_delete)} to remove"
+    )
+
+    # Another host may have added them since our Followers table was loaded
+    existing = {}
+    if to_create:
+        existing = await find_followers(
+            to_create, followers_url, airtable_headers, session
+        )
+    if existing is None:
+        logger.warning("Could not check Airtable for joiners; not adding them")
+        skipped = to_create
+        to_create = []
+    else:
+        followers.update(existing)
+        skipped = []
+        to_create = [username for username in to_create if username not in existing]
+    created = await create_followers(to_create, followers_url, airtable_headers, session)
+    deleted = await delete_followers(to_delete, followers_url, airtable_headers, session)
+    followers.update(created)
+    for username in deleted:
+        followers.pop(username, None)
+
+    if (
+        not skipped
+        and len(created) == len(to_create)
+        and len(deleted) == len(to_delete)
+    ):
+        save_membership(cache_path, current)
+    else:
+        # Writes are keyed on the followers table, so retrying the diff is safe
+        logger.warning("Some follower writes failed; list membership cache not updated")
+    return len(created), len(deleted)
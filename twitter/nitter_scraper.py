@@ -10,6 +10,8 @@ from tenacity import retry, stop_after_attempt, wait_exponential
 import threading
 from collections import deque
 
+from utils.concurrency import get_limiter
+
 # Initialize logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -96,8 +98,10 @@ class NitterScraper:
         # Disable SSL verification warnings since we're using a local instance
         self.session.verify = False
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-        # Initialize rate limiter (45 requests per minute)
+        # Hard ceiling of 45 requests per minute; within it, the adaptive
+        # limiter decides how many requests run at once
         self.rate_limiter = RateLimiter(max_requests=45, time_window=60)
+        self.concurrency = get_limiter("nitter")
 
     @retry(
         stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10)
@@ -109,7 +113,9 @@ class NitterScraper:
             self.rate_limiter.acquire()
 
             url = f"{self.base_url}/{username}"
-            response = self.session.get(url, timeout=10)
+            with self.concurrency.slot() as slot:
+                response = self.session.get(url, timeout=10)
+                slot.record_status(response.status_code)
 
             if response.status_code == 429:
                 logger.warning(
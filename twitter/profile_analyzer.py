@@ -6,6 +6,7 @@ import asyncio
 from tenacity import retry, stop_after_attempt, wait_exponential
 from openai import OpenAI
 from .nitter_scraper import NitterScraper
+from utils.concurrency import get_limiter
 from utils.config import load_env_variables
 from utils.logging_setup import setup_logging
 
@@ -17,10 +18,8 @@ logger = logging.getLogger(__name__)
 config = load_env_variables()
 OPENAI_API_KEY = config.get("openai_api_key")
 
-# Configure OpenAI with rate limiting
+# OpenAI calls go through the shared adaptive "openai" limiter
 client = OpenAI(api_key=OPENAI_API_KEY)
-MAX_CONCURRENT_REQUESTS = 5
-request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
 
 
 class ProfileAnalyzer:
@@ -134,9 +133,8 @@ class ProfileAnalyzer:
         stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10)
     )
     async def analyze_profile_with_retries(self, username: str) -> Dict[str, Any]:
-        """Analyze a Twitter profile with retries and rate limiting."""
-        async with request_semaphore:  # Rate limit concurrent requests
-            return await self._analyze_profile(username)
+        """Analyze a Twitter profile with retries."""
+        return await self._analyze_profile(username)
 
     async def _analyze_profile(self, username: str) -> Dict[str, Any]:
         """Internal method to analyze a profile."""
@@ -221,45 +219,46 @@ class ProfileAnalyzer:
     )
     async def _get_openai_analysis(self, analysis_prompt: Dict[str, str]):
         """Get analysis from OpenAI with retries and rate limiting."""
-        return await asyncio.to_thread(
-            client.responses.create,
-            # always use gpt-4o
-            model="gpt-4o",
-            input=[
-                {
-                    "role": "system",
-                    "content": """Analyze the Twitter profile and its content to extract business information. Focus on key details only.""",
-                },
-                {"role": "user", "content": str(analysis_prompt)},
-            ],
-            text={
-                "format": {
-                    "type": "json_schema",
-                    "name": "twitter_business_analysis",
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "business_name": {
-                                "type": "string",
-                                "description": "Business name or 'Not explicitly mentioned'",
-                            },
-                            "website": {
-                                "type": "string",
-                                "description": "Business website or 'Not explicitly mentioned'",
-                            },
-                            "business_context": {
-                                "type": "string",
-                                "description": "Brief business description (max 1000 words)",
+        async with get_limiter("openai").slot():
+            return await asyncio.to_thread(
+                client.responses.create,
+                # always use gpt-4o
+                model="gpt-4o",
+                input=[
+                    {
+                        "role": "system",
+                        "content": """Analyze the Twitter profile and its content to extract business information. Focus on key details only.""",
+                    },
+                    {"role": "user", "content": str(analysis_prompt)},
+                ],
+                text={
+                    "format": {
+                        "type": "json_schema",
+                        "name": "twitter_business_analysis",
+                        "schema": {
+                            "type": "object",
+                            "properties": {
+                                "business_name": {
+                                    "type": "string",
+                                    "description": "Business name or 'Not explicitly mentioned'",
+                                },
+                                "website": {
+                                    "type": "string",
+                                    "description": "Business website or 'Not explicitly mentioned'",
+                                },
+                                "business_context": {
+                                    "type": "string",
+                                    "description": "Brief business description (max 1000 words)",
+                                },
                             },
+                            "required": ["business_name", "website", "business_context"],
+                            "additionalProperties": False,
                         },
-                        "required": ["business_name", "website", "business_context"],
-                        "additionalProperties": False,
-                    },
-                    "strict": True,
-                }
-            },
-            timeout=15,
-        )
+                        "strict": True,
+                    }
+                },
+                timeout=15,
+            )
 
 
 async def analyze_twitter_profile(username: str) -> Dict[str, Any]:
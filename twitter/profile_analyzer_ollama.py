@@ -6,6 +6,7 @@ import asyncio
 from tenacity import retry, stop_after_attempt, wait_exponential
 import ollama
 from .nitter_scraper import NitterScraper
+from utils.concurrency import get_limiter
 from utils.config import load_env_variables
 from utils.logging_setup import setup_logging
 
@@ -16,9 +17,7 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 config = load_env_variables()
 
-# Configure rate limiting
-MAX_CONCURRENT_REQUESTS = 5
-request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+# Ollama calls go through the shared adaptive "ollama" limiter
 
 
 class ProfileAnalyzer:
@@ -135,9 +134,8 @@ class ProfileAnalyzer:
         stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10)
     )
     async def analyze_profile_with_retries(self, username: str) -> Dict[str, Any]:
-        """Analyze a Twitter profile with retries and rate limiting."""
-        async with request_semaphore:  # Rate limit concurrent requests
-            return await self._analyze_profile(username)
+        """Analyze a Twitter profile with retries."""
+        return await self._analyze_profile(username)
 
     async def _analyze_profile(self, username: str) -> Dict[str, Any]:
         """Internal method to analyze a profile."""
@@ -189,16 +187,17 @@ class ProfileAnalyzer:
                 {"role": "user", "content": json.dumps(analysis_prompt, indent=2)},
             ]
 
-            response = await self.client.chat(
-                model="llama2",  # Using llama2 instead of mistral for better performance
-                messages=messages,
-                format="json",
-                options={
-                    "temperature": 0,  # Lower temperature for faster, more deterministic responses
-                    "num_ctx": 4096,  # Smaller context window since we don't need 32k
-                    "num_thread": 4,  # Use multiple CPU threads
-                },
-            )
+            async with get_limiter("ollama").slot():
+                response = await self.client.chat(
+                    model="llama2",  # Using llama2 instead of mistral for better performance
+                    messages=messages,
+                    format="json",
+                    options={
+                        "temperature": 0,  # Lower temperature for faster, more deterministic responses
+                        "num_ctx": 4096,  # Smaller context window since we don't need 32k
+                        "num_thread": 4,  # Use multiple CPU threads
+                    },
+                )
 
             if not response or not response.message or not response.message.content:
                 logger.error("Empty response from Ollama")
@@ -1,7 +1,11 @@
-import requests
 import logging
 from typing import Dict, List, Optional, Any
 
+from utils.concurrency import get_limiter
+from utils.lazy import lazy_import
+
+requests = lazy_import("requests")
+
 
 def fetch_list_members(list_id, headers):
     url = f"https://api.twitter.com/2/lists/{list_id}/members"
@@ -37,7 +41,9 @@ def fetch_twitter_data_api(username: str, bearer_token: str) -> Optional[Dict[st
     }
     params = {"user.fields": "id,name,username,created_at,description,public_metrics"}
     try:
-        response = requests.get(url, headers=headers, params=params)
+        with get_limiter("twitter_api").slot() as slot:
+            response = requests.get(url, headers=headers, params=params)
+            slot.record_status(response.status_code)
         response.raise_for_status()
         return response.json().get('data')
     except requests.exceptions.RequestException as e:
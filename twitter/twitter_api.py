@@ -1,9 +1,14 @@
 # twitter/twitter_api.py
+from __future__ import annotations
+
 import logging
 import os
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+from utils.concurrency import get_limiter
+from utils.lazy import lazy_import
 
-import aiohttp
+aiohttp = lazy_import("aiohttp")
 
 logger = logging.getLogger(__name__)
 
@@ -12,41 +17,55 @@ LIST_ID: str | None = os.environ.get("LIST_ID")
 
 
 async def fetch_list_members_async(
-    list_id: str, headers: Dict[str, str]
-) -> List[Dict[str, str]]:
+    list_id: str,
+    headers: Dict[str, str],
+    session: Optional[aiohttp.ClientSession] = None,
+) -> Optional[List[Dict[str, str]]]:
     """
     Fetch members of a Twitter list asynchronously.
 
     Args:
         list_id (str): The Twitter list ID.
         headers (Dict[str, str]): HTTP headers including authorization.
+        session (aiohttp.ClientSession, optional): Session to reuse, so several
+            lists can be fetched concurrently over one connection pool.
 
     Returns:
-        List[Dict[str, str]]: List of members with 'username' and 'id'.
+        Optional[List[Dict[str, str]]]: List of members with 'username' and 'id',
+        or None if any page failed, since a partial list is not the membership.
     """
+    if session is None:
+        async with aiohttp.ClientSession() as own_session:
+            return await fetch_list_members_async(list_id, headers, own_session)
+
     url = f"https://api.twitter.com/2/lists/{list_id}/members"
     members = []
     params = {"max_results": 100}
 
-    async with aiohttp.ClientSession() as session:
-        while True:
-            async with session.get(url, headers=headers, params=params) as response:
-                if response.status == 200:
-                    members_data = await response.json()
-                    data = members_data.get("data", [])
-                    for member in data:
-                        members.append(
-                            {"username": member["username"], "id": member["id"]}
-                        )
-                    next_token = members_data.get("meta", {}).get("next_token")
-                    if not next_token:
-                        break
-                    params["pagination_token"] = next_token
-                else:
+    while True:
+        try:
+            async with get_limiter("twitter_api").slot() as slot, session.get(
+                url, headers=headers, params=params
+            ) as response:
+                slot.record_status(response.status)
+                if response.status != 200:
                     response_text = await response.text()
-                    logger.error(f"Error fetching list members: {response.status}")
+                    logger.error(
+                        f"Error fetching members of list {list_id}: {response.status}"
+                    )
                     logger.error(f"Response: {response_text}")
-                    break
+                    return None
+                members_data = await response.json()
+        except aiohttp.ClientError as e:
+            logger.error(f"Error fetching members of list {list_id}: {e}")
+            return None
+
+        for member in members_data.get("data", []):
+            members.append({"username": member["username"], "id": member["id"]})
+        next_token = members_data.get("meta", {}).get("next_token")
+        if not next_token:
+            break
+        params["pagination_token"] = next_token
 
     return members
 
@@ -72,7 +91,10 @@ async def fetch_twitter_data_api_async(
     params = {"user.fields": "id,name,username,created_at,description,public_metrics"}
 
     async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=headers, params=params) as response:
+        async with get_limiter("twitter_api").slot() as slot, session.get(
+            url, headers=headers, params=params
+        ) as response:
+            slot.record_status(response.status)
             if response.status == 200:
                 data = await response.json()
                 return data.get("data", {})
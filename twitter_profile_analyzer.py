@@ -1,14 +1,17 @@
 import os
 import json
+import argparse
 import asyncio
 import logging
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Dict, Any, List, TypedDict
 
-from pyairtable import Api
-from openai import OpenAI
 from tenacity import retry, stop_after_attempt, wait_exponential
-from dotenv import load_dotenv
+
+from utils import run_report
+from utils.concurrency import get_limiter
+from utils.config import get_settings
 
 
 # Define our own type for Airtable records
@@ -28,44 +31,57 @@ class ContentText(TypedDict):
     type: str
 
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler("twitter_analyzer.log"), logging.StreamHandler()],
-)
 logger = logging.getLogger("twitter_profile_analyzer")
 
-# Load environment variables from .env file
-load_dotenv()
-logger.info("Environment variables loaded")
-
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-logger.info("OpenAI client initialized")
-
-# Initialize Airtable client
-AIRTABLE_API_KEY = os.getenv("AIRTABLE_TOKEN")
-AIRTABLE_BASE_ID = os.getenv("AIRTABLE_BASE_ID")
-AIRTABLE_TABLE_NAME = os.getenv("AIRTABLE_ACCOUNTS_TABLE")
-
-# Validate environment variables
-for var_name, var_value in [
-    ("AIRTABLE_TOKEN", AIRTABLE_API_KEY),
-    ("AIRTABLE_BASE_ID", AIRTABLE_BASE_ID),
-    ("AIRTABLE_ACCOUNTS_TABLE", AIRTABLE_TABLE_NAME),
-]:
-    if not var_value:
-        logger.error(f"{var_name} environment variable not set")
-        raise ValueError(f"{var_name} environment variable not set")
-
-logger.info(
-    f"Airtable configuration: BASE_ID={AIRTABLE_BASE_ID}, TABLE={AIRTABLE_TABLE_NAME}"
-)
-airtable = Api(api_key=AIRTABLE_API_KEY or "")  # Type assertion
-table = airtable.table(
-    base_id=AIRTABLE_BASE_ID or "", table_name=AIRTABLE_TABLE_NAME or ""
-)  # Type assertion
+settings = get_settings()
+AIRTABLE_API_KEY = settings.airtable_token
+AIRTABLE_BASE_ID = settings.airtable_base_id
+AIRTABLE_TABLE_NAME = settings.airtable_accounts_table
+
+
+def setup_analyzer_logging() -> None:
+    """Log to twitter_analyzer.log and the console."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[
+            logging.FileHandler("twitter_analyzer.log"),
+            logging.StreamHandler(),
+        ],
+    )
+
+
+@lru_cache(maxsize=None)
+def get_client():
+    """The OpenAI client, created on first use."""
+    from openai import OpenAI
+
+    client = OpenAI(api_key=settings.openai_api_key)
+    logger.info("OpenAI client initialized")
+    return client
+
+
+@lru_cache(maxsize=None)
+def get_table():
+    """The Accounts table, validated and connected on first use."""
+    for var_name, var_value in [
+        ("AIRTABLE_TOKEN", AIRTABLE_API_KEY),
+        ("AIRTABLE_BASE_ID", AIRTABLE_BASE_ID),
+        ("AIRTABLE_ACCOUNTS_TABLE", AIRTABLE_TABLE_NAME),
+    ]:
+        if not var_value:
+            logger.error(f"{var_name} environment variable not set")
+            raise ValueError(f"{var_name} environment variable not set")
+
+    from pyairtable import Api
+
+    logger.info(
+        f"Airtable configuration: BASE_ID={AIRTABLE_BASE_ID}, TABLE={AIRTABLE_TABLE_NAME}"
+    )
+    airtable = Api(api_key=AIRTABLE_API_KEY or "")  # Type assertion
+    return airtable.table(
+        base_id=AIRTABLE_BASE_ID or "", table_name=AIRTABLE_TABLE_NAME or ""
+    )  # Type assertion
 
 
 async def get_recent_accounts() -> List[AirtableRecord]:
@@ -77,7 +93,8 @@ async def get_recent_accounts() -> List[AirtableRecord]:
     logger.info(f"Querying Airtable with formula: {formula}")
 
     try:
-        records = table.all(formula=formula)
+        with get_limiter("airtable").slot():
+            records = get_table().all(formula=formula)
         logger.info(f"Retrieved {len(records)} records from Airtable")
         if records:
             logger.debug(f"Sample record ID: {records[0]['id']}")
@@ -131,47 +148,48 @@ async def analyze_profile(profile_data: Dict[str, Any]) -> Dict[str, Any]:
         logger.info(f"Sending request to OpenAI for {username}")
 
         # Use the Chat Completions API with web search capability and structured output
-        response = client.chat.completions.create(
-            model="gpt-4o-search-preview",
-            web_search_options={"search_context_size": "medium"},
-            response_format={
-                "type": "json_schema",
-                "json_schema": {
-                    "name": "twitter_profile_analysis",
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "profile": {
-                                "type": "object",
-                                "properties": {
-                                    "name": {"type": "string"},
-                                    "description": {"type": "string"},
+        async with get_limiter("openai").slot():
+            response = get_client().chat.completions.create(
+                model="gpt-4o-search-preview",
+                web_search_options={"search_context_size": "medium"},
+                response_format={
+                    "type": "json_schema",
+                    "json_schema": {
+                        "name": "twitter_profile_analysis",
+                        "schema": {
+                            "type": "object",
+                            "properties": {
+                                "profile": {
+                                    "type": "object",
+                                    "properties": {
+                                        "name": {"type": "string"},
+                                        "description": {"type": "string"},
+                                    },
+                                    "required": ["name", "description"],
+                                    "additionalProperties": False,
                                 },
-                                "required": ["name", "description"],
-                                "additionalProperties": False,
-                            },
-                            "website": {"type": "string"},
-                            "investment_potential": {
-                                "type": "object",
-                                "properties": {
-                                    "score": {"type": "integer"},
-                                    "justification": {"type": "string"},
+                                "website": {"type": "string"},
+                                "investment_potential": {
+                                    "type": "object",
+                                    "properties": {
+                                        "score": {"type": "integer"},
+                                        "justification": {"type": "string"},
+                                    },
+                                    "required": ["score", "justification"],
+                                    "additionalProperties": False,
                                 },
-                                "required": ["score", "justification"],
-                                "additionalProperties": False,
                             },
+                            "required": ["profile", "investment_potential", "website"],
+                            "additionalProperties": False,
                         },
-                        "required": ["profile", "investment_potential", "website"],
-                        "additionalProperties": False,
+                        "strict": True,
                     },
-                    "strict": True,
                 },
-            },
-            messages=[
-                {"role": "system", "content": instructions},
-                {"role": "user", "content": prompt_content},
-            ],
-        )
+                messages=[
+                    {"role": "system", "content": instructions},
+                    {"role": "user", "content": prompt_content},
+                ],
+            )
 
         logger.info(f"Received response from OpenAI for {username}")
 
@@ -251,30 +269,93 @@ async def update_airtable_record(
         if score is not None:
             update_data["Score"] = score
 
-        table.update(record_id, update_data)
+        with get_limiter("airtable").slot():
+            get_table().update(record_id, update_data)
         logger.info(f"Successfully updated Airtable record for {username}")
 
     except Exception as e:
         logger.error(f"Error updating Airtable record for {username}: {str(e)}")
 
 
-async def process_accounts():
-    """Main function to process accounts from Airtable."""
-    # Define field names based on the Airtable schema
-    field_mapping = {
-        "username": "Username",
-        "full_name": "Full Name",
-        "description": "Description",
-        "tweet_count": "Tweet Count",
-        "followers_count": "Followers Count",
-        "following_count": "Following Count",
-        "location": "Location",
-        "website": "Website",
-    }
+# Define field names based on the Airtable schema
+FIELD_MAPPING = {
+    "username": "Username",
+    "full_name": "Full Name",
+    "description": "Description",
+    "tweet_count": "Tweet Count",
+    "followers_count": "Followers Count",
+    "following_count": "Following Count",
+    "location": "Location",
+    "website": "Website",
+}
+
+
+async def process_recent_accounts(rate_limit: int, batch_size: int) -> int:
+    """Analyze every recently created account once. Returns the number analyzed."""
+    # Get recent accounts
+    with run_report.phase("airtable_fetch_records"):
+        accounts = await get_recent_accounts()
+    logger.info(f"Found {len(accounts)} accounts to process")
+
+    analyzed = 0
+    for i, account in enumerate(accounts):
+        # Extract Twitter username from the record
+        username = account["fields"].get(FIELD_MAPPING["username"], "")
+        record_id = account["id"]
+
+        if not username:
+            logger.warning(f"Skipping record {record_id} - no username found")
+            continue
+
+        # Extract profile data from Airtable record
+        profile_data = {
+            field: account["fields"].get(FIELD_MAPPING[field], "")
+            for field in FIELD_MAPPING
+        }
+
+        logger.info(
+            f"Processing account {i+1}/{len(accounts)}: {username} (ID: {record_id})"
+        )
+
+        # Analyze profile
+        try:
+            with run_report.phase("openai_analysis", username):
+                analysis = await analyze_profile(profile_data)
+            logger.info(
+                f"Analysis completed for {username}. Investment score: {analysis.get('investment_potential', {}).get('score', 'N/A')}"
+            )
 
+            # Update Airtable with analysis
+            with run_report.phase("airtable_update", username):
+                await update_airtable_record(record_id, username, analysis)
+            analyzed += 1
+            run_report.count("accounts_analyzed")
+
+        except Exception as e:
+            logger.error(
+                f"Error analyzing profile for {username}: {str(e)}",
+                exc_info=True,
+            )
+
+        # Rate limiting
+        wait_time = 60 / rate_limit
+        logger.debug(f"Rate limiting: waiting {wait_time} seconds before next request")
+        with run_report.phase("rate_limit_sleep"):
+            await asyncio.sleep(wait_time)
+
+        # Process in batches if configured
+        if (i + 1) % batch_size == 0 and i < len(accounts) - 1:
+            logger.info(f"Processed batch of {batch_size} accounts, pausing...")
+            await asyncio.sleep(10)  # Pause between batches
+
+    return analyzed
+
+
+async def process_accounts(profile: bool = False):
+    """Main function to process accounts from Airtable."""
     # Configure rate limiting from env if available
-    rate_limit = int(os.getenv("AIRTABLE_RATE_LIMIT", "5"))
-    batch_size = int(os.getenv("AIRTABLE_BATCH_SIZE", "10"))
+    rate_limit = settings.airtable_rate_limit
+    batch_size = settings.airtable_batch_size
     polling_interval = int(os.getenv("POLLING_INTERVAL_SECONDS", "300"))
 
     logger.info(
@@ -283,56 +364,12 @@ async def process_accounts():
 
     while True:
         try:
-            # Get recent accounts
-            accounts = await get_recent_accounts()
-            logger.info(f"Found {len(accounts)} accounts to process")
-
-            for i, account in enumerate(accounts):
-                # Extract Twitter username from the record
-                username = account["fields"].get(field_mapping["username"], "")
-                record_id = account["id"]
-
-                if not username:
-                    logger.warning(f"Skipping record {record_id} - no username found")
-                    continue
-
-                # Extract profile data from Airtable record
-                profile_data = {
-                    field: account["fields"].get(field_mapping[field], "")
-                    for field in field_mapping
-                }
-
-                logger.info(
-                    f"Processing account {i+1}/{len(accounts)}: {username} (ID: {record_id})"
-                )
-
-                # Analyze profile
-                try:
-                    analysis = await analyze_profile(profile_data)
-                    logger.info(
-                        f"Analysis completed for {username}. Investment score: {analysis.get('investment_potential', {}).get('score', 'N/A')}"
-                    )
-
-                    # Update Airtable with analysis
-                    await update_airtable_record(record_id, username, analysis)
-
-                except Exception as e:
-                    logger.error(
-                        f"Error analyzing profile for {username}: {str(e)}",
-                        exc_info=True,
-                    )
-
-                # Rate limiting
-                wait_time = 60 / rate_limit
-                logger.debug(
-                    f"Rate limiting: waiting {wait_time} seconds before next request"
-                )
-                await asyncio.sleep(wait_time)
-
-                # Process in batches if configured
-                if (i + 1) % batch_size == 0 and i < len(accounts) - 1:
-                    logger.info(f"Processed batch of {batch_size} accounts, pausing...")
-                    await asyncio.sleep(10)  # Pause between batches
+            # Each polling cycle gets its own run report
+            await run_report.run_with_report_async(
+                "twitter_profile_analyzer",
+                lambda: process_recent_accounts(rate_limit, batch_size),
+                profile=profile,
+            )
 
             # Wait before next polling cycle
             logger.info(
@@ -347,9 +384,20 @@ async def process_accounts():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Score recently created Accounts with OpenAI, polling Airtable."
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="add cProfile output for the hottest functions to each cycle's run report",
+    )
+    args = parser.parse_args()
+    setup_analyzer_logging()
+
     logger.info("Starting Twitter profile analyzer...")
     try:
-        asyncio.run(process_accounts())
+        asyncio.run(process_accounts(profile=args.profile))
     except KeyboardInterrupt:
         logger.info("Process interrupted by user")
     except Exception as e:
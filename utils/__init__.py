@@ -1,20 +1,34 @@
 # utils package initialization
+#
+# The helpers below are re-exported lazily, so that importing a single
+# submodule (e.g. `from utils import run_report`) does not pull in requests
+# and the Airtable client.
+import importlib
 
-from .airtable import (
-    update_airtable,
-    delete_airtable_record,
-    fetch_records_from_airtable,
-    post_airtable_records,
-    update_followers_field,
-    update_airtable_records,
-)
+_EXPORTS = {
+    "update_airtable": "airtable",
+    "delete_airtable_record": "airtable",
+    "fetch_records_from_airtable": "airtable",
+    "post_airtable_records": "airtable",
+    "update_followers_field": "airtable",
+    "update_airtable_records": "airtable",
+    "load_env_variables": "config",
+    "get_settings": "config",
+    "setup_logging": "logging_setup",
+    "load_user_details": "user_data",
+    "save_user_details": "user_data",
+    "update_user_details": "user_data",
+    "get_user_details": "user_data",
+    "send_to_webhook": "webhook",
+}
 
-from .config import load_env_variables
-from .logging_setup import setup_logging
-from .user_data import (
-    load_user_details,
-    save_user_details,
-    update_user_details,
-    get_user_details,
-)
-from .webhook import send_to_webhook
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
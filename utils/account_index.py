@@ -0,0 +1,297 @@
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableMapping, Set
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+EMPTY = -1  # Unused hash table slot
+
+# Handle states
+DELETED = 0
+LIVE = 1
+SUPERSEDED = 2  # Username moved to a newer record id; the old id still resolves
+
+
+def sorted_handles(handles: Iterable[int]) -> array:
+    """Unique handles as a sorted array, ready for the set operations below."""
+    return array("q", sorted(set(handles)))
+
+
+def difference(a: array, b: array) -> array:
+    """Handles in sorted array a but not in sorted array b."""
+    result = array("q")
+    j, len_b = 0, len(b)
+    for handle in a:
+        while j < len_b and b[j] < handle:
+            j += 1
+        if j == len_b or b[j] != handle:
+            result.append(handle)
+    return result
+
+
+def intersection(a: array, b: array) -> array:
+    """Handles in both sorted arrays."""
+    result = array("q")
+    i = j = 0
+    while i < len(a) and j < len(b):
+        if a[i] < b[j]:
+            i += 1
+        elif a[i] > b[j]:
+            j += 1
+        else:
+            result.append(a[i])
+            i += 1
+            j += 1
+    return result
+
+
+def union(a: array, b: array) -> array:
+    """Handles in either sorted array."""
+    result = array("q")
+    i = j = 0
+    while i < len(a) and j < len(b):
+        if a[i] < b[j]:
+            result.append(a[i])
+            i += 1
+        elif a[i] > b[j]:
+            result.append(b[j])
+            j += 1
+        else:
+            result.append(a[i])
+            i += 1
+            j += 1
+    result.extend(a[i:])
+    result.extend(b[j:])
+    return result
+
+
+class _Column:
+    """Append-only strings packed into one buffer, addressed by handle."""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array("q", [0])
+
+    def append(self, value: bytes) -> None:
+        self.data += value
+        self.offsets.append(len(self.data))
+
+    def get(self, handle: int) -> bytes:
+        return bytes(self.data[self.offsets[handle] : self.offsets[handle + 1]])
+
+
+class AccountIndex(MutableMapping):
+    """
+    Bidirectional index of Account usernames and record ids.
+
+    Behaves as a username -> record id mapping, so it can stand in for the
+    plain accounts dict, and answers record id -> username lookups through
+    username_for(). Every account gets an integer handle. Usernames and
+    record ids are stored once, packed into two byte buffers, and each
+    direction is an open-addressing hash table of handles in an array.
+    An account costs about 80 bytes (some 41 MB at 500k accounts), most of
+    it in the two tables, which are kept at most half full; the two dicts
+    this replaces took about twice that with their strings. In exchange,
+    building the index is several times slower than building dicts. Sets of
+    accounts (e.g. a follower's existing follows) can be held as sorted
+    handle arrays, combined with difference(), intersection() and union(),
+    and tested for usernames through handle_set().
+
+    If a username is given a new record id, the old id keeps resolving to
+    the username, since Airtable can hold duplicate rows for one account.
+    """
+
+    def __init__(self, items: Iterable[Tuple[str, str]] = ()):
+        self._names = _Column()
+        self._ids = _Column()
+        self._state = bytearray()
+        self._name_table = array("q", [EMPTY] * 8)
+        self._id_table = array("q", [EMPTY] * 8)
+        self._name_slots_used = 0
+        self._id_slots_used = 0
+        self._live = 0
+        for username, record_id in items:
+            self[username] = record_id
+
+    # Hash tables
+
+    def _find(self, table: array, column: _Column, key: bytes, states) -> int:
+        """Handle whose column value equals key and whose state is in states."""
+        state, data, offsets = self._state, column.data, column.offsets
+        size = len(key)
+        mask = len(table) - 1
+        slot = hash(key) & mask
+        while True:
+            handle = table[slot]
+            if handle == EMPTY:
+                return EMPTY
+            start = offsets[handle]
+            if (
+                offsets[handle + 1] - start == size
+                and state[handle] in states
+                and data[start : start + size] == key
+            ):
+                return handle
+            slot = (slot + 1) & mask
+
+    def _insert(self, table: array, key: bytes, handle: int) -> None:
+        mask = len(table) - 1
+        slot = hash(key) & mask
+        while table[slot] != EMPTY:
+            slot = (slot + 1) & mask
+        table[slot] = handle
+
+    def _grow(self) -> None:
+        """Double both tables once they are half full, dropping deleted handles."""
+        if 2 * (self._name_slots_used + 1) > len(self._name_table):
+            size = max(8, 4 * self._live)
+            self._name_table = array("q", [EMPTY] * (1 << (size - 1).bit_length()))
+            self._name_slots_used = 0
+            for handle, state in enumerate(self._state):
+                if state == LIVE:
+                    self._insert(self._name_table, self._names.get(handle), handle)
+                    self._name_slots_used += 1
+        if 2 * (self._id_slots_used + 1) > len(self._id_table):
+            kept = [h for h, state in enumerate(self._state) if state != DELETED]
+            size = max(8, 4 * len(kept))
+            self._id_table = array("q", [EMPTY] * (1 << (size - 1).bit_length()))
+            for handle in kept:
+                self._insert(self._id_table, self._ids.get(handle), handle)
+            self._id_slots_used = len(kept)
+
+    def _live_handle(self, username: str) -> int:
+        return self._find(self._name_table, self._names, username.encode(), (LIVE,))
+
+    def _id_handle(self, record_id: str) -> int:
+        """Live handle for a record id, following superseded ids to their username."""
+        handle = self._find(
+            self._id_table, self._ids, record_id.encode(), (LIVE, SUPERSEDED)
+        )
+        if handle != EMPTY and self._state[handle] == SUPERSEDED:
+            return self._find(
+                self._name_table, self._names, self._names.get(handle), (LIVE,)
+            )
+        return handle
+
+    # Mapping interface: username -> record id
+
+    def __getitem__(self, username: str) -> str:
+        handle = self._live_handle(username)
+        if handle == EMPTY:
+            raise KeyError(username)
+        return self._ids.get(handle).decode()
+
+    def __setitem__(self, username: str, record_id: str) -> None:
+        handle = self._live_handle(username)
+        if handle != EMPTY:
+            if self._ids.get(handle) == record_id.encode():
+                return
+            self._state[handle] = SUPERSEDED
+            self._live -= 1
+
+        self._grow()
+        handle = len(self._state)
+        name, rid = username.encode(), record_id.encode()
+        self._names.append(name)
+        self._ids.append(rid)
+        self._state.append(LIVE)
+        self._insert(self._name_table, name, handle)
+        self._insert(self._id_table, rid, handle)
+        self._name_slots_used += 1
+        self._id_slots_used += 1
+        self._live += 1
+
+    def __delitem__(self, username: str) -> None:
+        handle = self._live_handle(username)
+        if handle == EMPTY:
+            raise KeyError(username)
+        self._state[handle] = DELETED
+        self._live -= 1
+
+    def __iter__(self) -> Iterator[str]:
+        for handle in range(len(self._state)):
+            if self._state[handle] == LIVE:
+                yield self._names.get(handle).decode()
+
+    def __len__(self) -> int:
+        return self._live
+
+    def __contains__(self, username: object) -> bool:
+        return isinstance(username, str) and self._live_handle(username) != EMPTY
+
+    def get(self, username: str, default: Optional[str] = None) -> Optional[str]:
+        handle = self._live_handle(username)
+        return default if handle == EMPTY else self._ids.get(handle).decode()
+
+    # Record id lookups and handles
+
+    def username_for(self, record_id: str) -> Optional[str]:
+        """Username of an Account record id, or None if unknown."""
+        handle = self._id_handle(record_id)
+        return None if handle == EMPTY else self._names.get(handle).decode()
+
+    def handle(self, username: str) -> Optional[int]:
+        handle = self._live_handle(username)
+        return None if handle == EMPTY else handle
+
+    def handle_for_record_id(self, record_id: str) -> Optional[int]:
+        handle = self._id_handle(record_id)
+        return None if handle == EMPTY else handle
+
+    def handles(self, usernames: Iterable[str]) -> array:
+        """Sorted handles of the known usernames; unknown ones are skipped."""
+        return sorted_handles(
+            handle
+            for username in usernames
+            if (handle := self._live_handle(username)) != EMPTY
+        )
+
+    def handles_for_record_ids(self, record_ids: Iterable[str]) -> array:
+        """Sorted handles of the known record ids; unknown ones are skipped."""
+        return sorted_handles(
+            handle
+            for record_id in record_ids
+            if (handle := self._id_handle(record_id)) != EMPTY
+        )
+
+    def handle_set(self, handles: array) -> "HandleSet":
+        """A read-only set of usernames backed by a sorted handle array."""
+        return HandleSet(self, handles)
+
+    def usernames(self, handles: Iterable[int]) -> List[str]:
+        return [self._names.get(handle).decode() for handle in handles]
+
+    def record_ids(self, handles: Iterable[int]) -> List[str]:
+        return [self._ids.get(handle).decode() for handle in handles]
+
+
+class HandleSet(Set):
+    """
+    Usernames of a sorted handle array, without building a string per account.
+
+    A membership test costs one index lookup and a binary search, so it
+    suits callers that test a few usernames against a large set, such as a
+    Following scan checking what it saw against the stored follows.
+    """
+
+    def __init__(self, index: AccountIndex, handles: array):
+        self._index = index
+        self.handles = handles
+
+    @classmethod
+    def _from_iterable(cls, iterable):
+        return set(iterable)
+
+    def __contains__(self, username: object) -> bool:
+        if not isinstance(username, str):
+            return False
+        handle = self._index.handle(username)
+        if handle is None:
+            return False
+        i = bisect_left(self.handles, handle)
+        return i < len(self.handles) and self.handles[i] == handle
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index.usernames(self.handles))
+
+    def __len__(self) -> int:
+        return len(self.handles)
@@ -1,26 +1,34 @@
 import logging
-import requests
 import json
 from typing import Dict, List, Any, Optional, Set
-from utils.config import load_env_variables
+from utils.config import get_settings
+from utils.lazy import lazy_import
+from utils import run_report
+from utils.concurrency import get_limiter
 from datetime import datetime
 import time
 import os
 import pickle
 
+requests = lazy_import("requests")
+
 logger = logging.getLogger(__name__)
 
-# Load environment variables once at module level
-env_vars = load_env_variables()
-BASE_ID = env_vars["airtable_base_id"]
-AIRTABLE_API_KEY = env_vars["airtable_token"]
-AIRTABLE_ACCOUNTS_TABLE = env_vars["airtable_accounts_table"]
-AIRTABLE_FOLLOWERS_TABLE = env_vars["airtable_followers_table"]
-# Common headers used across functions
-AIRTABLE_HEADERS = {
-    "Authorization": "Bearer " + AIRTABLE_API_KEY,
-    "Content-Type": "application/json",
-}
+
+
+def airtable_url(table_id: str, record_id: Optional[str] = None) -> str:
+    """REST URL of a table in the configured base, or of one of its records."""
+    url = f"https://api.airtable.com/v0/{get_settings().airtable_base_id}/{table_id}"
+    return f"{url}/{record_id}" if record_id else url
+
+
+def airtable_headers() -> Dict[str, str]:
+    """Common headers used across functions."""
+    return {
+        "Authorization": f"Bearer {get_settings().airtable_token}",
+        "Content-Type": "application/json",
+    }
+
 
 # Cache settings
 CACHE_DIR = ".cache"
@@ -90,7 +98,9 @@ def fetch_accounts_by_usernames(
         formula = f"OR({formula})"
 
     new_accounts = {}
-    records = fetch_records_from_airtable(AIRTABLE_ACCOUNTS_TABLE, headers, formula)
+    records = fetch_records_from_airtable(
+        get_settings().airtable_accounts_table, headers, formula
+    )
 
     for record in records:
         username = record["fields"].get("Username", "").lower()
@@ -144,7 +154,7 @@ def fetch_and_update_accounts(
             batch = records_to_upsert[i : i + 10]
             try:
                 response = requests.post(
-                    f"https://api.airtable.com/v0/{BASE_ID}/{AIRTABLE_ACCOUNTS_TABLE}",
+                    airtable_url(get_settings().airtable_accounts_table),
                     headers=headers,
                     json={
                         "performUpsert": {"fieldsToMergeOn": ["Username"]},
@@ -189,11 +199,13 @@ def fetch_and_update_accounts(
 def airtable_api_request(
     method, table_id, headers, data=None, record_id=None, params=None
 ):
-    url = f"https://api.airtable.com/v0/{BASE_ID}/{table_id}"
-    if record_id:
-        url += f"/{record_id}"
+    url = airtable_url(table_id, record_id)
 
-    response = requests.request(method, url, headers=headers, json=data, params=params)
+    with get_limiter("airtable").slot() as slot:
+        response = requests.request(
+            method, url, headers=headers, json=data, params=params
+        )
+        slot.record_status(response.status_code)
 
     if response.status_code in [200, 201]:
         return response.json()
@@ -222,6 +234,15 @@ def fetch_records_from_airtable(
     Returns:
         List of record dictionaries from Airtable
     """
+    with run_report.phase("airtable_fetch_records"):
+        records = _fetch_all_pages(table_id, headers, formula)
+    run_report.count("airtable_records_fetched", len(records))
+    return records
+
+
+def _fetch_all_pages(
+    table_id: str, headers: Dict[str, str], formula: Optional[str]
+) -> List[Dict[str, Any]]:
     records = []
     offset = None
 
@@ -266,7 +287,10 @@ def post_airtable_records(records, table_id, headers):
 
 def update_followers_field(follow_record_id, follower_record_id, headers):
     data = airtable_api_request(
-        "GET", AIRTABLE_ACCOUNTS_TABLE, headers, record_id=follow_record_id
+        "GET",
+        get_settings().airtable_accounts_table,
+        headers,
+        record_id=follow_record_id,
     )
     if not data:
         logger.error(
@@ -280,7 +304,7 @@ def update_followers_field(follow_record_id, follower_record_id, headers):
         update_payload = {"fields": {"Followers": followers}}
         airtable_api_request(
             "PATCH",
-            AIRTABLE_ACCOUNTS_TABLE,
+            get_settings().airtable_accounts_table,
             headers,
             data=update_payload,
             record_id=follow_record_id,
@@ -389,7 +413,7 @@ def update_airtable(records_to_update: List[Dict], headers: Dict[str, str]) -> b
         batch = records_to_update[i : i + 10]
         try:
             response = requests.patch(
-                f"https://api.airtable.com/v0/{BASE_ID}/{AIRTABLE_ACCOUNTS_TABLE}",
+                airtable_url(get_settings().airtable_accounts_table),
                 headers=headers,
                 json={"records": batch},
             )
@@ -420,12 +444,10 @@ def update_airtable(records_to_update: List[Dict], headers: Dict[str, str]) -> b
 
 
 def delete_airtable_record(record_id: str) -> None:
-    endpoint = (
-        f"https://api.airtable.com/v0/{BASE_ID}/{AIRTABLE_ACCOUNTS_TABLE}/{record_id}"
-    )
+    endpoint = airtable_url(get_settings().airtable_accounts_table, record_id)
 
     try:
-        response = requests.delete(endpoint, headers=AIRTABLE_HEADERS)
+        response = requests.delete(endpoint, headers=airtable_headers())
         response.raise_for_status()
         logger.info(f"Successfully deleted record {record_id} from Airtable.")
     except requests.exceptions.HTTPError as http_err:
@@ -481,7 +503,7 @@ def fetch_existing_follows(
     """
     try:
         response = requests.get(
-            f"https://api.airtable.com/v0/{BASE_ID}/{AIRTABLE_FOLLOWERS_TABLE}/{record_id}",
+            airtable_url(get_settings().airtable_followers_table, record_id),
             headers=headers,
         )
         response.raise_for_status()
@@ -0,0 +1,129 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+BASE_COOLDOWN = 60.0  # First back-off after a rate-limit or error page
+MAX_COOLDOWN = 15 * 60.0
+PROBE_TIMEOUT = 120.0  # A probe that never reports back frees the slot after this
+POLL_SECONDS = 1.0  # How often waiting scrapers recheck the breaker
+
+
+class CircuitBreaker:
+    """
+    One back-off shared by every scraper that talks to the same site.
+
+    Any scraper that lands on a rate-limit or error page calls trip(), which
+    opens the breaker for the current cool-down. Every scraper calls wait()
+    before navigating, so while it is open the whole fleet pauses instead of
+    each driver finding the block on its own. Once the cool-down is over a
+    single caller is let through as a probe (half-open): success() closes
+    the breaker for everyone, another trip() reopens it with the cool-down
+    doubled, up to max_cooldown. Trips while already open are ignored, so a
+    fleet that hits the same block backs off once.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        base_cooldown: float = BASE_COOLDOWN,
+        max_cooldown: float = MAX_COOLDOWN,
+        probe_timeout: float = PROBE_TIMEOUT,
+        clock: Optional[Callable[[], float]] = None,
+        sleep: Optional[Callable[[float], None]] = None,
+    ):
+        self.name = name
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.probe_timeout = probe_timeout
+        self._clock = clock or time.monotonic
+        self._sleep = sleep or time.sleep
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.cooldown = base_cooldown
+        self.open_until = 0.0
+        self.probe_started = 0.0
+        self.trips = 0
+
+    def trip(self, reason: str = "") -> None:
+        """Open the breaker; a failed probe doubles the cool-down."""
+        with self._lock:
+            now = self._clock()
+            if self.state == OPEN:
+                return
+            if self.state == HALF_OPEN:
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            self.state = OPEN
+            self.open_until = now + self.cooldown
+            self.trips += 1
+        logger.warning(
+            f"{self.name} circuit open for {self.cooldown:.0f}s"
+            + (f": {reason}" if reason else "")
+        )
+
+    def success(self) -> None:
+        """A request went through; a successful probe closes the breaker."""
+        with self._lock:
+            if self.state != HALF_OPEN:
+                return
+            self.state = CLOSED
+            self.cooldown = self.base_cooldown
+        logger.info(f"{self.name} circuit closed, resuming")
+
+    def allow(self) -> bool:
+        """Whether the caller may go ahead now, becoming the probe if due."""
+        with self._lock:
+            now = self._clock()
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if now < self.open_until:
+                    return False
+                self.state = HALF_OPEN
+                self.probe_started = now
+                return True
+            # Half-open: the probe is out; let another through if it got lost
+            if now - self.probe_started >= self.probe_timeout:
+                self.probe_started = now
+                return True
+            return False
+
+    def wait(self) -> float:
+        """Block until allow() lets the caller through. Returns seconds waited."""
+        started = self._clock()
+        while not self.allow():
+            with self._lock:
+                if self.state == OPEN:
+                    delay = self.open_until - self._clock()
+                else:
+                    delay = POLL_SECONDS
+            self._sleep(max(0.0, min(delay, POLL_SECONDS)))
+        return self._clock() - started
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "cooldown": self.cooldown,
+                "open_for": max(0.0, round(self.open_until - self._clock(), 1)),
+                "trips": self.trips,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(name: str, **options: Any) -> CircuitBreaker:
+    """The process-wide breaker for a site, created on first use."""
+    with _registry_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name, **options)
+        return breaker
@@ -0,0 +1,289 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Outcomes of one call through a limiter
+OK = "ok"
+OVERLOAD = "overload"  # 429, 503 or a timeout: the downstream wants less load
+ERROR = "error"  # Any other failure
+CANCELLED = "cancelled"  # No signal either way
+
+LATENCY_SMOOTHING = 0.2  # Weight of the newest call in the latency average
+ERROR_SMOOTHING = 0.1  # Weight of the newest call in the error rate
+ERROR_RATE_LIMIT = 0.25  # Back off once a quarter of recent calls fail
+
+# Starting point, floor and ceiling per downstream, plus the latency above
+# which a call counts as a sign of overload (None to ignore latency)
+LIMITER_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "airtable": dict(initial=3, min_limit=1, max_limit=5, latency_target=2.0),
+    "nitter": dict(initial=2, min_limit=1, max_limit=6, latency_target=5.0),
+    "twitter_api": dict(initial=2, min_limit=1, max_limit=5, latency_target=3.0),
+    "openai": dict(initial=5, min_limit=1, max_limit=10, latency_target=None),
+    "ollama": dict(initial=2, min_limit=1, max_limit=5, latency_target=None),
+    "browser": dict(initial=2, min_limit=1, max_limit=2, latency_target=None),
+}
+
+
+def is_overload(exc: BaseException) -> bool:
+    """Whether an exception means the downstream is overloaded (429 or timeout)."""
+    if isinstance(exc, (TimeoutError, asyncio.TimeoutError)):
+        return True
+    name = type(exc).__name__
+    if "Timeout" in name or "RateLimit" in name:
+        return True
+    status = getattr(exc, "status", None) or getattr(
+        getattr(exc, "response", None), "status_code", None
+    )
+    return status in (429, 503)
+
+
+class Slot:
+    """
+    One call through a limiter, used as `with` from threads or `async with`
+    from coroutines.
+
+    The call counts as healthy unless it raises or is marked with
+    record_status(), overloaded() or failed().
+    """
+
+    def __init__(self, limiter: "AdaptiveLimiter"):
+        self.limiter = limiter
+        self.outcome: Optional[str] = None
+        self.started = 0.0
+
+    def overloaded(self) -> None:
+        self.outcome = OVERLOAD
+
+    def failed(self) -> None:
+        self.outcome = ERROR
+
+    def record_status(self, status: int) -> None:
+        """Mark the call from an HTTP status code."""
+        if status in (429, 503):
+            self.overloaded()
+        elif status >= 500:
+            self.failed()
+
+    def _finish(self, exc: Optional[BaseException]) -> None:
+        outcome = self.outcome
+        if exc is not None and outcome is None:
+            if not isinstance(exc, Exception):
+                outcome = CANCELLED
+            else:
+                outcome = OVERLOAD if is_overload(exc) else ERROR
+        self.limiter.release(outcome or OK, self.started)
+
+    def __enter__(self) -> "Slot":
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self.limiter.acquire()
+        else:
+            # Blocking the event loop here could wait forever on slots held
+            # by coroutines of the same loop, so the call only reports back
+            self.limiter.acquire(wait=False)
+        self.started = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self._finish(exc)
+        return False
+
+    async def __aenter__(self) -> "Slot":
+        await self.limiter.acquire_async()
+        self.started = time.monotonic()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        self._finish(exc)
+        return False
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit for one downstream, adjusted by additive increase /
+    multiplicative decrease.
+
+    Every `limit` healthy calls raise the limit by one, up to max_limit. A
+    429, 503 or timeout, a call slower than latency_target, or an error rate
+    above ERROR_RATE_LIMIT multiplies it by `backoff`, down to min_limit.
+    Calls that started before the last decrease cannot decrease it again,
+    so one burst of failures backs off once. Threads and coroutines share
+    the same limit.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial: int = 2,
+        min_limit: int = 1,
+        max_limit: int = 10,
+        latency_target: Optional[float] = None,
+        backoff: float = 0.5,
+    ):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.limit = max(min_limit, min(initial, max_limit))
+        self.in_flight = 0
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self.completed = 0
+        self.overloads = 0
+        self._healthy_in_window = 0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._async_waiters: List[
+            Tuple[asyncio.AbstractEventLoop, asyncio.Future]
+        ] = []
+
+    def slot(self) -> Slot:
+        return Slot(self)
+
+    def set_max_limit(self, max_limit: int) -> None:
+        """Change the ceiling, e.g. to the number of browsers actually started."""
+        with self._lock:
+            self.max_limit = max(self.min_limit, max_limit)
+            self.limit = min(self.limit, self.max_limit)
+            self._wake()
+
+    def acquire(self, wait: bool = True) -> None:
+        """Block the calling thread until a slot is free, or take one anyway."""
+        with self._available:
+            while wait and self.in_flight >= self.limit:
+                self._available.wait()
+            self.in_flight += 1
+
+    async def acquire_async(self) -> None:
+        """Wait in the event loop until a slot is free."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self.in_flight < self.limit:
+                    self.in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._lock:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+                    else:
+                        # We were woken for a free slot; pass it on
+                        self._wake()
+                raise
+
+    def release(self, outcome: str, started: float) -> None:
+        """Free a slot and adjust the limit from how the call went."""
+        now = time.monotonic()
+        with self._lock:
+            self.in_flight -= 1
+            if outcome != CANCELLED:
+                self._record(outcome, now - started, started, now)
+            self._wake()
+
+    def _record(
+        self, outcome: str, latency: float, started: float, now: float
+    ) -> None:
+        self.completed += 1
+        self.latency += LATENCY_SMOOTHING * (latency - self.latency)
+        failed = outcome != OK
+        self.error_rate += ERROR_SMOOTHING * (failed - self.error_rate)
+
+        slow = self.latency_target is not None and latency > self.latency_target
+        erroring = failed and self.error_rate > ERROR_RATE_LIMIT
+        if outcome == OVERLOAD or slow or erroring:
+            if outcome == OVERLOAD:
+                self.overloads += 1
+            if started >= self._last_decrease:
+                old = self.limit
+                self.limit = max(self.min_limit, int(self.limit * self.backoff))
+                self._last_decrease = now
+                self._healthy_in_window = 0
+                if self.limit != old:
+                    reason = "slow call" if outcome == OK else outcome
+                    logger.info(
+                        f"Limiter {self.name}: {old} -> {self.limit} after {reason}"
+                    )
+            return
+
+        if outcome == OK:
+            self._healthy_in_window += 1
+            if self._healthy_in_window >= self.limit:
+                self._healthy_in_window = 0
+                if self.limit < self.max_limit:
+                    self.limit += 1
+                    logger.debug(f"Limiter {self.name}: raised to {self.limit}")
+
+    def _wake(self) -> None:
+        """Wake as many waiting threads and coroutines as there are free slots."""
+        free = self.limit - self.in_flight
+        if free <= 0:
+            return
+        self._available.notify(free)
+        while free > 0 and self._async_waiters:
+            loop, waiter = self._async_waiters.pop(0)
+            try:
+                loop.call_soon_threadsafe(_resolve, waiter)
+            except RuntimeError:  # The waiter's event loop is closed
+                continue
+            free -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "latency_ms": round(self.latency * 1000, 1),
+                "error_rate": round(self.error_rate, 3),
+                "overloads": self.overloads,
+                "completed": self.completed,
+            }
+
+
+def _resolve(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+_limiters: Dict[str, AdaptiveLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def get_limiter(name: str, **overrides) -> AdaptiveLimiter:
+    """
+    The process-wide limiter for a downstream, created on first use from
+    LIMITER_DEFAULTS and any overrides.
+    """
+    with _registry_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            options = {**LIMITER_DEFAULTS.get(name, {}), **overrides}
+            limiter = _limiters[name] = AdaptiveLimiter(name, **options)
+        return limiter
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """Current state of every limiter, for logs and run reports."""
+    with _registry_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.snapshot() for limiter in limiters}
+
+
+def summary() -> str:
+    """One log line with every limiter's limit and load."""
+    return ", ".join(
+        f"{name}={state['limit']} ({state['in_flight']} busy)"
+        for name, state in snapshot().items()
+    )
@@ -1,51 +1,116 @@
 import os
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
 from dotenv import load_dotenv
-import logging
 
+# Resources the scraping browsers do not download, per page type
+DEFAULT_BLOCK_RESOURCES = (
+    "following=images,video,fonts,analytics;profile=images,video,fonts,analytics"
+)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Configuration read from the environment and .env, created once per process."""
 
-def load_env_variables():
-    logging.info(f"Current working directory: {os.getcwd()}")
+    openai_api_key: Optional[str] = None
+    twitter_api_key: Optional[str] = None
+    twitter_api_secret: Optional[str] = None
+    twitter_bearer_token: Optional[str] = None
+    twitter_access_token: Optional[str] = None
+    twitter_access_token_secret: Optional[str] = None
+    client_id: Optional[str] = None
+    client_secret: Optional[str] = None
+    list_id: Optional[str] = None
+    cookie_path: Optional[str] = None
+    airtable_base_id: Optional[str] = None
+    airtable_token: Optional[str] = None
+    airtable_followers_table: Optional[str] = None
+    airtable_accounts_table: Optional[str] = None
+    airtable_api_endpoint: Optional[str] = None
+    airtable_batch_size: int = 10
+    airtable_rate_limit: int = 5
+    driver_memory_budget_mb: int = 1500
+    host_memory_limit_percent: float = 85.0
+    notion_token: Optional[str] = None
+    field_username: Optional[str] = None
+    field_account: Optional[str] = None
+    field_account_id: Optional[str] = None
+    field_followed_accounts: Optional[str] = None
+    lock_file: Optional[str] = None
+    tracking_lease_db: Optional[str] = None
+    tracking_revisit_minutes: int = 120
+    follow_log_db: Optional[str] = None
+    follow_event_stream: Optional[str] = None
+    following_capture: str = "dom"
+    following_sources: str = "selenium=1,api=3"
+    # None: one API worker only when no Selenium drivers are started
+    api_workers: Optional[int] = None
+    block_resources: str = DEFAULT_BLOCK_RESOURCES
+    profile_template_dir: Optional[str] = None
+    playwright_contexts: int = 4
+    scroll_min_dwell: float = 1.0
+    scroll_max_dwell: float = 6.0
+    venv_path: Optional[str] = None
+    log_file: Optional[str] = None
 
-    # Print all environment variables before loading .env
-    logging.debug("Environment variables before loading .env:")
-    for key, value in os.environ.items():
-        if "AIRTABLE" in key:
-            logging.debug(f"{key}: {value}")
 
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """
+    The process-wide settings.
+
+    .env is read on the first call only; variables already set in the
+    environment take precedence over it.
+    """
     load_dotenv()
-    logging.info("Environment variables loaded from .env file")
-
-    # Print all environment variables after loading .env
-    logging.debug("Environment variables after loading .env:")
-    for key, value in os.environ.items():
-        if "AIRTABLE" in key:
-            logging.debug(f"{key}: {value}")
-
-    env_vars = {
-        "openai_api_key": os.getenv("OPENAI_API_KEY"),
-        "twitter_api_key": os.getenv("TWITTER_API_KEY"),
-        "twitter_api_secret": os.getenv("TWITTER_API_SECRET"),
-        "twitter_bearer_token": os.getenv("TWITTER_BEARER_TOKEN"),
-        "twitter_access_token": os.getenv("TWITTER_ACCESS_TOKEN"),
-        "twitter_access_token_secret": os.getenv("TWITTER_ACCESS_TOKEN_SECRET"),
-        "client_id": os.getenv("CLIENT_ID"),
-        "client_secret": os.getenv("CLIENT_SECRET"),
-        "list_id": os.getenv("LIST_ID"),
-        "cookie_path": os.getenv("COOKIE_PATH"),
-        "airtable_base_id": os.getenv("AIRTABLE_BASE_ID"),
-        "airtable_token": os.getenv("AIRTABLE_TOKEN"),
-        "airtable_followers_table": os.getenv("AIRTABLE_FOLLOWERS_TABLE"),
-        "airtable_accounts_table": os.getenv("AIRTABLE_ACCOUNTS_TABLE"),
-        "airtable_api_endpoint": os.getenv("AIRTABLE_API_ENDPOINT"),
-        "airtable_batch_size": int(os.getenv("AIRTABLE_BATCH_SIZE", 10)),
-        "airtable_rate_limit": int(os.getenv("AIRTABLE_RATE_LIMIT", 5)),
-        "notion_token": os.getenv("NOTION_TOKEN"),
-        "field_username": os.getenv("FIELD_USERNAME"),
-        "field_account": os.getenv("FIELD_ACCOUNT"),
-        "field_account_id": os.getenv("FIELD_ACCOUNT_ID"),
-        "field_followed_accounts": os.getenv("FIELD_FOLLOWED_ACCOUNTS"),
-        "lock_file": os.getenv("LOCK_FILE"),
-        "venv_path": os.getenv("VENV_PATH"),
-        "log_file": os.getenv("LOG_FILE"),
-    }
-    return env_vars
+    return Settings(
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        twitter_api_key=os.getenv("TWITTER_API_KEY"),
+        twitter_api_secret=os.getenv("TWITTER_API_SECRET"),
+        twitter_bearer_token=os.getenv("TWITTER_BEARER_TOKEN"),
+        twitter_access_token=os.getenv("TWITTER_ACCESS_TOKEN"),
+        twitter_access_token_secret=os.getenv("TWITTER_ACCESS_TOKEN_SECRET"),
+        client_id=os.getenv("CLIENT_ID"),
+        client_secret=os.getenv("CLIENT_SECRET"),
+        list_id=os.getenv("LIST_ID"),
+        cookie_path=os.getenv("COOKIE_PATH"),
+        airtable_base_id=os.getenv("AIRTABLE_BASE_ID"),
+        airtable_token=os.getenv("AIRTABLE_TOKEN"),
+        airtable_followers_table=os.getenv("AIRTABLE_FOLLOWERS_TABLE"),
+        airtable_accounts_table=os.getenv("AIRTABLE_ACCOUNTS_TABLE"),
+        airtable_api_endpoint=os.getenv("AIRTABLE_API_ENDPOINT"),
+        airtable_batch_size=int(os.getenv("AIRTABLE_BATCH_SIZE", 10)),
+        airtable_rate_limit=int(os.getenv("AIRTABLE_RATE_LIMIT", 5)),
+        driver_memory_budget_mb=int(os.getenv("DRIVER_MEMORY_BUDGET_MB", 1500)),
+        host_memory_limit_percent=float(os.getenv("HOST_MEMORY_LIMIT_PERCENT", 85)),
+        notion_token=os.getenv("NOTION_TOKEN"),
+        field_username=os.getenv("FIELD_USERNAME"),
+        field_account=os.getenv("FIELD_ACCOUNT"),
+        field_account_id=os.getenv("FIELD_ACCOUNT_ID"),
+        field_followed_accounts=os.getenv("FIELD_FOLLOWED_ACCOUNTS"),
+        lock_file=os.getenv("LOCK_FILE"),
+        tracking_lease_db=os.getenv("TRACKING_LEASE_DB"),
+        tracking_revisit_minutes=int(os.getenv("TRACKING_REVISIT_MINUTES", 120)),
+        follow_log_db=os.getenv("FOLLOW_LOG_DB"),
+        follow_event_stream=os.getenv("FOLLOW_EVENT_STREAM"),
+        following_capture=os.getenv("FOLLOWING_CAPTURE", "dom").lower(),
+        following_sources=os.getenv("FOLLOWING_SOURCES", "selenium=1,api=3"),
+        api_workers=(
+            int(os.environ["API_WORKERS"]) if os.getenv("API_WORKERS") else None
+        ),
+        block_resources=os.getenv("BLOCK_RESOURCES", DEFAULT_BLOCK_RESOURCES),
+        profile_template_dir=os.getenv("PROFILE_TEMPLATE_DIR") or None,
+        playwright_contexts=int(os.getenv("PLAYWRIGHT_CONTEXTS", 4)),
+        scroll_min_dwell=float(os.getenv("SCROLL_MIN_DWELL_SECONDS", 1.0)),
+        scroll_max_dwell=float(os.getenv("SCROLL_MAX_DWELL_SECONDS", 6.0)),
+        venv_path=os.getenv("VENV_PATH"),
+        log_file=os.getenv("LOG_FILE"),
+    )
+
+
+def load_env_variables() -> Dict[str, Any]:
+    """The settings as a plain dict, for code written before get_settings()."""
+    return asdict(get_settings())
@@ -0,0 +1,186 @@
+import json
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ROTATE_BYTES = 10 * 1024 * 1024  # Same rotation as logs/main.log
+ROTATE_BACKUPS = 5
+SOCKET_TIMEOUT = 2.0  # Seconds a slow consumer may hold up one send
+RECONNECT_SECONDS = 30.0  # Wait before trying a lost socket again
+
+
+class NoConsumer(Exception):
+    """Nobody is listening; the events are dropped without another warning."""
+
+
+class EventStream(ABC):
+    """
+    Line-delimited JSON output of follow events.
+
+    emit() writes one JSON object per line and flushes, so a consumer sees a
+    follower's events as soon as they are emitted. Sinks never raise: a
+    failed write is logged and the events are dropped.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.emitted = 0
+        self.dropped = 0
+
+    def emit(self, events: List[Dict[str, Any]]) -> None:
+        if not events:
+            return
+        data = "".join(
+            json.dumps(event, separators=(",", ":")) + "\n" for event in events
+        )
+        with self._lock:
+            try:
+                self._write(data)
+                self.emitted += len(events)
+            except NoConsumer:
+                self.dropped += len(events)
+            except Exception as e:
+                self.dropped += len(events)
+                logger.warning(f"Dropped {len(events)} follow events: {str(e)}")
+
+    @abstractmethod
+    def _write(self, data: str) -> None:
+        """Write data, one or more complete lines, and flush it."""
+
+    def close(self) -> None:
+        pass
+
+
+class StdoutStream(EventStream):
+    def _write(self, data: str) -> None:
+        sys.stdout.write(data)
+        sys.stdout.flush()
+
+
+class RotatingFileStream(EventStream):
+    """Append to a file, rotating it to .1 ... .N once it grows past max_bytes."""
+
+    def __init__(
+        self, path: str, max_bytes: int = ROTATE_BYTES, backups: int = ROTATE_BACKUPS
+    ):
+        super().__init__()
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _rotate(self) -> None:
+        self._file.close()
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _write(self, data: str) -> None:
+        if self._file.tell() and self._file.tell() + len(data) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class UnixSocketStream(EventStream):
+    """
+    Send events to a consumer listening on a Unix stream socket.
+
+    The connection is made on first use and remade after a failure, at most
+    once per RECONNECT_SECONDS. Events emitted while no consumer is
+    listening are dropped rather than buffered.
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._socket: Optional[socket.socket] = None
+        self._retry_at = 0.0
+
+    def _connect(self) -> socket.socket:
+        if time.monotonic() < self._retry_at:
+            raise NoConsumer(self.path)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(SOCKET_TIMEOUT)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            self._retry_at = time.monotonic() + RECONNECT_SECONDS
+            raise
+        logger.info(f"Streaming follow events to {self.path}")
+        return sock
+
+    def _write(self, data: str) -> None:
+        if self._socket is None:
+            self._socket = self._connect()
+        try:
+            self._socket.sendall(data.encode("utf-8"))
+        except OSError:
+            self.close()
+            self._retry_at = time.monotonic() + RECONNECT_SECONDS
+            raise
+
+    def close(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+
+def open_event_stream(spec: Optional[str]) -> Optional[EventStream]:
+    """
+    The sink described by spec: "stdout", "file:<path>" or "unix:<path>".
+
+    Returns None when spec is empty or not understood.
+    """
+    if not spec:
+        return None
+    kind, _, target = spec.partition(":")
+    try:
+        if kind == "stdout":
+            return StdoutStream()
+        if kind == "file" and target:
+            return RotatingFileStream(target)
+        if kind == "unix" and target:
+            return UnixSocketStream(target)
+    except Exception as e:
+        logger.error(f"Could not open follow event stream {spec}: {str(e)}")
+        return None
+    logger.error(f"Unknown follow event stream {spec!r}, expected stdout, file:, unix:")
+    return None
+
+
+def follow_event(
+    kind: str,
+    follower: str,
+    follower_id: str,
+    account: str,
+    account_id: Optional[str],
+    ts: float,
+) -> Dict[str, Any]:
+    return {
+        "type": kind,
+        "ts": round(ts, 3),
+        "follower": follower,
+        "follower_id": follower_id,
+        "account": account,
+        "account_id": account_id,
+    }
@@ -0,0 +1,128 @@
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+FOLLOW = "follow"
+UNFOLLOW = "unfollow"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS follow_events (
+    seq INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    follower TEXT NOT NULL,
+    account TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS follow_events_ts ON follow_events (ts);
+CREATE INDEX IF NOT EXISTS follow_events_edge ON follow_events (follower, account, ts)
+"""
+
+
+class FollowEvent(NamedTuple):
+    seq: int
+    ts: float
+    kind: str
+    follower: str
+    account: str
+
+
+class FollowLog:
+    """
+    Append-only local log of follow edges as they are discovered.
+
+    Every new (follower, account) edge found by a tracking run is appended
+    with the time it was first seen, and every unfollow found by a full
+    reconcile is appended as an UNFOLLOW event. Rows are never updated, so
+    readers can replay the log from any sequence number or scan a time range
+    without going to Airtable. Several tracker processes may append to the
+    same file; like the lease queue it uses SQLite's rollback journal so it
+    also works on network filesystems.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._transaction() as conn:
+            for statement in SCHEMA.split(";"):
+                conn.execute(statement)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection and hold the write lock for the whole block."""
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def append(
+        self,
+        follower: str,
+        accounts: Iterable[str],
+        kind: str = FOLLOW,
+        ts: Optional[float] = None,
+    ) -> int:
+        """Append one event per account for a follower. Returns the number added."""
+        ts = time.time() if ts is None else ts
+        with self._transaction() as conn:
+            return conn.executemany(
+                "INSERT INTO follow_events (ts, kind, follower, account) "
+                "VALUES (?, ?, ?, ?)",
+                ((ts, kind, follower, account) for account in accounts),
+            ).rowcount
+
+    def _read(self, query: str, params: tuple) -> Iterator[FollowEvent]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            for row in conn.execute(query, params):
+                yield FollowEvent(*row)
+        finally:
+            conn.close()
+
+    def replay(self, after_seq: int = 0) -> Iterator[FollowEvent]:
+        """Every event after the given sequence number, oldest first."""
+        return self._read(
+            "SELECT seq, ts, kind, follower, account FROM follow_events "
+            "WHERE seq > ? ORDER BY seq",
+            (after_seq,),
+        )
+
+    def between(
+        self, start: float, end: float, kind: Optional[str] = None
+    ) -> Iterator[FollowEvent]:
+        """Events with start <= ts < end, oldest first, optionally of one kind."""
+        return self._read(
+            "SELECT seq, ts, kind, follower, account FROM follow_events "
+            "WHERE ts >= ? AND ts < ? AND (? IS NULL OR kind = ?) ORDER BY ts, seq",
+            (start, end, kind, kind),
+        )
+
+    def first_seen(self, follower: str, account: str) -> Optional[float]:
+        """When the follower was first seen following the account, if ever."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            return conn.execute(
+                "SELECT MIN(ts) FROM follow_events "
+                "WHERE follower = ? AND account = ? AND kind = ?",
+                (follower, account, FOLLOW),
+            ).fetchone()[0]
+        finally:
+            conn.close()
+
+    def last_seq(self) -> int:
+        """Sequence number of the newest event, 0 when the log is empty."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            return conn.execute("SELECT MAX(seq) FROM follow_events").fetchone()[0] or 0
+        finally:
+            conn.close()
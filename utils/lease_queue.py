@@ -0,0 +1,165 @@
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leases (
+    key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    owner TEXT,
+    lease_expires REAL NOT NULL DEFAULT 0,
+    completed_at REAL NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS leases_due ON leases (completed_at, key)
+"""
+
+
+class LeaseQueue:
+    """
+    Work queue where workers claim items with expiring leases.
+
+    Any number of processes, on one host or several hosts sharing the
+    directory, can open the same database. A worker claims a few items,
+    renews its leases with heartbeat() while it works and marks each item
+    complete when done. If a worker dies its leases expire and the items
+    become claimable by the others. A completed item becomes due again
+    after revisit_seconds, so the same queue serves every tracking cycle.
+
+    The database uses SQLite's default rollback journal rather than WAL,
+    since WAL needs shared memory and does not work on network filesystems.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        lease_seconds: float = 900,
+        revisit_seconds: float = 7200,
+        retry_seconds: float = 600,
+    ):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.revisit_seconds = revisit_seconds
+        self.retry_seconds = retry_seconds
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._transaction() as conn:
+            for statement in SCHEMA.split(";"):
+                conn.execute(statement)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection and hold the write lock for the whole block."""
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def seed(self, items: Dict[str, str], prune: bool = False) -> None:
+        """
+        Add items (key -> payload) that are not queued yet.
+
+        With prune=True, items missing from `items` are dropped unless a
+        worker currently holds them.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT INTO leases (key, payload) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET payload = excluded.payload",
+                items.items(),
+            )
+            if prune:
+                conn.execute("CREATE TEMP TABLE current_keys (key TEXT PRIMARY KEY)")
+                conn.executemany(
+                    "INSERT INTO current_keys (key) VALUES (?)",
+                    ((key,) for key in items),
+                )
+                removed = conn.execute(
+                    "DELETE FROM leases WHERE key NOT IN (SELECT key FROM current_keys) "
+                    "AND (owner IS NULL OR lease_expires < ?)",
+                    (now,),
+                ).rowcount
+                if removed:
+                    logger.info(f"Dropped {removed} items no longer in the work set")
+
+    def claim(self, owner: str, limit: int = 1) -> List[Tuple[str, str]]:
+        """
+        Lease up to `limit` due items to `owner`.
+
+        An item is due when nobody holds a live lease on it and it has not
+        been completed within the revisit interval. Expired leases from dead
+        workers are reclaimed here.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT key, payload FROM leases "
+                "WHERE lease_expires < ? AND completed_at < ? "
+                "ORDER BY completed_at, key LIMIT ?",
+                (now, now - self.revisit_seconds, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE leases SET owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1 WHERE key = ?",
+                ((owner, now + self.lease_seconds, key) for key, _ in rows),
+            )
+        return rows
+
+    def heartbeat(self, owner: str) -> int:
+        """Extend every lease `owner` holds. Returns the number renewed."""
+        now = time.time()
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE leases SET lease_expires = ? "
+                "WHERE owner = ? AND lease_expires >= ?",
+                (now + self.lease_seconds, owner, now),
+            ).rowcount
+
+    def complete(self, owner: str, key: str) -> None:
+        """Mark an item done until it is due for its next visit."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE leases SET owner = NULL, lease_expires = 0, "
+                "completed_at = ?, attempts = 0 WHERE key = ? AND owner = ?",
+                (time.time(), key, owner),
+            )
+
+    def release(self, owner: str, key: str) -> None:
+        """Give an item back after a failure; it is retried after retry_seconds."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE leases SET owner = NULL, lease_expires = ? "
+                "WHERE key = ? AND owner = ?",
+                (time.time() + self.retry_seconds, key, owner),
+            )
+
+    def release_all(self, owner: str) -> int:
+        """Give back every item `owner` still holds, making them due now."""
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE leases SET owner = NULL, lease_expires = 0 WHERE owner = ?",
+                (owner,),
+            ).rowcount
+
+    def due_count(self) -> int:
+        """Number of items that could be claimed right now."""
+        now = time.time()
+        with self._transaction() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM leases WHERE lease_expires < ? AND completed_at < ?",
+                (now, now - self.revisit_seconds),
+            ).fetchone()[0]
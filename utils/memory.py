@@ -0,0 +1,151 @@
+import asyncio
+import gc
+import logging
+import os
+from typing import Iterable, Optional
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+SAMPLE_SECONDS = 15  # How often monitor() checks host memory
+
+
+def process_tree_rss(pid: int) -> int:
+    """Resident memory in bytes of a process and all of its descendants."""
+    try:
+        root = psutil.Process(pid)
+        processes = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return 0
+
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            # Renderers come and go while we walk the tree
+            continue
+    return total
+
+
+def driver_pid(driver) -> Optional[int]:
+    """PID of the chromedriver process behind a Selenium driver, if known."""
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
+
+class MemoryGovernor:
+    """
+    Keep the tracker inside a memory budget that includes Chrome.
+
+    The Python process RSS is only a small part of a tracking run; most of
+    it lives in the chromedriver/Chrome/renderer processes started for each
+    driver. The governor samples the whole process tree, flags drivers that
+    outgrow their budget so they can be recycled, lowers the number of
+    active browser workers while the host is short on memory, and only runs
+    a full garbage collection when Python memory has actually grown.
+    """
+
+    def __init__(
+        self,
+        driver_budget_mb: int = 1500,
+        host_limit_percent: float = 85.0,
+        host_resume_percent: float = 70.0,
+        gc_growth_mb: int = 100,
+    ):
+        self.driver_budget = driver_budget_mb * MB
+        self.host_limit_percent = host_limit_percent
+        self.host_resume_percent = host_resume_percent
+        self.gc_growth = gc_growth_mb * MB
+        self._allowed_workers: Optional[int] = None
+        self._rss_at_last_collect = self.python_rss()
+
+    def python_rss(self) -> int:
+        return psutil.Process(os.getpid()).memory_info().rss
+
+    def tree_rss(self) -> int:
+        """Resident memory of this process plus every child it started."""
+        return process_tree_rss(os.getpid())
+
+    def driver_rss(self, driver) -> int:
+        pid = driver_pid(driver)
+        return process_tree_rss(pid) if pid else 0
+
+    def driver_over_budget(self, driver) -> bool:
+        """True if the driver's browser processes exceed the per-driver budget."""
+        rss = self.driver_rss(driver)
+        if rss > self.driver_budget:
+            logger.warning(
+                f"Driver using {rss / MB:.0f} MB, over its {self.driver_budget / MB:.0f} MB budget"
+            )
+            return True
+        return False
+
+    def allowed_workers(self, total_workers: int) -> int:
+        """
+        Number of browser workers that may scrape right now, as of the last
+        sample(). Reading it does not move it, however many workers ask.
+        """
+        if self._allowed_workers is None:
+            return total_workers
+        return min(self._allowed_workers, total_workers)
+
+    def sample(self, total_workers: int) -> int:
+        """
+        Check host memory once and move the worker limit by at most one.
+
+        Drops while host memory is above the limit and climbs back once usage
+        falls below the resume mark, never going below one worker. Called on
+        a fixed interval by monitor(), so the limit moves with time spent
+        under pressure rather than with how often workers look.
+        """
+        if self._allowed_workers is None:
+            self._allowed_workers = total_workers
+        used = psutil.virtual_memory().percent
+        if used >= self.host_limit_percent and self._allowed_workers > 1:
+            self._allowed_workers -= 1
+            logger.warning(
+                f"Host memory at {used:.0f}%, lowering browser workers to {self._allowed_workers}"
+            )
+        elif used < self.host_resume_percent and self._allowed_workers < total_workers:
+            self._allowed_workers += 1
+            logger.info(
+                f"Host memory at {used:.0f}%, raising browser workers to {self._allowed_workers}"
+            )
+        self._allowed_workers = min(self._allowed_workers, total_workers)
+        return self._allowed_workers
+
+    async def monitor(
+        self, total_workers: int, interval: float = SAMPLE_SECONDS
+    ) -> None:
+        """sample() every interval seconds until cancelled."""
+        while True:
+            await asyncio.to_thread(self.sample, total_workers)
+            await asyncio.sleep(interval)
+
+    def collect(self) -> int:
+        """Run a full collection only if Python memory grew since the last one."""
+        rss = self.python_rss()
+        if rss - self._rss_at_last_collect < self.gc_growth:
+            # Young generations are cheap and catch most short-lived garbage
+            return gc.collect(1)
+        collected = gc.collect()
+        self._rss_at_last_collect = self.python_rss()
+        logger.debug(
+            f"Full GC collected {collected} objects, RSS {rss / MB:.0f} -> {self._rss_at_last_collect / MB:.0f} MB"
+        )
+        return collected
+
+    def log_usage(self, drivers: Iterable = ()) -> None:
+        """Log Python, per-driver and whole-tree memory usage."""
+        per_driver = ", ".join(f"{self.driver_rss(d) / MB:.0f}" for d in drivers)
+        logger.info(
+            f"Memory usage: python {self.python_rss() / MB:.2f} MB, "
+            f"tree {self.tree_rss() / MB:.2f} MB, "
+            f"drivers [{per_driver}] MB, "
+            f"host {psutil.virtual_memory().percent:.0f}%"
+        )
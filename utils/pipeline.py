@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from utils import concurrency
+
+logger = logging.getLogger(__name__)
+
+# Marker passed down a queue to tell one worker of the next stage to stop
+STOP = object()
+
+
+@dataclass
+class StageStats:
+    """Counters for a single pipeline stage."""
+
+    name: str
+    items_in: int = 0
+    items_out: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def throughput(self) -> float:
+        """Items handled per minute since the stage started."""
+        elapsed = max(time.monotonic() - self.started_at, 1e-6)
+        return self.items_in * 60 / elapsed
+
+    def summary(self) -> str:
+        return (
+            f"{self.name}: in={self.items_in} out={self.items_out} "
+            f"errors={self.errors} busy={self.busy_seconds:.1f}s "
+            f"rate={self.throughput():.1f}/min"
+        )
+
+
+async def feed_queue(items: Iterable[Any], queue: asyncio.Queue, stops: int) -> None:
+    """Put every item on the queue, then one STOP per downstream worker."""
+    for item in items:
+        await queue.put(item)
+    for _ in range(stops):
+        await queue.put(STOP)
+
+
+async def run_stage(
+    stats: StageStats,
+    handler: Callable[[Any, int], Awaitable[Optional[Any]]],
+    inbox: asyncio.Queue,
+    outbox: Optional[asyncio.Queue] = None,
+    workers: int = 1,
+    downstream_workers: int = 1,
+) -> None:
+    """
+    Run `workers` copies of a stage until each has received a STOP.
+
+    The handler is called as handler(item, worker_index). A non-None result
+    is put on the outbox, which blocks when the outbox is full and so applies
+    backpressure to this stage. Once every worker has stopped, one STOP is
+    forwarded per downstream worker.
+    """
+
+    async def worker(index: int) -> None:
+        while True:
+            item = await inbox.get()
+            if item is STOP:
+                return
+            stats.items_in += 1
+            started = time.monotonic()
+            try:
+                result = await handler(item, index)
+            except Exception as e:
+                stats.errors += 1
+                logger.error(f"Stage {stats.name} failed on item: {e}", exc_info=True)
+                continue
+            finally:
+                stats.busy_seconds += time.monotonic() - started
+            if result is not None and outbox is not None:
+                await outbox.put(result)
+                stats.items_out += 1
+
+    await asyncio.gather(*(worker(i) for i in range(workers)))
+    if outbox is not None:
+        for _ in range(downstream_workers):
+            await outbox.put(STOP)
+    logger.info(f"Stage finished - {stats.summary()}")
+
+
+class PipelineMonitor:
+    """Periodically log stage throughput and queue depth."""
+
+    def __init__(
+        self,
+        stages: List[StageStats],
+        queues: Dict[str, asyncio.Queue],
+        interval: float = 60,
+    ):
+        self.stages = stages
+        self.queues = queues
+        self.interval = interval
+
+    def log_status(self) -> None:
+        depths = ", ".join(
+            f"{name}={queue.qsize()}/{queue.maxsize}"
+            for name, queue in self.queues.items()
+        )
+        logger.info(f"Queue depth: {depths}")
+        for stage in self.stages:
+            logger.info(f"Stage {stage.summary()}")
+        limits = concurrency.summary()
+        if limits:
+            logger.info(f"Concurrency limits: {limits}")
+
+    async def run(self) -> None:
+        """Log status every interval until cancelled."""
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                self.log_status()
+        except asyncio.CancelledError:
+            self.log_status()
+            raise
@@ -0,0 +1,203 @@
+import cProfile
+import io
+import json
+import logging
+import math
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+REPORT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs", "run_reports"
+)
+PROFILE_TOP_FUNCTIONS = 30
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(fraction * len(sorted_values))
+    index = max(0, min(len(sorted_values) - 1, rank - 1))
+    return sorted_values[index]
+
+
+class RunReport:
+    """
+    Timings and counters for one script run, written out as JSON.
+
+    Phases are timed with `with report.phase("page_load", follower=handle)`
+    from any thread. The report keeps every sample per phase for p50/p95 and
+    a per-follower total of each phase.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = datetime.now()
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+        self._samples: Dict[str, List[float]] = {}
+        self._followers: Dict[str, Dict[str, float]] = {}
+        self.counts: Dict[str, int] = {}
+        self.extra: Dict[str, Any] = {}
+
+    def record(self, name: str, seconds: float, follower: Optional[str] = None) -> None:
+        with self._lock:
+            self._samples.setdefault(name, []).append(seconds)
+            if follower:
+                phases = self._followers.setdefault(follower, {})
+                phases[name] = phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str, follower: Optional[str] = None) -> Iterator[None]:
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(name, time.monotonic() - started, follower)
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + n
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            phases = {}
+            for name, samples in self._samples.items():
+                ordered = sorted(samples)
+                phases[name] = {
+                    "count": len(ordered),
+                    "total": round(sum(ordered), 3),
+                    "p50": round(percentile(ordered, 0.5), 3),
+                    "p95": round(percentile(ordered, 0.95), 3),
+                    "max": round(ordered[-1], 3),
+                }
+            followers = {
+                follower: {name: round(total, 3) for name, total in phases_.items()}
+                for follower, phases_ in self._followers.items()
+            }
+            return {
+                "name": self.name,
+                "started_at": self.started_at.isoformat(),
+                "wall_time": round(time.monotonic() - self._started, 3),
+                "counts": dict(self.counts),
+                "phases": phases,
+                "followers": followers,
+                **self.extra,
+            }
+
+    def write(self, path: Optional[str] = None) -> str:
+        """Write the report as JSON and return its path."""
+        if path is None:
+            os.makedirs(REPORT_DIR, exist_ok=True)
+            stamp = self.started_at.strftime("%Y%m%d-%H%M%S")
+            path = os.path.join(REPORT_DIR, f"{self.name}-{stamp}.json")
+        summary = self.summary()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        logger.info(
+            f"Run report for {self.name} written to {path} "
+            f"(wall time {summary['wall_time']:.1f}s)"
+        )
+        return path
+
+
+_current = RunReport("default")
+
+
+def get_run_report() -> RunReport:
+    """The report that phases are currently recorded into."""
+    return _current
+
+
+def start_run_report(name: str) -> RunReport:
+    """Begin a fresh report for a new run."""
+    global _current
+    _current = RunReport(name)
+    return _current
+
+
+def phase(name: str, follower: Optional[str] = None):
+    """Time a block into the current run report."""
+    return _current.phase(name, follower)
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add to a counter in the current run report."""
+    _current.count(name, n)
+
+
+def profile_summary(profiler: cProfile.Profile, limit: int = PROFILE_TOP_FUNCTIONS):
+    """The hottest functions of a profile by own time, as JSON-friendly dicts."""
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, line, function), (_, calls, own, cumulative, _) in stats.stats.items():
+        rows.append(
+            {
+                "function": f"{os.path.basename(filename)}:{line}({function})",
+                "calls": calls,
+                "own_time": round(own, 4),
+                "cumulative_time": round(cumulative, 4),
+            }
+        )
+    rows.sort(key=lambda row: row["own_time"], reverse=True)
+    return rows[:limit]
+
+
+def _start(name: str, profile: bool):
+    report = start_run_report(name)
+    profiler = cProfile.Profile() if profile else None
+    if profiler:
+        profiler.enable()
+    return report, profiler
+
+
+def _finish(report: RunReport, profiler: Optional[cProfile.Profile]) -> None:
+    from utils import concurrency
+
+    limiters = concurrency.snapshot()
+    if limiters:
+        report.extra["concurrency"] = limiters
+    if profiler:
+        profiler.disable()
+        report.extra["profile"] = profile_summary(profiler)
+    path = report.write()
+    if profiler:
+        profile_path = os.path.splitext(path)[0] + ".prof"
+        profiler.dump_stats(profile_path)
+        logger.info(f"cProfile stats written to {profile_path}")
+
+
+def run_with_report(name: str, func: Callable[[], Any], profile: bool = False) -> Any:
+    """
+    Run func with a fresh run report and write the report when it returns,
+    raises or exits.
+
+    With profile=True the run is also profiled with cProfile: the raw stats
+    are saved next to the report as .prof and the hottest functions are
+    included in the report. cProfile only sees the calling thread, so time
+    spent in worker threads (browser calls) shows up in the phase timings
+    rather than the profile.
+    """
+    report, profiler = _start(name, profile)
+    try:
+        return func()
+    finally:
+        _finish(report, profiler)
+
+
+async def run_with_report_async(
+    name: str, func: Callable[[], Awaitable[Any]], profile: bool = False
+) -> Any:
+    """Async counterpart of run_with_report for code already inside an event loop."""
+    report, profiler = _start(name, profile)
+    try:
+        return await func()
+    finally:
+        _finish(report, profiler)
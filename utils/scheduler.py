@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+from utils import run_report
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Job:
+    """A recurring task and when it last ran."""
+
+    name: str
+    func: Callable[[], Awaitable[object]]
+    interval: float
+    jitter: float = 0.1
+    after: Sequence[str] = ()
+    next_run: float = 0.0
+    last_started: Optional[float] = None
+    last_finished: Optional[float] = None
+    runs: int = 0
+    failures: int = 0
+
+
+class Scheduler:
+    """
+    Run recurring jobs one at a time, with jitter and dependencies.
+
+    A job runs every `interval` seconds, moved earlier or later by up to
+    `jitter` of the interval so that runs do not line up with each other or
+    with other hosts. A job never runs before the jobs it runs after have
+    finished once, and each time one of them finishes it becomes due right
+    away, so e.g. enrichment picks up the accounts a tracking run just
+    created. Each run gets its own run report named after the job. Jobs run
+    one at a time because the run report, browsers and Airtable rate limits
+    are shared.
+    """
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+        profile: bool = False,
+    ):
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.profile = profile
+        self.jobs: Dict[str, Job] = {}
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[object]],
+        interval: float,
+        jitter: float = 0.1,
+        after: Sequence[str] = (),
+        delay: float = 0.0,
+    ) -> Job:
+        """Register a job; it first becomes due after `delay` seconds."""
+        for dependency in after:
+            if dependency not in self.jobs:
+                raise ValueError(f"Job {name} runs after unknown job {dependency}")
+        job = Job(name, func, interval, jitter, tuple(after))
+        job.next_run = self.clock() + delay
+        self.jobs[name] = job
+        return job
+
+    def _dependencies_done(self, job: Job) -> bool:
+        return all(self.jobs[name].last_finished is not None for name in job.after)
+
+    def due_jobs(self) -> List[Job]:
+        """Jobs ready to run now, longest overdue first."""
+        now = self.clock()
+        due = [
+            job
+            for job in self.jobs.values()
+            if job.next_run <= now and self._dependencies_done(job)
+        ]
+        return sorted(due, key=lambda job: job.next_run)
+
+    def _schedule_next(self, job: Job) -> None:
+        spread = self.rng.uniform(-job.jitter, job.jitter)
+        job.next_run = self.clock() + job.interval * (1 + spread)
+
+    async def run_job(self, job: Job) -> bool:
+        """Run a job once under its own run report; False if it raised."""
+        job.last_started = self.clock()
+        job.runs += 1
+        ok = True
+        try:
+            await run_report.run_with_report_async(
+                job.name, job.func, profile=self.profile
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            ok = False
+            job.failures += 1
+            logger.error(f"Job {job.name} failed: {e}", exc_info=True)
+        job.last_finished = self.clock()
+        self._schedule_next(job)
+        for dependent in self.jobs.values():
+            if job.name in dependent.after:
+                dependent.next_run = min(dependent.next_run, job.last_finished)
+        logger.info(
+            f"Job {job.name} {'finished' if ok else 'failed'} in "
+            f"{job.last_finished - job.last_started:.1f}s, "
+            f"next run in {job.next_run - job.last_finished:.0f}s"
+        )
+        return ok
+
+    async def run_pending(self) -> List[str]:
+        """Run every job that is due, in order, and return their names."""
+        ran = []
+        for job in self.due_jobs():
+            await self.run_job(job)
+            ran.append(job.name)
+        return ran
+
+    def seconds_until_next(self) -> float:
+        """Seconds until the next job's interval runs out."""
+        now = self.clock()
+        upcoming = [
+            job.next_run - now for job in self.jobs.values() if job.next_run > now
+        ]
+        return min(upcoming, default=float("inf"))
+
+    async def run_forever(self, stop: asyncio.Event, max_sleep: float = 300) -> None:
+        """Run due jobs until stop is set, sleeping while none are due."""
+        while not stop.is_set():
+            ran = await self.run_pending()
+            # A finished job may have unblocked the jobs that run after it
+            wait = 0 if ran else min(self.seconds_until_next(), max_sleep)
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass